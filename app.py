@@ -5,6 +5,7 @@ import json
 import re
 from datetime import datetime
 import random
+import threading
 import webbrowser
 from typing import Callable
 
@@ -13,7 +14,7 @@ from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QComboBox, QPushButton, QFileDialog, QTextEdit,
     QFrame, QCheckBox, QSizePolicy, QToolButton, QScrollArea, QStyle,
-    QDialog, QDialogButtonBox, QFormLayout, QMessageBox, QTabWidget
+    QDialog, QDialogButtonBox, QFormLayout, QMessageBox, QTabWidget, QSpinBox
 )
 from PySide6.QtCore import Qt, QTimer, QSize, QParallelAnimationGroup, QPropertyAnimation, QAbstractAnimation, QPoint, QSequentialAnimationGroup, Signal
 from PySide6.QtGui import QClipboard, QIcon, QGuiApplication
@@ -34,19 +35,30 @@ from utils.parse import (
     parse_size_csv, process_text_with_links
 )
 # 获取样机信息
-from utils.fetch_mockup_details import fetch_mockup_details
+from utils.fetch_mockup_details import fetch_mockup_details_many
 # 图片上传
 from utils.upload_boto import S3Uploader
+from utils.upload_index import UploadIndex
 from utils.upload_selenium_class import ImageUploader
+from utils.cdn_records import list_folder_images, resolve_cdn_key, CdnJournal
+from utils.image_optimizer import OptimizeOptions, optimize_images
+from utils.folder_watcher import FolderWatcher, DEFAULT_SCAN_INTERVAL
+from utils.upload_pipeline import TargetReadiness, start_upload_producer
+from utils.progress_store import clear_all_progress, PROGRESS_DB_NAME
+from utils.review_queue import ReviewQueue
 # 无图可用时的占位图
 from utils.cdn_placeholder_image import cdn_placeholder_image
 # 生成tools页面json
 from utils.tools_generator import generate_tools_json
+# 编译后的页面JSON模板（进程内缓存）
+from utils.template_cache import get_compiled_template, preload_templates
+from utils.page_prefetcher import PagePrefetcher
 # 解耦的UI组件
 from ui.collapsible_tab import CollapsibleBox, HorizontalCollapsibleTabs
 from ui.label_input import LabeledLineEditWithCopy
+from ui.review_dialog import ReviewParkedDialog
 # 打包应用后无法读取文件必须要设立一个读取函数
-from utils.resource_manager import get_writable_path, get_resource_path
+from utils.resource_manager import get_writable_path, get_resource_path, resource_manager
 # 更新JSON文件的具体动作
 from utils.update_json_action import update_login_requirment, update_old_resource_page, iterate
 # AWS和LLM API管理器
@@ -55,7 +67,7 @@ from utils.credentials import SCConfigDialog
 from utils.string_action import StringPatternTransformer
 # 批量处理机器人
 from dp_bot import BatchJsonTaskBot
-from dp_bot_manager import BotFactory, ModularBatchBot, GuiInteractionHandler
+from dp_bot_manager import BotFactory, ModularBatchBot, GuiInteractionHandler, ShardedBotRunner
 import glob
 
 class WSA(QMainWindow):
@@ -63,6 +75,22 @@ class WSA(QMainWindow):
     log_signal = Signal(str, str)
     # 自定义信号，用于跨线程复制到剪贴板
     clipboard_signal = Signal(str)
+    # 自定义信号，用于跨线程更新待复核目标数量
+    review_count_signal = Signal(int)
+
+    # 各页面类型使用的JSON模板
+    PAGE_TEMPLATES = {
+        "Mockup tool": "mockup_tool.json",
+        "Mockup resource": "mockup_resource.json",
+        "Mockup universal topic": "mockup_universal_topic.json",
+        "Mockup landing page": "mockup_landing.json",
+    }
+    # 各页面类型需要获取详情的样机数量（写入 var_v.json）
+    PAGE_MOCKUP_COUNTS = {
+        "Mockup tool": 8,
+        "Mockup resource": 24,
+        "Mockup universal topic": 8,
+    }
 
     def __init__(self):
         super().__init__()
@@ -74,6 +102,7 @@ class WSA(QMainWindow):
         # 连接信号到槽函数
         self.log_signal.connect(self.update_output_box)
         self.clipboard_signal.connect(self.copy_to_clipboard)
+        self.review_count_signal.connect(self.update_review_button)
 
         # 0. 中心小部件和主布局
         central_widget = QWidget()
@@ -470,6 +499,26 @@ class WSA(QMainWindow):
         self.upload_button.setMinimumHeight(35)
         mid_buttons_layout2.addWidget(self.upload_button)
         
+        # 内容去重：相同内容的图片直接复用本地索引中的CDN链接
+        self.dedup_upload_checkbox = QCheckBox("内容去重")
+        self.dedup_upload_checkbox.setToolTip("上传前计算图片哈希，已上传过的相同图片直接复用CDN链接")
+        self.dedup_upload_checkbox.setChecked(True)
+        mid_buttons_layout2.addWidget(self.dedup_upload_checkbox)
+        
+        # 上传前压缩：PNG无损重压缩并缩放到占位图尺寸
+        self.optimize_upload_checkbox = QCheckBox("上传前压缩")
+        self.optimize_upload_checkbox.setToolTip("上传前无损压缩PNG并将超出1400×1000的图片等比缩小，原图保持不变")
+        self.optimize_upload_checkbox.setChecked(False)
+        mid_buttons_layout2.addWidget(self.optimize_upload_checkbox)
+
+        # 压缩时转换为WebP：cdn.json的键仍由原图文件名决定，只是链接指向.webp文件
+        self.webp_upload_checkbox = QCheckBox("WebP")
+        self.webp_upload_checkbox.setToolTip("压缩时转换为WebP上传（需同时勾选上传前压缩）。cdn.json中对应原图的键保存.webp链接，原图不变")
+        self.webp_upload_checkbox.setChecked(False)
+        self.webp_upload_checkbox.setEnabled(False)
+        self.optimize_upload_checkbox.toggled.connect(self.webp_upload_checkbox.setEnabled)
+        mid_buttons_layout2.addWidget(self.webp_upload_checkbox)
+        
         # 第三行按钮
         mid_buttons_layout3 = QHBoxLayout()
         
@@ -587,14 +636,27 @@ class WSA(QMainWindow):
         
         # 5. 杂项
         self.uploader = ImageUploader()
+        self.upload_index = UploadIndex()
         try:
-            self.aws_upload = S3Uploader()
+            self.aws_upload = S3Uploader(upload_index=self.upload_index, transfer_profile="mockup_render")
         except Exception as e:
             self.add_output_message(f"AWS S3上传功能初始化失败: {e}。请通过'SC CONFIGURE'按钮配置AWS凭证以启用此功能。", "warning")
             # 创建一个空的上传器占位符
             self.aws_upload = None
+        self.folder_watcher: FolderWatcher | None = None
+        # 监听文件夹的快照：只在GUI线程中读取控件并更新，监听线程只读取副本
+        self._watched_folders_lock = threading.Lock()
+        self._watched_folders_snapshot: list[str] = []
         self.pattern: StringPatternTransformer = None
         self.output_json = ""
+        # 后台预加载页面模板，第一次生成也不需要读取磁盘
+        preload_templates(get_resource_path('json_templates'))
+        # 解析剪贴板后推测式预取生成依赖；图片文件夹改变时样机详情作废，页面类型改变时重新预取
+        self.prefetcher = PagePrefetcher()
+        self.pics_path_widget.line_edit.textChanged.connect(lambda _: self.prefetcher.invalidate("mockup_details"))
+        self.pics_path_widget.line_edit.textChanged.connect(lambda _: self._refresh_watched_folders())
+        self.page_type.currentIndexChanged.connect(lambda _: self.start_prefetch() if self.segments else None)
+        QApplication.instance().aboutToQuit.connect(self.prefetcher.shutdown)
         
         # Load mockup sizes and populate the combo box
         self.mockup_sizes_data = self.load_mockup_sizes()
@@ -606,6 +668,8 @@ class WSA(QMainWindow):
         self.update_mockup_size_info()
         
         self.interaction_handler = GuiInteractionHandler()
+        # 当前机器人运行使用的复核队列（未勾选 Defer ambiguous 时为 None）
+        self.review_queue = None
         
     def on_fun_button_clicked(self):
         """
@@ -789,6 +853,28 @@ class WSA(QMainWindow):
         self.debug_aws_boto_upload_button.clicked.connect(self.debug_aws_boto_upload)
         layout1.addWidget(self.debug_aws_boto_upload_button)
         
+        # 添加一个按钮用于从NAS中已有的cdn.json重建上传去重索引
+        self.rebuild_upload_index_button = QPushButton("Rebuild upload index")
+        self.rebuild_upload_index_button.setToolTip("扫描NAS中所有页面文件夹的cdn.json，重建图片内容去重索引")
+        self.rebuild_upload_index_button.clicked.connect(self.rebuild_upload_index)
+        layout1.addWidget(self.rebuild_upload_index_button)
+        
+        # 添加一个开关用于后台监听NAS页面文件夹并自动上传新图片
+        self.watch_folders_button = QPushButton("Watch folders")
+        self.watch_folders_button.setToolTip("后台轮询Bot目标列表（为空时为当前图片文件夹）中的NAS页面文件夹，新图片落地后自动上传并更新cdn.json")
+        self.watch_folders_button.setCheckable(True)
+        self.watch_folders_button.setChecked(self.folder_watcher is not None and self.folder_watcher.is_running)
+        self.watch_folders_button.toggled.connect(self.toggle_folder_watcher)
+        layout1.addWidget(self.watch_folders_button)
+        
+        self.watch_interval_spinbox = QSpinBox()
+        self.watch_interval_spinbox.setRange(5, 600)
+        self.watch_interval_spinbox.setSuffix(" s")
+        self.watch_interval_spinbox.setValue(int(DEFAULT_SCAN_INTERVAL))
+        self.watch_interval_spinbox.setToolTip("文件夹扫描间隔")
+        self.watch_interval_spinbox.valueChanged.connect(self.update_watch_interval)
+        layout1.addWidget(self.watch_interval_spinbox)
+        
         layout.addLayout(layout1)
         
         
@@ -840,6 +926,40 @@ class WSA(QMainWindow):
         
         layout2.addLayout(default_task_group)
         
+        ## 并行标签页数量
+        worker_tabs_group = QHBoxLayout()
+        worker_tabs_label = QLabel("Worker tabs:")
+        worker_tabs_group.addWidget(worker_tabs_label)
+        
+        self.bot_worker_tabs_widget = QSpinBox()
+        self.bot_worker_tabs_widget.setRange(1, 8)
+        self.bot_worker_tabs_widget.setValue(1)
+        self.bot_worker_tabs_widget.setToolTip("在同一浏览器中同时打开多个标签页并行处理目标，1为串行处理")
+        worker_tabs_group.addWidget(self.bot_worker_tabs_widget)
+        
+        self.bot_api_mode_checkbox = QCheckBox("API mode (experimental)")
+        self.bot_api_mode_checkbox.setToolTip("实验功能：后台接口地址尚未与线上核实。自定义批量任务直接调用后台接口，复用已保存的cookie，不打开浏览器（Worker tabs为并发线程数）")
+        worker_tabs_group.addWidget(self.bot_api_mode_checkbox)
+        
+        self.bot_defer_checkbox = QCheckBox("Defer ambiguous")
+        self.bot_defer_checkbox.setToolTip("搜索结果不唯一时不暂停等待确认，暂存到复核队列并继续处理其他目标，可随时点击 Review 一次性复核")
+        worker_tabs_group.addWidget(self.bot_defer_checkbox)
+        
+        layout2.addLayout(worker_tabs_group)
+        
+        ## 多浏览器分片数量
+        browser_shards_group = QHBoxLayout()
+        browser_shards_label = QLabel("Browser shards:")
+        browser_shards_group.addWidget(browser_shards_label)
+        
+        self.bot_browser_shards_widget = QSpinBox()
+        self.bot_browser_shards_widget.setRange(1, 8)
+        self.bot_browser_shards_widget.setValue(1)
+        self.bot_browser_shards_widget.setToolTip("大批量任务时启动多个独立浏览器进程分片处理（共用已保存的cookie），1为不分片")
+        browser_shards_group.addWidget(self.bot_browser_shards_widget)
+        
+        layout2.addLayout(browser_shards_group)
+        
         ## 自定义批量任务
         self.custom_batch_bot = CollapsibleBox("自定义批量BOT")
         
@@ -869,6 +989,7 @@ class WSA(QMainWindow):
         
         ## 输入想要进行操作的页面的短链接
         self.bot_target_list_widget = QTextEdit(placeholderText='输入想要进行操作的页面的短链接')
+        self.bot_target_list_widget.textChanged.connect(self._refresh_watched_folders)
         layout2.addWidget(self.bot_target_list_widget)
         
         ## bot操作按钮
@@ -893,6 +1014,12 @@ class WSA(QMainWindow):
         self.interaction_handler.on_request = lambda msg: self.add_output_message(f"⏸️ 等待确认: {msg}", "warning")
         bot_button_layout.addWidget(self.continue_bot_button)
 
+        self.review_parked_button = QPushButton("Review (0)")
+        self.review_parked_button.setToolTip('复核暂存的多结果目标：勾选的继续处理，其余跳过')
+        self.review_parked_button.setEnabled(False)
+        self.review_parked_button.clicked.connect(self.open_review_dialog)
+        bot_button_layout.addWidget(self.review_parked_button)
+
         self.cancel_bot_button = QPushButton("Cancel")
         self.cancel_bot_button.setToolTip('点击以安全终止当前任务')
         self.cancel_bot_button.clicked.connect(self.interaction_handler.stop_task)
@@ -993,6 +1120,82 @@ class WSA(QMainWindow):
             failed_count = total_tests - success_count
             self.add_output_message("⚠️  {} 项测试失败，请检查上述错误信息并解决问题。".format(failed_count), "error")
         
+    def rebuild_upload_index(self):
+        """
+        在后台线程中扫描NAS页面文件夹，根据已有的cdn.json重建内容去重索引
+        """
+        def worker():
+            base_folder = self.get_nas_base_folder()
+            if not os.path.isdir(base_folder):
+                self.add_output_message(f"Cannot reach NAS folder ({base_folder}).", "error")
+                return
+            self.add_output_message(f"Rebuilding upload index from {base_folder}...", "info")
+            try:
+                self.upload_index.rebuild_from_folders(base_folder, self.add_output_message)
+            except Exception as e:
+                self.add_output_message(f"Failed to rebuild upload index: {e}", "error")
+
+        from threading import Thread
+        Thread(target=worker, daemon=True).start()
+
+    def _refresh_watched_folders(self):
+        """
+        在GUI线程中读取需要自动上传的文件夹并保存快照：优先使用Bot目标列表，为空时使用当前图片文件夹
+        开启监听时以及目标列表、图片文件夹改变时调用
+        """
+        folders = []
+        target_widget = getattr(self, 'bot_target_list_widget', None)
+        try:
+            targets = [line.strip() for line in target_widget.toPlainText().split('\n') if line.strip()] if target_widget else []
+        except RuntimeError:
+            # Bot面板已关闭，控件已被销毁
+            targets = []
+        if targets:
+            base_folder = self.get_nas_base_folder()
+            folders = [os.path.join(base_folder, target) for target in targets]
+        if not folders and self.pics_path_widget.text():
+            folders = [self.pics_path_widget.text()]
+        with self._watched_folders_lock:
+            self._watched_folders_snapshot = folders
+
+    def _watched_folders(self) -> list[str]:
+        """
+        返回监听文件夹快照的副本；在监听线程中调用，不能访问Qt控件
+        """
+        with self._watched_folders_lock:
+            return list(self._watched_folders_snapshot)
+
+    def toggle_folder_watcher(self, checked: bool):
+        """
+        启动或停止后台文件夹监听
+        """
+        if not checked:
+            if self.folder_watcher is not None:
+                self.folder_watcher.stop()
+                self.folder_watcher = None
+            return
+
+        if self.aws_upload is None:
+            self.add_output_message("AWS S3上传功能未初始化。请通过'SC CONFIGURE'按钮配置AWS凭证以启用此功能。", "error")
+            self.watch_folders_button.setChecked(False)
+            return
+
+        self._refresh_watched_folders()
+        self.folder_watcher = FolderWatcher(
+            uploader=self.aws_upload,
+            folders_provider=self._watched_folders,
+            scan_interval=self.watch_interval_spinbox.value(),
+            output_callback=self.add_output_message
+        )
+        self.folder_watcher.start()
+
+    def update_watch_interval(self, value: int):
+        """
+        修改扫描间隔，下一轮扫描生效
+        """
+        if self.folder_watcher is not None:
+            self.folder_watcher.scan_interval = value
+
     def _test_network_connectivity(self):
         """测试网络连接到AWS S3服务"""
         try:
@@ -1211,6 +1414,12 @@ class WSA(QMainWindow):
         """
         将整个批量上传和替换任务放入后台线程执行，以避免阻塞UI。
         """
+        worker_tabs = self.bot_worker_tabs_widget.value()
+        review_queue = self._new_review_queue()
+        if self.bot_browser_shards_widget.value() > 1:
+            # 上传与替换共用一个就绪表，无法跨进程共享，因此该任务不分片
+            self.add_output_message("批量上传替换任务不支持多浏览器分片，将使用单个浏览器运行", "warning")
+
         def worker():
             try:
                 # 注册日志回调函数
@@ -1228,25 +1437,33 @@ class WSA(QMainWindow):
                 else:
                     base_folder = "//nas01.tools.baoxiaohe.com/shared/pacdora.com/"
 
-                # --- 2. 上传所有目标图片 ---
-                for i, target in enumerate(target_list):
+                if self.aws_upload is None:
+                    self.add_output_message("AWS S3上传功能未初始化。请通过'SC CONFIGURE'按钮配置AWS凭证以启用此功能。", "error")
+                    return
+
+                # --- 2. 后台按顺序上传目标图片，与浏览器替换流水线并行 ---
+                def upload_target(target: str) -> bool:
                     folder_path = os.path.join(base_folder, target)
                     if not os.path.exists(folder_path):
                         self.add_output_message(f"❌ 路径不存在: {folder_path}", "error")
-                        continue
-                    self.add_output_message(f"🖼️ [{i+1}/{len(target_list)}] 上传: {target}", "info")
-                    self.uploader_upload_folder_bot(given_folder_path=folder_path, is_pass_cdn=False)
-
-                self.add_output_message("图片上传完成，启动自动化替换", "success")
+                        return False
+                    return self._upload_folder_images(folder_path)
 
                 # --- 3. 使用工厂创建专用 Bot ---
+                readiness = TargetReadiness()
                 bot = BotFactory.create_upload_replace_bot(
                     language=language,
                     base_folder=base_folder,
                     target_list=target_list,
-                    interaction_strategy=self.interaction_handler
+                    interaction_strategy=self.interaction_handler,
+                    readiness=readiness,
+                    worker_tabs=worker_tabs,
+                    review_queue=review_queue
                 )
 
+                # 只上传机器人还需要处理的目标，顺序与机器人处理顺序一致；断点续跑时已完成的目标不再上传
+                start_upload_producer(bot.pending_targets(), upload_target, readiness, self.add_output_message)
+
                 self.add_output_message("🤖 机器人已启动，请查看浏览器", "success")
 
                 # --- 4. 运行机器人 ---
@@ -1272,11 +1489,17 @@ class WSA(QMainWindow):
             
             self.add_output_message('启动批量设为启用机器人...', 'info')
             
+            if self.bot_browser_shards_widget.value() > 1:
+                self._run_sharded_bot('create_online_sync_bot', target_list, {'language': language})
+                return
+            
             # 创建并启动批量设为启用机器人，启用机器人不需要传入update函数
             bot = BotFactory.create_online_sync_bot(
                 language=language,
                 target_list=target_list,
-                interaction_strategy=self.interaction_handler
+                interaction_strategy=self.interaction_handler,
+                worker_tabs=self.bot_worker_tabs_widget.value(),
+                review_queue=self._new_review_queue()
             )
             
             self.add_output_message('批量设为启用机器人已创建成功，请查看新打开的浏览器窗口', 'success')
@@ -1302,19 +1525,92 @@ class WSA(QMainWindow):
             self.add_output_message('启动自定义批量机器人...', 'info')
             
             # 创建自定义 bot（假设你有对应的构造方式）
-            bot = BotFactory.create_pacdora_json_bot(
-                language=language,
-                update_action=lambda x: self.pattern_update(x),
-                target_list=target_list,
-                interaction_strategy=self.interaction_handler
-            )
-            self.add_output_message('自定义机器人已创建成功，请查看新打开的浏览器窗口', 'success')
+            if self.bot_api_mode_checkbox.isChecked():
+                self.add_output_message('⚠️ API 模式为实验功能，接口地址尚未与线上后台核实，请先用少量目标确认结果', 'warning')
+                bot = BotFactory.create_api_json_bot(
+                    language=language,
+                    update_action=lambda x: self.pattern_update(x),
+                    target_list=target_list,
+                    interaction_strategy=self.interaction_handler,
+                    workers=self.bot_worker_tabs_widget.value(),
+                    review_queue=self._new_review_queue()
+                )
+                self.add_output_message('自定义机器人已创建成功（API 模式）', 'success')
+            elif self.bot_browser_shards_widget.value() > 1:
+                # 子进程需要可 pickle 的更新函数，直接传入转换器的方法
+                self._run_sharded_bot('create_pacdora_json_bot', target_list, {
+                    'language': language,
+                    'update_action': self.pattern.transform
+                })
+                return
+            else:
+                bot = BotFactory.create_pacdora_json_bot(
+                    language=language,
+                    update_action=lambda x: self.pattern_update(x),
+                    target_list=target_list,
+                    interaction_strategy=self.interaction_handler,
+                    worker_tabs=self.bot_worker_tabs_widget.value(),
+                    review_queue=self._new_review_queue()
+                )
+                self.add_output_message('自定义机器人已创建成功，请查看新打开的浏览器窗口', 'success')
             from threading import Thread
             Thread(target=bot.run, daemon=True).start()
             
         except Exception as e:
             self.add_output_message(f'启动自定义批量机器人时发生错误: {e}', 'error')
             
+    def _new_review_queue(self):
+        """勾选 Defer ambiguous 时为本次运行创建新的复核队列"""
+        if not self.bot_defer_checkbox.isChecked():
+            self.review_queue = None
+            self.update_review_button(0)
+            return None
+        self.review_queue = ReviewQueue()
+        self.review_queue.on_change = self.review_count_signal.emit
+        self.update_review_button(0)
+        return self.review_queue
+
+    def update_review_button(self, count: int):
+        self.review_parked_button.setText(f"Review ({count})")
+        self.review_parked_button.setEnabled(count > 0)
+
+    def open_review_dialog(self):
+        """一次性复核所有暂存的目标"""
+        if self.review_queue is None:
+            return
+        parked = self.review_queue.pending()
+        if not parked:
+            self.update_review_button(0)
+            return
+        dialog = ReviewParkedDialog(parked, self)
+        if dialog.exec() == QDialog.Accepted:
+            decisions = dialog.decisions()
+            self.review_queue.resolve_many(decisions)
+            approved = sum(decisions.values())
+            self.add_output_message(f"已复核 {len(decisions)} 个目标：继续处理 {approved} 个，跳过 {len(decisions) - approved} 个", "info")
+
+    def _run_sharded_bot(self, factory_name: str, target_list: list, factory_kwargs: dict):
+        """
+        使用 ShardedBotRunner 在多个独立浏览器进程中运行机器人
+        终止任务按钮会通知所有分片在当前目标完成后退出
+        """
+        shards = self.bot_browser_shards_widget.value()
+        runner = ShardedBotRunner(factory_name, target_list, shards=shards, factory_kwargs=factory_kwargs)
+        self.interaction_handler.on_stop_requested = runner.stop
+
+        def worker():
+            try:
+                runner.run()
+                self.add_output_message("🎉 所有分片已完成！", "success")
+            except Exception as e:
+                self.add_output_message(f"❌ 分片运行失败: {e}", "error")
+            finally:
+                self.interaction_handler.on_stop_requested = None
+
+        self.add_output_message(f'已启动 {shards} 个浏览器分片，请查看新打开的浏览器窗口', 'success')
+        from threading import Thread
+        Thread(target=worker, daemon=True).start()
+
     def clear_cache(self):
         cache_dir = os.path.join(os.path.dirname(__file__), "cache")
         if not os.path.isdir(cache_dir):
@@ -1331,6 +1627,13 @@ class WSA(QMainWindow):
                     self.add_output_message(f"Failed to delete {pkl_file}: {e}", "error")
 
         self.add_output_message(f"Deleted {deleted} cache .pkl files (except cookies.pkl).", "success")
+
+        # 清空SQLite进度数据库中的断点记录
+        try:
+            cleared = clear_all_progress(cache_dir)
+            self.add_output_message(f"Cleared {cleared} progress records from {PROGRESS_DB_NAME}.", "success")
+        except Exception as e:
+            self.add_output_message(f"Failed to clear progress database: {e}", "error")
         
     def add_login_requirement(self):
         try:
@@ -1415,6 +1718,8 @@ class WSA(QMainWindow):
             self.add_output_message(f"Error opening folder: {e}", "error")
 
     def update_action(self):
+        # 新的剪贴板内容，丢弃上一页的预取结果
+        self.prefetcher.invalidate()
         type = self.page_type.currentText()
         if type == "Mockup tool":
             self.update_action_mockup_tool()
@@ -1436,6 +1741,9 @@ class WSA(QMainWindow):
             
         else:
             self.add_output_message("Unavailable page type...","warning")
+            return
+
+        self.start_prefetch()
 
     def update_action_dieline_renderer(self):
         pass
@@ -1698,6 +2006,97 @@ class WSA(QMainWindow):
     def generate_json_action_dieline_rendered(self):
         pass
     
+    def _mockup_details_signature(self, part4, count):
+        """样机详情依赖的输入：图片文件夹、part4 中的链接和需要的数量"""
+        return self.pics_path_widget.text(), tuple(extract_url(part4)), count
+
+    def _resolve_mockup_details(self, folder_path, urls, count):
+        """
+        读取文件夹中的 var_v.json；不存在时并行获取前 count 个样机的详情（不写文件，可在预取线程中运行）
+        返回 (var_json_data, 是否为新获取的数据)
+        """
+        var_json_path = os.path.join(folder_path, "var_v.json")
+        if os.path.exists(var_json_path):
+            self.add_output_message("Found var_v.json file. Reading mockup details.", "info")
+            with open(var_json_path, "r", encoding="utf-8") as f:
+                return json.load(f), False
+
+        if len(urls) < count:
+            raise ValueError(f"Expected {count} mockup links, found {len(urls)}")
+        details = fetch_mockup_details_many(urls[:count], self.add_output_message)
+        var_json_data = {
+            f"model_{i}": {"name": name, "image_url": image_url, "editor_inner_link": editor_inner_link}
+            for i, (name, image_url, editor_inner_link) in enumerate(details, start=1)
+        }
+        return var_json_data, True
+
+    def _load_mockup_details(self, part4, count):
+        """
+        读取图片文件夹中的 var_v.json；不存在时从 part4 的链接并行获取前 count 个样机的详情并写入
+        解析剪贴板时已开始预取的，直接使用预取的详情；var_v.json 已存在时总是重新读取文件
+        返回 {"model_1": {"name", "image_url", "editor_inner_link"}, ...}
+        """
+        signature = self._mockup_details_signature(part4, count)
+        var_json_path = os.path.join(signature[0], "var_v.json")
+        # 预取结果只使用一次：var_v.json 写入后可能被手动修改（例如修正拼写错误），之后的生成都以文件为准
+        if os.path.exists(var_json_path):
+            self.prefetcher.invalidate("mockup_details")
+            var_json_data, _ = self._resolve_mockup_details(*signature)
+            return var_json_data
+
+        var_json_data, fetched = self.prefetcher.get(
+            "mockup_details", signature, lambda: self._resolve_mockup_details(*signature)
+        )
+        self.prefetcher.invalidate("mockup_details")
+        if not fetched:
+            # 预取时读到的 var_v.json 已被删除，重新获取
+            var_json_data, fetched = self._resolve_mockup_details(*signature)
+        if fetched:
+            with open(var_json_path, "w", encoding="utf-8") as f:
+                json.dump(var_json_data, f, ensure_ascii=False, indent=2)
+            self.add_output_message("Fetched mockup details and wrote var_v.json.", "success")
+        return var_json_data
+
+    def start_prefetch(self):
+        """
+        解析剪贴板后在后台预取生成需要的数据：页面模板，以及 var_v.json / 样机详情
+        """
+        page_type = self.page_type.currentText()
+        template_name = self.PAGE_TEMPLATES.get(page_type)
+        if template_name is None:
+            return
+        self.prefetcher.prefetch(
+            "template", template_name,
+            lambda: get_compiled_template(get_resource_path(f'json_templates/{template_name}'))
+        )
+
+        count = self.PAGE_MOCKUP_COUNTS.get(page_type)
+        if count is None or len(self.segments) != 8:
+            self.prefetcher.invalidate("mockup_details")
+            return
+        signature = self._mockup_details_signature(self.segments[3].splitlines(), count)
+        if self.prefetcher.pending("mockup_details") != signature:
+            self.add_output_message("Prefetching mockup details in background...", "info")
+            self.prefetcher.prefetch("mockup_details", signature, lambda: self._resolve_mockup_details(*signature))
+
+    def _emit_rendered_json(self, template_name, replace_dict):
+        """用编译后的模板一次渲染页面JSON，提示未填充/多余的占位符，并复制到剪贴板"""
+        try:
+            template = get_compiled_template(get_resource_path(f'json_templates/{template_name}'))
+            result = template.render_json(replace_dict)
+        except Exception as e:
+            self.add_output_message(f"Error generating JSON: {e}", "error")
+            return
+
+        if result.missing:
+            self.add_output_message(f"Unfilled placeholders in {template_name}: {', '.join(result.missing)}", "warning")
+        if result.unknown:
+            self.add_output_message(f"Keys not used by {template_name}: {', '.join(result.unknown)}", "warning")
+
+        self.output_json = result.text
+        self.clipboard_signal.emit(result.text)
+        self.add_output_message("JSON generated and copied to clipboard!", "success")
+    
     def generate_json_action_mockup_universal_topic(self):
         self.add_output_message("Generating JSON output...", "info")
         
@@ -1731,92 +2130,32 @@ class WSA(QMainWindow):
         part4 = self.segments[3].splitlines()
         part4_title = part4[0]
         
-        # 检查是否存在 var.json，如果有则读取，否则fetch并写入
-        var_json_path = os.path.join(self.pics_path_widget.text(), "var_v.json")
-        if os.path.exists(var_json_path):
-            self.add_output_message("Found var_v.json file. Reading mockup details.", "info")
-            with open(var_json_path, "r", encoding="utf-8") as f:
-                var_json_data = json.load(f)
-            model_1_name = var_json_data["model_1"]["name"]
-            model_1_image_url = var_json_data["model_1"]["image_url"]
-            model_1_editor_inner_link = var_json_data["model_1"]["editor_inner_link"]
-            model_2_name = var_json_data["model_2"]["name"]
-            model_2_image_url = var_json_data["model_2"]["image_url"]
-            model_2_editor_inner_link = var_json_data["model_2"]["editor_inner_link"]
-            model_3_name = var_json_data["model_3"]["name"]
-            model_3_image_url = var_json_data["model_3"]["image_url"]
-            model_3_editor_inner_link = var_json_data["model_3"]["editor_inner_link"]
-            model_4_name = var_json_data["model_4"]["name"]
-            model_4_image_url = var_json_data["model_4"]["image_url"]
-            model_4_editor_inner_link = var_json_data["model_4"]["editor_inner_link"]
-            model_5_name = var_json_data["model_5"]["name"]
-            model_5_image_url = var_json_data["model_5"]["image_url"]
-            model_5_editor_inner_link = var_json_data["model_5"]["editor_inner_link"]
-            model_6_name = var_json_data["model_6"]["name"]
-            model_6_image_url = var_json_data["model_6"]["image_url"]
-            model_6_editor_inner_link = var_json_data["model_6"]["editor_inner_link"]
-            model_7_name = var_json_data["model_7"]["name"]
-            model_7_image_url = var_json_data["model_7"]["image_url"]
-            model_7_editor_inner_link = var_json_data["model_7"]["editor_inner_link"]
-            model_8_name = var_json_data["model_8"]["name"]
-            model_8_image_url = var_json_data["model_8"]["image_url"]
-            model_8_editor_inner_link = var_json_data["model_8"]["editor_inner_link"]
-        else:
-            urls = extract_url(part4)
-            model_1_name, model_1_image_url, model_1_editor_inner_link = fetch_mockup_details(urls[0], self.add_output_message)
-            model_2_name, model_2_image_url, model_2_editor_inner_link = fetch_mockup_details(urls[1], self.add_output_message)
-            model_3_name, model_3_image_url, model_3_editor_inner_link = fetch_mockup_details(urls[2], self.add_output_message)
-            model_4_name, model_4_image_url, model_4_editor_inner_link = fetch_mockup_details(urls[3], self.add_output_message)
-            model_5_name, model_5_image_url, model_5_editor_inner_link = fetch_mockup_details(urls[4], self.add_output_message)
-            model_6_name, model_6_image_url, model_6_editor_inner_link = fetch_mockup_details(urls[5], self.add_output_message)
-            model_7_name, model_7_image_url, model_7_editor_inner_link = fetch_mockup_details(urls[6], self.add_output_message)
-            model_8_name, model_8_image_url, model_8_editor_inner_link = fetch_mockup_details(urls[7], self.add_output_message)
-            # 写入 var.json
-            var_json_data = {
-            "model_1": {
-                "name": model_1_name,
-                "image_url": model_1_image_url,
-                "editor_inner_link": model_1_editor_inner_link
-            },
-            "model_2": {
-                "name": model_2_name,
-                "image_url": model_2_image_url,
-                "editor_inner_link": model_2_editor_inner_link
-            },
-            "model_3": {
-                "name": model_3_name,
-                "image_url": model_3_image_url,
-                "editor_inner_link": model_3_editor_inner_link
-            },
-            "model_4": {
-                "name": model_4_name,
-                "image_url": model_4_image_url,
-                "editor_inner_link": model_4_editor_inner_link
-            },
-            "model_5": {
-                "name": model_5_name,
-                "image_url": model_5_image_url,
-                "editor_inner_link": model_5_editor_inner_link
-            },
-            "model_6": {
-                "name": model_6_name,
-                "image_url": model_6_image_url,
-                "editor_inner_link": model_6_editor_inner_link
-            },
-            "model_7": {
-                "name": model_7_name,
-                "image_url": model_7_image_url,
-                "editor_inner_link": model_7_editor_inner_link
-            },
-            "model_8": {
-                "name": model_8_name,
-                "image_url": model_8_image_url,
-                "editor_inner_link": model_8_editor_inner_link
-            }
-            }
-            with open(var_json_path, "w", encoding="utf-8") as f:
-                json.dump(var_json_data, f, ensure_ascii=False, indent=2)
-            self.add_output_message("Fetched mockup details and wrote var_v.json.", "success")
+        # 读取 var_v.json，没有时并行获取所有样机详情并写入
+        var_json_data = self._load_mockup_details(part4, self.PAGE_MOCKUP_COUNTS["Mockup universal topic"])
+        model_1_name = var_json_data["model_1"]["name"]
+        model_1_image_url = var_json_data["model_1"]["image_url"]
+        model_1_editor_inner_link = var_json_data["model_1"]["editor_inner_link"]
+        model_2_name = var_json_data["model_2"]["name"]
+        model_2_image_url = var_json_data["model_2"]["image_url"]
+        model_2_editor_inner_link = var_json_data["model_2"]["editor_inner_link"]
+        model_3_name = var_json_data["model_3"]["name"]
+        model_3_image_url = var_json_data["model_3"]["image_url"]
+        model_3_editor_inner_link = var_json_data["model_3"]["editor_inner_link"]
+        model_4_name = var_json_data["model_4"]["name"]
+        model_4_image_url = var_json_data["model_4"]["image_url"]
+        model_4_editor_inner_link = var_json_data["model_4"]["editor_inner_link"]
+        model_5_name = var_json_data["model_5"]["name"]
+        model_5_image_url = var_json_data["model_5"]["image_url"]
+        model_5_editor_inner_link = var_json_data["model_5"]["editor_inner_link"]
+        model_6_name = var_json_data["model_6"]["name"]
+        model_6_image_url = var_json_data["model_6"]["image_url"]
+        model_6_editor_inner_link = var_json_data["model_6"]["editor_inner_link"]
+        model_7_name = var_json_data["model_7"]["name"]
+        model_7_image_url = var_json_data["model_7"]["image_url"]
+        model_7_editor_inner_link = var_json_data["model_7"]["editor_inner_link"]
+        model_8_name = var_json_data["model_8"]["name"]
+        model_8_image_url = var_json_data["model_8"]["image_url"]
+        model_8_editor_inner_link = var_json_data["model_8"]["editor_inner_link"]
         
         step1_cdn = cdn_placeholder_image(self.step1_cdn_widget.text(),type='1')
         step2_cdn = cdn_placeholder_image(self.step2_cdn_widget.text(),type='2')
@@ -1924,10 +2263,7 @@ class WSA(QMainWindow):
         folder_path = self.pics_path_widget.text()
         self.ensure_folder_exists(folder_path = folder_path)
         
-        # 读取模板内容
-        temp_path = get_resource_path('json_templates/mockup_universal_topic.json')
-        with open(temp_path, 'r', encoding='utf-8') as f:
-            template_str = f.read()
+        template_name = self.PAGE_TEMPLATES["Mockup universal topic"]
 
         # 构建替换字典
         replace_dict = {
@@ -2018,23 +2354,7 @@ class WSA(QMainWindow):
             "part8_text": part8_text,
         }
 
-        # 替换所有{{key}}为对应值
-        for key, value in replace_dict.items():
-            if isinstance(value, str):
-                # 使用json.dumps正确处理JSON字符串中的特殊字符
-                value = json.dumps(value)[1:-1]  # 去掉json.dumps添加的外层引号
-            template_str = template_str.replace(f"{{{{{key}}}}}", str(value))
-
-        # 尝试解析为json
-        try:
-            json_obj = json.loads(template_str)
-            json_string = json.dumps(json_obj, indent=2, ensure_ascii=False)
-            # self.json_widget.setText(json_string)
-            self.output_json = json_string
-            self.clipboard_signal.emit(json_string)
-            self.add_output_message("JSON generated and copied to clipboard!", "success")
-        except Exception as e:
-            self.add_output_message(f"Error generating JSON: {e}", "error")
+        self._emit_rendered_json(template_name, replace_dict)
     
     def generate_json_action_mockup_resource(self):
         self.add_output_message("Generating JSON output...", "info")
@@ -2066,236 +2386,80 @@ class WSA(QMainWindow):
         part4 = self.segments[3].splitlines()
         part4_title = part4[0]
         
-        # 检查是否存在 var.json，如果有则读取，否则fetch并写入
-        var_json_path = os.path.join(self.pics_path_widget.text(), "var_v.json")
-        if os.path.exists(var_json_path):
-            self.add_output_message("Found var_v.json file. Reading mockup details.", "info")
-            with open(var_json_path, "r", encoding="utf-8") as f:
-                var_json_data = json.load(f)
-            model_1_name = var_json_data["model_1"]["name"]
-            model_1_image_url = var_json_data["model_1"]["image_url"]
-            model_1_editor_inner_link = var_json_data["model_1"]["editor_inner_link"]
-            model_2_name = var_json_data["model_2"]["name"]
-            model_2_image_url = var_json_data["model_2"]["image_url"]
-            model_2_editor_inner_link = var_json_data["model_2"]["editor_inner_link"]
-            model_3_name = var_json_data["model_3"]["name"]
-            model_3_image_url = var_json_data["model_3"]["image_url"]
-            model_3_editor_inner_link = var_json_data["model_3"]["editor_inner_link"]
-            model_4_name = var_json_data["model_4"]["name"]
-            model_4_image_url = var_json_data["model_4"]["image_url"]
-            model_4_editor_inner_link = var_json_data["model_4"]["editor_inner_link"]
-            model_5_name = var_json_data["model_5"]["name"]
-            model_5_image_url = var_json_data["model_5"]["image_url"]
-            model_5_editor_inner_link = var_json_data["model_5"]["editor_inner_link"]
-            model_6_name = var_json_data["model_6"]["name"]
-            model_6_image_url = var_json_data["model_6"]["image_url"]
-            model_6_editor_inner_link = var_json_data["model_6"]["editor_inner_link"]
-            model_7_name = var_json_data["model_7"]["name"]
-            model_7_image_url = var_json_data["model_7"]["image_url"]
-            model_7_editor_inner_link = var_json_data["model_7"]["editor_inner_link"]
-            model_8_name = var_json_data["model_8"]["name"]
-            model_8_image_url = var_json_data["model_8"]["image_url"]
-            model_8_editor_inner_link = var_json_data["model_8"]["editor_inner_link"]
-            model_9_name = var_json_data["model_9"]["name"]
-            model_9_image_url = var_json_data["model_9"]["image_url"]
-            model_9_editor_inner_link = var_json_data["model_9"]["editor_inner_link"]
-            model_10_name = var_json_data["model_10"]["name"]
-            model_10_image_url = var_json_data["model_10"]["image_url"]
-            model_10_editor_inner_link = var_json_data["model_10"]["editor_inner_link"]
-            model_11_name = var_json_data["model_11"]["name"]
-            model_11_image_url = var_json_data["model_11"]["image_url"]
-            model_11_editor_inner_link = var_json_data["model_11"]["editor_inner_link"]
-            model_12_name = var_json_data["model_12"]["name"]
-            model_12_image_url = var_json_data["model_12"]["image_url"]
-            model_12_editor_inner_link = var_json_data["model_12"]["editor_inner_link"]
-            model_13_name = var_json_data["model_13"]["name"]
-            model_13_image_url = var_json_data["model_13"]["image_url"]
-            model_13_editor_inner_link = var_json_data["model_13"]["editor_inner_link"]
-            model_14_name = var_json_data["model_14"]["name"]
-            model_14_image_url = var_json_data["model_14"]["image_url"]
-            model_14_editor_inner_link = var_json_data["model_14"]["editor_inner_link"]
-            model_15_name = var_json_data["model_15"]["name"]
-            model_15_image_url = var_json_data["model_15"]["image_url"]
-            model_15_editor_inner_link = var_json_data["model_15"]["editor_inner_link"]
-            model_16_name = var_json_data["model_16"]["name"]
-            model_16_image_url = var_json_data["model_16"]["image_url"]
-            model_16_editor_inner_link = var_json_data["model_16"]["editor_inner_link"]
-            model_17_name = var_json_data["model_17"]["name"]
-            model_17_image_url = var_json_data["model_17"]["image_url"]
-            model_17_editor_inner_link = var_json_data["model_17"]["editor_inner_link"]
-            model_18_name = var_json_data["model_18"]["name"]
-            model_18_image_url = var_json_data["model_18"]["image_url"]
-            model_18_editor_inner_link = var_json_data["model_18"]["editor_inner_link"]
-            model_19_name = var_json_data["model_19"]["name"]
-            model_19_image_url = var_json_data["model_19"]["image_url"]
-            model_19_editor_inner_link = var_json_data["model_19"]["editor_inner_link"]
-            model_20_name = var_json_data["model_20"]["name"]
-            model_20_image_url = var_json_data["model_20"]["image_url"]
-            model_20_editor_inner_link = var_json_data["model_20"]["editor_inner_link"]
-            model_21_name = var_json_data["model_21"]["name"]
-            model_21_image_url = var_json_data["model_21"]["image_url"]
-            model_21_editor_inner_link = var_json_data["model_21"]["editor_inner_link"]
-            model_22_name = var_json_data["model_22"]["name"]
-            model_22_image_url = var_json_data["model_22"]["image_url"]
-            model_22_editor_inner_link = var_json_data["model_22"]["editor_inner_link"]
-            model_23_name = var_json_data["model_23"]["name"]
-            model_23_image_url = var_json_data["model_23"]["image_url"]
-            model_23_editor_inner_link = var_json_data["model_23"]["editor_inner_link"]
-            model_24_name = var_json_data["model_24"]["name"]
-            model_24_image_url = var_json_data["model_24"]["image_url"]
-            model_24_editor_inner_link = var_json_data["model_24"]["editor_inner_link"]
-        else:
-            urls = extract_url(part4)
-            model_1_name, model_1_image_url, model_1_editor_inner_link = fetch_mockup_details(urls[0], self.add_output_message)
-            model_2_name, model_2_image_url, model_2_editor_inner_link = fetch_mockup_details(urls[1], self.add_output_message)
-            model_3_name, model_3_image_url, model_3_editor_inner_link = fetch_mockup_details(urls[2], self.add_output_message)
-            model_4_name, model_4_image_url, model_4_editor_inner_link = fetch_mockup_details(urls[3], self.add_output_message)
-            model_5_name, model_5_image_url, model_5_editor_inner_link = fetch_mockup_details(urls[4], self.add_output_message)
-            model_6_name, model_6_image_url, model_6_editor_inner_link = fetch_mockup_details(urls[5], self.add_output_message)
-            model_7_name, model_7_image_url, model_7_editor_inner_link = fetch_mockup_details(urls[6], self.add_output_message)
-            model_8_name, model_8_image_url, model_8_editor_inner_link = fetch_mockup_details(urls[7], self.add_output_message)
-            model_9_name, model_9_image_url, model_9_editor_inner_link = fetch_mockup_details(urls[8], self.add_output_message)
-            model_10_name, model_10_image_url, model_10_editor_inner_link = fetch_mockup_details(urls[9], self.add_output_message)
-            model_11_name, model_11_image_url, model_11_editor_inner_link = fetch_mockup_details(urls[10], self.add_output_message)
-            model_12_name, model_12_image_url, model_12_editor_inner_link = fetch_mockup_details(urls[11], self.add_output_message)
-            model_13_name, model_13_image_url, model_13_editor_inner_link = fetch_mockup_details(urls[12], self.add_output_message)
-            model_14_name, model_14_image_url, model_14_editor_inner_link = fetch_mockup_details(urls[13], self.add_output_message)
-            model_15_name, model_15_image_url, model_15_editor_inner_link = fetch_mockup_details(urls[14], self.add_output_message)
-            model_16_name, model_16_image_url, model_16_editor_inner_link = fetch_mockup_details(urls[15], self.add_output_message)
-            model_17_name, model_17_image_url, model_17_editor_inner_link = fetch_mockup_details(urls[16], self.add_output_message)
-            model_18_name, model_18_image_url, model_18_editor_inner_link = fetch_mockup_details(urls[17], self.add_output_message)
-            model_19_name, model_19_image_url, model_19_editor_inner_link = fetch_mockup_details(urls[18], self.add_output_message)
-            model_20_name, model_20_image_url, model_20_editor_inner_link = fetch_mockup_details(urls[19], self.add_output_message)
-            model_21_name, model_21_image_url, model_21_editor_inner_link = fetch_mockup_details(urls[20], self.add_output_message)
-            model_22_name, model_22_image_url, model_22_editor_inner_link = fetch_mockup_details(urls[21], self.add_output_message)
-            model_23_name, model_23_image_url, model_23_editor_inner_link = fetch_mockup_details(urls[22], self.add_output_message)
-            model_24_name, model_24_image_url, model_24_editor_inner_link = fetch_mockup_details(urls[23], self.add_output_message)
-            # 写入 var.json
-            var_json_data = {
-            "model_1": {
-                "name": model_1_name,
-                "image_url": model_1_image_url,
-                "editor_inner_link": model_1_editor_inner_link
-            },
-            "model_2": {
-                "name": model_2_name,
-                "image_url": model_2_image_url,
-                "editor_inner_link": model_2_editor_inner_link
-            },
-            "model_3": {
-                "name": model_3_name,
-                "image_url": model_3_image_url,
-                "editor_inner_link": model_3_editor_inner_link
-            },
-            "model_4": {
-                "name": model_4_name,
-                "image_url": model_4_image_url,
-                "editor_inner_link": model_4_editor_inner_link
-            },
-            "model_5": {
-                "name": model_5_name,
-                "image_url": model_5_image_url,
-                "editor_inner_link": model_5_editor_inner_link
-            },
-            "model_6": {
-                "name": model_6_name,
-                "image_url": model_6_image_url,
-                "editor_inner_link": model_6_editor_inner_link
-            },
-            "model_7": {
-                "name": model_7_name,
-                "image_url": model_7_image_url,
-                "editor_inner_link": model_7_editor_inner_link
-            },
-            "model_8": {
-                "name": model_8_name,
-                "image_url": model_8_image_url,
-                "editor_inner_link": model_8_editor_inner_link
-            },
-            "model_9": {
-                "name": model_9_name,
-                "image_url": model_9_image_url,
-                "editor_inner_link": model_9_editor_inner_link
-            },
-            "model_10": {
-                "name": model_10_name,
-                "image_url": model_10_image_url,
-                "editor_inner_link": model_10_editor_inner_link
-            },
-            "model_11": {
-                "name": model_11_name,
-                "image_url": model_11_image_url,
-                "editor_inner_link": model_11_editor_inner_link
-            },
-            "model_12": {
-                "name": model_12_name,
-                "image_url": model_12_image_url,
-                "editor_inner_link": model_12_editor_inner_link
-            },
-            "model_13": {
-                "name": model_13_name,
-                "image_url": model_13_image_url,
-                "editor_inner_link": model_13_editor_inner_link
-            },
-            "model_14": {
-                "name": model_14_name,
-                "image_url": model_14_image_url,
-                "editor_inner_link": model_14_editor_inner_link
-            },
-            "model_15": {
-                "name": model_15_name,
-                "image_url": model_15_image_url,
-                "editor_inner_link": model_15_editor_inner_link
-            },
-            "model_16": {
-                "name": model_16_name,
-                "image_url": model_16_image_url,
-                "editor_inner_link": model_16_editor_inner_link
-            },
-            "model_17": {
-                "name": model_17_name,
-                "image_url": model_17_image_url,
-                "editor_inner_link": model_17_editor_inner_link
-            },
-            "model_18": {
-                "name": model_18_name,
-                "image_url": model_18_image_url,
-                "editor_inner_link": model_18_editor_inner_link
-            },
-            "model_19": {
-                "name": model_19_name,
-                "image_url": model_19_image_url,
-                "editor_inner_link": model_19_editor_inner_link
-            },
-            "model_20": {
-                "name": model_20_name,
-                "image_url": model_20_image_url,
-                "editor_inner_link": model_20_editor_inner_link
-            },
-            "model_21": {
-                "name": model_21_name,
-                "image_url": model_21_image_url,
-                "editor_inner_link": model_21_editor_inner_link
-            },
-            "model_22": {
-                "name": model_22_name,
-                "image_url": model_22_image_url,
-                "editor_inner_link": model_22_editor_inner_link
-            },
-            "model_23": {
-                "name": model_23_name,
-                "image_url": model_23_image_url,
-                "editor_inner_link": model_23_editor_inner_link
-            },
-            "model_24": {
-                "name": model_24_name,
-                "image_url": model_24_image_url,
-                "editor_inner_link": model_24_editor_inner_link
-            }
-            }
-            with open(var_json_path, "w", encoding="utf-8") as f:
-                json.dump(var_json_data, f, ensure_ascii=False, indent=2)
-            self.add_output_message("Fetched mockup details and wrote var_v.json.", "success")
+        # 读取 var_v.json，没有时并行获取所有样机详情并写入
+        var_json_data = self._load_mockup_details(part4, self.PAGE_MOCKUP_COUNTS["Mockup resource"])
+        model_1_name = var_json_data["model_1"]["name"]
+        model_1_image_url = var_json_data["model_1"]["image_url"]
+        model_1_editor_inner_link = var_json_data["model_1"]["editor_inner_link"]
+        model_2_name = var_json_data["model_2"]["name"]
+        model_2_image_url = var_json_data["model_2"]["image_url"]
+        model_2_editor_inner_link = var_json_data["model_2"]["editor_inner_link"]
+        model_3_name = var_json_data["model_3"]["name"]
+        model_3_image_url = var_json_data["model_3"]["image_url"]
+        model_3_editor_inner_link = var_json_data["model_3"]["editor_inner_link"]
+        model_4_name = var_json_data["model_4"]["name"]
+        model_4_image_url = var_json_data["model_4"]["image_url"]
+        model_4_editor_inner_link = var_json_data["model_4"]["editor_inner_link"]
+        model_5_name = var_json_data["model_5"]["name"]
+        model_5_image_url = var_json_data["model_5"]["image_url"]
+        model_5_editor_inner_link = var_json_data["model_5"]["editor_inner_link"]
+        model_6_name = var_json_data["model_6"]["name"]
+        model_6_image_url = var_json_data["model_6"]["image_url"]
+        model_6_editor_inner_link = var_json_data["model_6"]["editor_inner_link"]
+        model_7_name = var_json_data["model_7"]["name"]
+        model_7_image_url = var_json_data["model_7"]["image_url"]
+        model_7_editor_inner_link = var_json_data["model_7"]["editor_inner_link"]
+        model_8_name = var_json_data["model_8"]["name"]
+        model_8_image_url = var_json_data["model_8"]["image_url"]
+        model_8_editor_inner_link = var_json_data["model_8"]["editor_inner_link"]
+        model_9_name = var_json_data["model_9"]["name"]
+        model_9_image_url = var_json_data["model_9"]["image_url"]
+        model_9_editor_inner_link = var_json_data["model_9"]["editor_inner_link"]
+        model_10_name = var_json_data["model_10"]["name"]
+        model_10_image_url = var_json_data["model_10"]["image_url"]
+        model_10_editor_inner_link = var_json_data["model_10"]["editor_inner_link"]
+        model_11_name = var_json_data["model_11"]["name"]
+        model_11_image_url = var_json_data["model_11"]["image_url"]
+        model_11_editor_inner_link = var_json_data["model_11"]["editor_inner_link"]
+        model_12_name = var_json_data["model_12"]["name"]
+        model_12_image_url = var_json_data["model_12"]["image_url"]
+        model_12_editor_inner_link = var_json_data["model_12"]["editor_inner_link"]
+        model_13_name = var_json_data["model_13"]["name"]
+        model_13_image_url = var_json_data["model_13"]["image_url"]
+        model_13_editor_inner_link = var_json_data["model_13"]["editor_inner_link"]
+        model_14_name = var_json_data["model_14"]["name"]
+        model_14_image_url = var_json_data["model_14"]["image_url"]
+        model_14_editor_inner_link = var_json_data["model_14"]["editor_inner_link"]
+        model_15_name = var_json_data["model_15"]["name"]
+        model_15_image_url = var_json_data["model_15"]["image_url"]
+        model_15_editor_inner_link = var_json_data["model_15"]["editor_inner_link"]
+        model_16_name = var_json_data["model_16"]["name"]
+        model_16_image_url = var_json_data["model_16"]["image_url"]
+        model_16_editor_inner_link = var_json_data["model_16"]["editor_inner_link"]
+        model_17_name = var_json_data["model_17"]["name"]
+        model_17_image_url = var_json_data["model_17"]["image_url"]
+        model_17_editor_inner_link = var_json_data["model_17"]["editor_inner_link"]
+        model_18_name = var_json_data["model_18"]["name"]
+        model_18_image_url = var_json_data["model_18"]["image_url"]
+        model_18_editor_inner_link = var_json_data["model_18"]["editor_inner_link"]
+        model_19_name = var_json_data["model_19"]["name"]
+        model_19_image_url = var_json_data["model_19"]["image_url"]
+        model_19_editor_inner_link = var_json_data["model_19"]["editor_inner_link"]
+        model_20_name = var_json_data["model_20"]["name"]
+        model_20_image_url = var_json_data["model_20"]["image_url"]
+        model_20_editor_inner_link = var_json_data["model_20"]["editor_inner_link"]
+        model_21_name = var_json_data["model_21"]["name"]
+        model_21_image_url = var_json_data["model_21"]["image_url"]
+        model_21_editor_inner_link = var_json_data["model_21"]["editor_inner_link"]
+        model_22_name = var_json_data["model_22"]["name"]
+        model_22_image_url = var_json_data["model_22"]["image_url"]
+        model_22_editor_inner_link = var_json_data["model_22"]["editor_inner_link"]
+        model_23_name = var_json_data["model_23"]["name"]
+        model_23_image_url = var_json_data["model_23"]["image_url"]
+        model_23_editor_inner_link = var_json_data["model_23"]["editor_inner_link"]
+        model_24_name = var_json_data["model_24"]["name"]
+        model_24_image_url = var_json_data["model_24"]["image_url"]
+        model_24_editor_inner_link = var_json_data["model_24"]["editor_inner_link"]
         
         step1_cdn = cdn_placeholder_image(self.step1_cdn_widget.text(),type='1')
         step2_cdn = cdn_placeholder_image(self.step2_cdn_widget.text(),type='2')
@@ -2403,10 +2567,7 @@ class WSA(QMainWindow):
         folder_path = self.pics_path_widget.text()
         self.ensure_folder_exists(folder_path = folder_path)
         
-        # 读取模板内容
-        temp_path = get_resource_path('json_templates/mockup_resource.json')
-        with open(temp_path, 'r', encoding='utf-8') as f:
-            template_str = f.read()
+        template_name = self.PAGE_TEMPLATES["Mockup resource"]
 
         # 构建替换字典
         replace_dict = {
@@ -2545,23 +2706,7 @@ class WSA(QMainWindow):
             "part8": part8_text
         }
 
-        # 替换所有{{key}}为对应值
-        for key, value in replace_dict.items():
-            if isinstance(value, str):
-                # 使用json.dumps正确处理JSON字符串中的特殊字符
-                value = json.dumps(value)[1:-1]  # 去掉json.dumps添加的外层引号
-            template_str = template_str.replace(f"{{{{{key}}}}}", str(value))
-
-        # 尝试解析为json
-        try:
-            json_obj = json.loads(template_str)
-            json_string = json.dumps(json_obj, indent=2, ensure_ascii=False)
-            # self.json_widget.setText(json_string)
-            self.output_json = json_string
-            self.clipboard_signal.emit(json_string)
-            self.add_output_message("JSON generated and copied to clipboard!", "success")
-        except Exception as e:
-            self.add_output_message(f"Error generating JSON: {e}", "error")
+        self._emit_rendered_json(template_name, replace_dict)
     
     def generate_json_action_mockup_tool(self):
         self.add_output_message("Generating JSON output...", "info")
@@ -2636,92 +2781,32 @@ class WSA(QMainWindow):
         part4 = self.segments[3].splitlines()
         part4_title = part4[0]
         
-        # 检查是否存在 var.json，如果有则读取，否则fetch并写入
-        var_json_path = os.path.join(self.pics_path_widget.text(), "var_v.json")
-        if os.path.exists(var_json_path):
-            self.add_output_message("Found var_v.json file. Reading mockup details.", "info")
-            with open(var_json_path, "r", encoding="utf-8") as f:
-                var_json_data = json.load(f)
-            model_1_name = var_json_data["model_1"]["name"]
-            model_1_image_url = var_json_data["model_1"]["image_url"]
-            model_1_editor_inner_link = var_json_data["model_1"]["editor_inner_link"]
-            model_2_name = var_json_data["model_2"]["name"]
-            model_2_image_url = var_json_data["model_2"]["image_url"]
-            model_2_editor_inner_link = var_json_data["model_2"]["editor_inner_link"]
-            model_3_name = var_json_data["model_3"]["name"]
-            model_3_image_url = var_json_data["model_3"]["image_url"]
-            model_3_editor_inner_link = var_json_data["model_3"]["editor_inner_link"]
-            model_4_name = var_json_data["model_4"]["name"]
-            model_4_image_url = var_json_data["model_4"]["image_url"]
-            model_4_editor_inner_link = var_json_data["model_4"]["editor_inner_link"]
-            model_5_name = var_json_data["model_5"]["name"]
-            model_5_image_url = var_json_data["model_5"]["image_url"]
-            model_5_editor_inner_link = var_json_data["model_5"]["editor_inner_link"]
-            model_6_name = var_json_data["model_6"]["name"]
-            model_6_image_url = var_json_data["model_6"]["image_url"]
-            model_6_editor_inner_link = var_json_data["model_6"]["editor_inner_link"]
-            model_7_name = var_json_data["model_7"]["name"]
-            model_7_image_url = var_json_data["model_7"]["image_url"]
-            model_7_editor_inner_link = var_json_data["model_7"]["editor_inner_link"]
-            model_8_name = var_json_data["model_8"]["name"]
-            model_8_image_url = var_json_data["model_8"]["image_url"]
-            model_8_editor_inner_link = var_json_data["model_8"]["editor_inner_link"]
-        else:
-            urls = extract_url(part4)
-            model_1_name, model_1_image_url, model_1_editor_inner_link = fetch_mockup_details(urls[0], self.add_output_message)
-            model_2_name, model_2_image_url, model_2_editor_inner_link = fetch_mockup_details(urls[1], self.add_output_message)
-            model_3_name, model_3_image_url, model_3_editor_inner_link = fetch_mockup_details(urls[2], self.add_output_message)
-            model_4_name, model_4_image_url, model_4_editor_inner_link = fetch_mockup_details(urls[3], self.add_output_message)
-            model_5_name, model_5_image_url, model_5_editor_inner_link = fetch_mockup_details(urls[4], self.add_output_message)
-            model_6_name, model_6_image_url, model_6_editor_inner_link = fetch_mockup_details(urls[5], self.add_output_message)
-            model_7_name, model_7_image_url, model_7_editor_inner_link = fetch_mockup_details(urls[6], self.add_output_message)
-            model_8_name, model_8_image_url, model_8_editor_inner_link = fetch_mockup_details(urls[7], self.add_output_message)
-            # 写入 var.json
-            var_json_data = {
-            "model_1": {
-                "name": model_1_name,
-                "image_url": model_1_image_url,
-                "editor_inner_link": model_1_editor_inner_link
-            },
-            "model_2": {
-                "name": model_2_name,
-                "image_url": model_2_image_url,
-                "editor_inner_link": model_2_editor_inner_link
-            },
-            "model_3": {
-                "name": model_3_name,
-                "image_url": model_3_image_url,
-                "editor_inner_link": model_3_editor_inner_link
-            },
-            "model_4": {
-                "name": model_4_name,
-                "image_url": model_4_image_url,
-                "editor_inner_link": model_4_editor_inner_link
-            },
-            "model_5": {
-                "name": model_5_name,
-                "image_url": model_5_image_url,
-                "editor_inner_link": model_5_editor_inner_link
-            },
-            "model_6": {
-                "name": model_6_name,
-                "image_url": model_6_image_url,
-                "editor_inner_link": model_6_editor_inner_link
-            },
-            "model_7": {
-                "name": model_7_name,
-                "image_url": model_7_image_url,
-                "editor_inner_link": model_7_editor_inner_link
-            },
-            "model_8": {
-                "name": model_8_name,
-                "image_url": model_8_image_url,
-                "editor_inner_link": model_8_editor_inner_link
-            }
-            }
-            with open(var_json_path, "w", encoding="utf-8") as f:
-                json.dump(var_json_data, f, ensure_ascii=False, indent=2)
-            self.add_output_message("Fetched mockup details and wrote var_v.json.", "success")
+        # 读取 var_v.json，没有时并行获取所有样机详情并写入
+        var_json_data = self._load_mockup_details(part4, self.PAGE_MOCKUP_COUNTS["Mockup tool"])
+        model_1_name = var_json_data["model_1"]["name"]
+        model_1_image_url = var_json_data["model_1"]["image_url"]
+        model_1_editor_inner_link = var_json_data["model_1"]["editor_inner_link"]
+        model_2_name = var_json_data["model_2"]["name"]
+        model_2_image_url = var_json_data["model_2"]["image_url"]
+        model_2_editor_inner_link = var_json_data["model_2"]["editor_inner_link"]
+        model_3_name = var_json_data["model_3"]["name"]
+        model_3_image_url = var_json_data["model_3"]["image_url"]
+        model_3_editor_inner_link = var_json_data["model_3"]["editor_inner_link"]
+        model_4_name = var_json_data["model_4"]["name"]
+        model_4_image_url = var_json_data["model_4"]["image_url"]
+        model_4_editor_inner_link = var_json_data["model_4"]["editor_inner_link"]
+        model_5_name = var_json_data["model_5"]["name"]
+        model_5_image_url = var_json_data["model_5"]["image_url"]
+        model_5_editor_inner_link = var_json_data["model_5"]["editor_inner_link"]
+        model_6_name = var_json_data["model_6"]["name"]
+        model_6_image_url = var_json_data["model_6"]["image_url"]
+        model_6_editor_inner_link = var_json_data["model_6"]["editor_inner_link"]
+        model_7_name = var_json_data["model_7"]["name"]
+        model_7_image_url = var_json_data["model_7"]["image_url"]
+        model_7_editor_inner_link = var_json_data["model_7"]["editor_inner_link"]
+        model_8_name = var_json_data["model_8"]["name"]
+        model_8_image_url = var_json_data["model_8"]["image_url"]
+        model_8_editor_inner_link = var_json_data["model_8"]["editor_inner_link"]
         
         step1_cdn = cdn_placeholder_image(self.step1_cdn_widget.text(),type='1')
         step2_cdn = cdn_placeholder_image(self.step2_cdn_widget.text(),type='2')
@@ -2829,10 +2914,7 @@ class WSA(QMainWindow):
         folder_path = self.pics_path_widget.text()
         self.ensure_folder_exists(folder_path = folder_path)
         
-        # 读取模板内容
-        temp_path = get_resource_path('json_templates/mockup_tool.json')
-        with open(temp_path, 'r', encoding='utf-8') as f:
-            template_str = f.read()
+        template_name = self.PAGE_TEMPLATES["Mockup tool"]
 
         # 构建替换字典
         replace_dict = {
@@ -2937,23 +3019,7 @@ class WSA(QMainWindow):
             "part8_text": part8_text,
         }
 
-        # 替换所有{{key}}为对应值
-        for key, value in replace_dict.items():
-            if isinstance(value, str):
-                # 使用json.dumps正确处理JSON字符串中的特殊字符
-                value = json.dumps(value)[1:-1]  # 去掉json.dumps添加的外层引号
-            template_str = template_str.replace(f"{{{{{key}}}}}", str(value))
-
-        # 尝试解析为json
-        try:
-            json_obj = json.loads(template_str)
-            json_string = json.dumps(json_obj, indent=2, ensure_ascii=False)
-            # self.json_widget.setText(json_string)
-            self.output_json = json_string
-            self.clipboard_signal.emit(json_string)
-            self.add_output_message("JSON generated and copied to clipboard!", "success")
-        except Exception as e:
-            self.add_output_message(f"Error generating JSON: {e}", "error")
+        self._emit_rendered_json(template_name, replace_dict)
             
     def generate_json_action_mockup_landing_page(self):
         self.add_output_message("Generating JSON output...", "info")
@@ -3035,10 +3101,7 @@ class WSA(QMainWindow):
         folder_path = self.pics_path_widget.text()
         self.ensure_folder_exists(folder_path=folder_path)
         
-        # 读取模板内容
-        temp_path = get_resource_path('json_templates/mockup_landing.json')
-        with open(temp_path,'r') as f:
-            template_str = f.read()
+        template_name = self.PAGE_TEMPLATES["Mockup landing page"]
         
         # 构建替换字典
         
@@ -3086,23 +3149,7 @@ class WSA(QMainWindow):
             "a5": a5,
         }
         
-        # 替换所有{{key}}为对应值
-        for key, value in replace_dict.items():
-            if isinstance(value, str):
-                # 使用json.dumps正确处理JSON字符串中的特殊字符
-                value = json.dumps(value)[1:-1]  # 去掉json.dumps添加的外层引号
-            template_str = template_str.replace(f"{{{{{key}}}}}", str(value))
-
-        # 尝试解析为json
-        try:
-            json_obj = json.loads(template_str)
-            json_string = json.dumps(json_obj, indent=2, ensure_ascii=False)
-            # self.json_widget.setText(json_string)
-            self.output_json = json_string
-            self.clipboard_signal.emit(json_string)
-            self.add_output_message("JSON generated and copied to clipboard!", "success")
-        except Exception as e:
-            self.add_output_message(f"Error generating JSON: {e}", "error")
+        self._emit_rendered_json(template_name, replace_dict)
     
     def generate_json_action_universal_topic(self):
         self.add_output_message("Generating JSON output...", "info")
@@ -3221,6 +3268,14 @@ class WSA(QMainWindow):
         else:
             self.add_output_message("Configuration cancelled by user.", "info")
             
+    def get_nas_base_folder(self) -> str:
+        """
+        返回当前系统下NAS中pacdora.com根目录的路径
+        """
+        if sys.platform.startswith('darwin'):
+            return "/Volumes/shared/pacdora.com/"
+        return "//nas01.tools.baoxiaohe.com/shared/pacdora.com/"
+    
     def ensure_folder_exists(self, folder_path):
         try:
             if not os.path.exists(folder_path):
@@ -3331,88 +3386,106 @@ class WSA(QMainWindow):
                 self.add_output_message(f"Invalid folder path and failed to create folder: {e}", "error")
                 return
 
+        # 上传并回写cdn.json
+        if not self._upload_folder_images(folder_path):
+            return
+
+        # 更新UI界面
+        if is_pass_cdn:
+            self.pass_cdn_records()
+
+    def _optimize_pending_images(self, folder_path: str, pending: dict, convert_webp: bool = False) -> dict:
+        """
+        在上传前用进程池压缩待上传的图片，输出到临时目录，NAS上的原图不变。
+        convert_webp 时输出 同名.webp 文件；返回的映射仍指向原图对应的cdn.json键，
+        因此 feature1.png 转换后的 feature1.webp（S3对象键为 随机UUID.webp）链接写入原图对应的键，
+        下次扫描仍按原图文件名判断已上传。
+
+        返回:
+            dict: 优化后的文件路径 -> cdn.json中的键
+        """
+        self.add_output_message(f"Optimizing {len(pending)} images before upload...", "info")
+        output_dir = resource_manager.get_temp_dir() / 'optimized' / os.path.basename(os.path.normpath(folder_path))
+        try:
+            results = optimize_images(list(pending), str(output_dir), OptimizeOptions(convert_webp=convert_webp),
+                                      output_callback=self.add_output_message)
+        except Exception as e:
+            self.add_output_message(f"Image optimization failed, uploading originals: {e}", "warning")
+            return pending
+        return {result.output_path: pending[result.source_path] for result in results}
+
+    def _upload_folder_images(self, folder_path: str) -> bool:
+        """
+        增量上传单个文件夹中的图片并回写cdn.json，供手动上传和bot共用。
+        缺失的图片会通过 S3Uploader.upload_many 并发上传。
+
+        返回:
+            bool: 是否成功完成扫描并写回cdn.json
+        """
         self.add_output_message("Starting incremental image upload...", "info")
         
         json_path = os.path.join(folder_path, 'cdn.json')
+        journal = CdnJournal(folder_path)
         
-        # 1. 读取现有CDN记录或创建新模板
-        cdn_data = {
-            "cover_cdn": "", "cover_more_cdn": "",
-            "mockup_list_1_number": "", "mockup_list_2_number": "",
-            "step1_cdn": "", "step2_cdn": "", "step3_cdn": "",
-            "feature1_cdn": "", "feature2_cdn": "", "feature3_cdn": "", "feature4_cdn": "",
-            "banner_cdn": ""
-        }
-        if os.path.exists(json_path):
-            try:
-                with open(json_path, 'r') as f:
-                    cdn_data.update(json.load(f)) # 用文件中的数据更新模板
-                self.add_output_message("Loaded existing cdn.json.", "info")
-            except json.JSONDecodeError:
-                self.add_output_message("Warning: cdn.json is corrupted. Starting with a fresh record.", "warning")
+        # 1. 读取现有CDN记录并重放上次中断时留下的日志
+        if journal.has_pending_entries():
+            self.add_output_message(f"Resuming interrupted upload: {journal.replayed_count()} links recovered from journal.", "info")
+        elif os.path.exists(json_path):
+            self.add_output_message("Loaded existing cdn.json.", "info")
+        cdn_data = journal.load()
 
         # 2. 扫描本地图片并仅上传缺失的图片
         try:
-            image_files = [f for f in os.listdir(folder_path) if f.lower().endswith(('.png', '.jpg', '.jpeg', '.webp'))]
+            image_files = list_folder_images(folder_path)
             total_images = len(image_files)
             self.add_output_message(f"Found {total_images} images in the folder.", "info")
 
+            # 文件路径 -> cdn.json中的键
+            pending = {}
             for i, image_name in enumerate(image_files):
-                filename, _ = os.path.splitext(image_name)
-                key_to_update = None
-                
-                # 建立文件名到JSON键的映射
-                if filename == 'banner':
-                    key_to_update = 'banner_cdn'
-                elif filename in ['1', '2', '3']:
-                    key_to_update = f"step{filename}_cdn"
-                elif filename in ['a', 'b', 'c', 'd']:
-                    key_to_update = f"feature{ord(filename) - ord('a') + 1}_cdn"
-                elif "mockup" in filename or "custom" in filename:
-                    parts = filename.replace("_", " ").split()
-                    number = parts[-1] if parts[-1].isdigit() else ""
-                    if "more" in parts:
-                        key_to_update = "cover_more_cdn"
-                        if number and not cdn_data.get("mockup_list_2_number"):
-                            cdn_data["mockup_list_2_number"] = number
-                    else:
-                        key_to_update = "cover_cdn"
-                        if number and not cdn_data.get("mockup_list_1_number"):
-                            cdn_data["mockup_list_1_number"] = number
-                
-                # 如果是未知图片，使用文件名作为key
-                if key_to_update is None:
-                    key_to_update = filename
-
-                # 检查是否需要上传
-                if not cdn_data.get(key_to_update):
-                    self.add_output_message(f"Uploading ({i+1}/{total_images}): {image_name}...", "info")
-                    file_path = os.path.join(folder_path, image_name)
-                    try:
-                        cdn_url = self.aws_upload.upload_file(file_path)
-                        
-                        if cdn_url:
-                            cdn_data[key_to_update] = cdn_url
-                            self.add_output_message(f"Upload successful: {cdn_url}", "success")
-                        else:
-                            self.add_output_message(f"Upload failed for {image_name}.", "error")
-                    except Exception as e:
-                        self.add_output_message(f"Upload failed for {image_name}: {e}", "error")
+                key_to_update = resolve_cdn_key(image_name, cdn_data)
+
+                # 检查是否需要上传（同一个键只上传一次）
+                if not cdn_data.get(key_to_update) and key_to_update not in pending.values():
+                    pending[os.path.join(folder_path, image_name)] = key_to_update
                 else:
                     self.add_output_message(f"Skipping ({i+1}/{total_images}): {image_name} (already uploaded).", "info")
 
-            # 3. 回写JSON文件
-            with open(json_path, 'w') as f:
-                json.dump(cdn_data, f, indent=4)
+            if pending:
+                if self.optimize_upload_checkbox.isChecked():
+                    pending = self._optimize_pending_images(folder_path, pending,
+                                                            convert_webp=self.webp_upload_checkbox.isChecked())
+
+                self.add_output_message(f"Uploading {len(pending)} images concurrently...", "info")
+
+                def on_complete(file_path, cdn_url, error):
+                    image_name = os.path.basename(file_path)
+                    if error is None:
+                        # 每完成一张立即写入日志，中途崩溃时下次可以直接续传
+                        journal.append(pending[file_path], cdn_url)
+                        self.add_output_message(f"Upload successful: {image_name} -> {cdn_url}", "success")
+                    else:
+                        self.add_output_message(f"Upload failed for {image_name}: {error}", "error")
+
+                uploaded, failed = self.aws_upload.upload_many(
+                    list(pending),
+                    on_complete=on_complete,
+                    dedup=self.dedup_upload_checkbox.isChecked(),
+                    progress_callback=self.add_output_message
+                )
+                for file_path, cdn_url in uploaded.items():
+                    cdn_data[pending[file_path]] = cdn_url
+                self.add_output_message(f"Uploaded {len(uploaded)}/{len(pending)} images, {len(failed)} failed.", "info" if not failed else "warning")
+
+            # 3. 原子地回写JSON文件并清空日志
+            journal.commit(cdn_data)
             
             self.add_output_message(f"CDN records updated successfully at {json_path}", "success")
-            
-            # 4. 更新UI界面
-            if is_pass_cdn:
-                self.pass_cdn_records()
+            return True
 
         except Exception as e:
             self.add_output_message(f"An error occurred during upload: {e}", "error")
+            return False
         
     def uploader_upload_folder(self, is_pass_cdn : bool = True):
         """
@@ -3446,92 +3519,16 @@ class WSA(QMainWindow):
                     self.add_output_message(f"Invalid folder path and failed to create folder: {e}", "error")
                     return
 
-            self.add_output_message("Starting incremental image upload...", "info")
-            
-            json_path = os.path.join(folder_path, 'cdn.json')
-            
-            # 1. 读取现有CDN记录或创建新模板
-            cdn_data = {
-                "cover_cdn": "", "cover_more_cdn": "",
-                "mockup_list_1_number": "", "mockup_list_2_number": "",
-                "step1_cdn": "", "step2_cdn": "", "step3_cdn": "",
-                "feature1_cdn": "", "feature2_cdn": "", "feature3_cdn": "", "feature4_cdn": "",
-                "banner_cdn": ""
-            }
-            if os.path.exists(json_path):
-                try:
-                    with open(json_path, 'r') as f:
-                        cdn_data.update(json.load(f)) # 用文件中的数据更新模板
-                    self.add_output_message("Loaded existing cdn.json.", "info")
-                except json.JSONDecodeError:
-                    self.add_output_message("Warning: cdn.json is corrupted. Starting with a fresh record.", "warning")
-
-            # 2. 扫描本地图片并仅上传缺失的图片
-            try:
-                image_files = [f for f in os.listdir(folder_path) if f.lower().endswith(('.png', '.jpg', '.jpeg', '.webp'))]
-                total_images = len(image_files)
-                self.add_output_message(f"Found {total_images} images in the folder.", "info")
-
-                for i, image_name in enumerate(image_files):
-                    filename, _ = os.path.splitext(image_name)
-                    key_to_update = None
-                    
-                    # 建立文件名到JSON键的映射
-                    if filename == 'banner':
-                        key_to_update = 'banner_cdn'
-                    elif filename in ['1', '2', '3']:
-                        key_to_update = f"step{filename}_cdn"
-                    elif filename in ['a', 'b', 'c', 'd']:
-                        key_to_update = f"feature{ord(filename) - ord('a') + 1}_cdn"
-                    elif "mockup" in filename or "custom" in filename:
-                        parts = filename.replace("_", " ").split()
-                        number = parts[-1] if parts[-1].isdigit() else ""
-                        if "more" in parts:
-                            key_to_update = "cover_more_cdn"
-                            if number and not cdn_data.get("mockup_list_2_number"):
-                                cdn_data["mockup_list_2_number"] = number
-                        else:
-                            key_to_update = "cover_cdn"
-                            if number and not cdn_data.get("mockup_list_1_number"):
-                                cdn_data["mockup_list_1_number"] = number
-                    
-                    # 如果是未知图片，使用文件名作为key
-                    if key_to_update is None:
-                        key_to_update = filename
-
-                    # 检查是否需要上传
-                    if not cdn_data.get(key_to_update):
-                        self.add_output_message(f"Uploading ({i+1}/{total_images}): {image_name}...", "info")
-                        file_path = os.path.join(folder_path, image_name)
-                        try:
-                            cdn_url = self.aws_upload.upload_file(file_path)
-                            
-                            if cdn_url:
-                                cdn_data[key_to_update] = cdn_url
-                                self.add_output_message(f"Upload successful: {cdn_url}", "success")
-                            else:
-                                self.add_output_message(f"Upload failed for {image_name}.", "error")
-                        except Exception as e:
-                            self.add_output_message(f"Upload failed for {image_name}: {e}", "error")
-                    else:
-                        self.add_output_message(f"Skipping ({i+1}/{total_images}): {image_name} (already uploaded).", "info")
-
-                # 3. 回写JSON文件
-                with open(json_path, 'w') as f:
-                    json.dump(cdn_data, f, indent=4)
-                
-                self.add_output_message(f"CDN records updated successfully at {json_path}", "success")
-                
-                # 4. 更新UI界面
-                # 使用信号在主线程中更新UI
-                # 判断是否存在cdn
-                cdn_records_exist = self.detect_cdn_records(folder_path=folder_path)
-                if cdn_records_exist:
-                    self.add_output_message("Detected cdn records, auto fill.", "success")
-                    self.pass_cdn_records()
+            # 上传并回写cdn.json
+            if not self._upload_folder_images(folder_path):
+                return
 
-            except Exception as e:
-                self.add_output_message(f"An error occurred during upload: {e}", "error")
+            # 更新UI界面
+            # 判断是否存在cdn
+            cdn_records_exist = self.detect_cdn_records(folder_path=folder_path)
+            if cdn_records_exist:
+                self.add_output_message("Detected cdn records, auto fill.", "success")
+                self.pass_cdn_records()
         
         Thread(target=worker, daemon=True).start()
             
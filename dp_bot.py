@@ -4,7 +4,8 @@ import csv
 import pickle
 from pathlib import Path
 from DrissionPage import Chromium
-import pyperclip
+from utils.json_transfer import JsonTransfer
+from utils.progress_store import SqliteCheckpointBackend, STATUS_SUCCESS
 from utils.update_json_action import *
 from typing import Callable, Literal, List
 from utils.resource_manager import get_resource_path
@@ -39,10 +40,14 @@ class BatchJsonTaskBot:
         self.timeout = 10  # 优化超时时间
         self.checkpoint_file = 'cache/faq_progress.pkl'
         self.cookie_file = 'cache/cookies.pkl'
+        # 断点进度存入 SQLite，首次运行时自动迁移旧的 pickle 断点
+        self.progress_store = SqliteCheckpointBackend.for_checkpoint(self.checkpoint_file)
         self.language = language
         self.update_action = update_action
         self.target_list = target_list
         self.target_csv_path = target_csv_path
+        # 页面内读写JSON，失败时回退到剪贴板
+        self.json_transfer = JsonTransfer()
         
         # 加载XPath配置
         with open('miscellaneous/web_ui_xpath.json', 'r', encoding='utf-8') as f:
@@ -70,12 +75,11 @@ class BatchJsonTaskBot:
             return []
         return targets
     
-    def save_progress(self, completed_targets: list):
-        """保存进度到断点文件"""
+    def save_progress(self, target: str, duration: float | None = None):
+        """记录单个目标已完成（SQLite upsert，与已完成数量无关）"""
         try:
-            with open(self.checkpoint_file, 'wb') as f:
-                pickle.dump(completed_targets, f)
-            print(f"  ✔️ 进度已保存到 {self.checkpoint_file}")
+            self.progress_store.mark(target, STATUS_SUCCESS, duration=duration)
+            print(f"  ✔️ 进度已保存到 {self.progress_store.db_path}")
         except Exception as e:
             print(f"    ❌保存进度失败: {e}")
     
@@ -142,20 +146,14 @@ class BatchJsonTaskBot:
             print(f"输入文本失败: {e}")
             return False
     
-    def load_progress(self) -> list:
-        """从断点文件加载进度"""
-        if Path(self.checkpoint_file).exists():
-            try:
-                with open(self.checkpoint_file, 'rb') as f:
-                    completed_targets = pickle.load(f)
-                print(f"  ✔️ 已从 {self.checkpoint_file} 加载进度，已完成 {len(completed_targets)} 个目标")
-                return completed_targets
-            except Exception as e:
-                print(f"    ❌加载进度文件失败: {e}")
-                return []
+    def load_progress(self) -> set:
+        """从进度数据库加载已完成的目标"""
+        completed_targets = self.progress_store.completed()
+        if completed_targets:
+            print(f"  ✔️ 已从 {self.progress_store.db_path} 加载进度，已完成 {len(completed_targets)} 个目标")
         else:
-            print("⚠️未找到断点文件，将从头开始处理")
-            return []
+            print("⚠️未找到断点记录，将从头开始处理")
+        return completed_targets
     
     def save_cookies(self, page):
         """保存cookies到文件"""
@@ -328,20 +326,16 @@ class BatchJsonTaskBot:
                 
                 get_json_button = editor_tab.ele("获取当前JSON")
                 if get_json_button:
-                    get_json_button.click()
+                    json_str = self.json_transfer.read_json(editor_tab, get_json_button)
                     print("  ✔️ 成功获取json")
                     
-                    # 获取剪贴板内容并替换
-                    time.sleep(1)  # 等待复制完成
-                    json_str = pyperclip.paste()
                     replaced_str = self.update_action(json_str)
                     print("  ✔️ 成功替换json")
                     
                     # 输入替换后的JSON
                     json_input = editor_tab.ele("@class=app-writer")
                     if json_input:
-                        json_input.click()
-                        json_input.input(replaced_str)
+                        self.json_transfer.write_json(json_input, replaced_str)
                         
                         # 保存JSON输入
                         json_input_save_button = editor_tab.ele("确定")
@@ -431,10 +425,11 @@ class BatchJsonTaskBot:
                             continue
                     
                     # 处理目标
+                    start = time.perf_counter()
                     if self.process_single_target(target):
                         print(f"✅ {target}已成功更新")
-                        completed_targets.append(target)
-                        self.save_progress(completed_targets)
+                        completed_targets.add(target)
+                        self.save_progress(target, time.perf_counter() - start)
                     else:
                         print(f"    ❌{target}处理失败")
                     
@@ -443,7 +438,6 @@ class BatchJsonTaskBot:
                 except Exception as e:
                     print(f"    ❌处理{target}时发生错误: {e}")
                     print("⚠️程序中断，已保存当前进度")
-                    self.save_progress(completed_targets)
                     break
             
             # 完成处理
@@ -452,6 +446,7 @@ class BatchJsonTaskBot:
             else:
                 print("  ✔️ 所有剩余目标已处理完成！")
                 print(f"📊总共处理了 {len(completed_targets)}/{len(all_targets)} 个目标")
+                print(self.json_transfer.summary())
                 
         except Exception as e:
             print(f"    ❌程序运行出错: {e}")
@@ -3,6 +3,9 @@ import json
 import csv
 import pickle
 import random
+import queue
+import threading
+from collections import deque
 from pathlib import Path
 from DrissionPage import Chromium
 from abc import ABC, abstractmethod
@@ -10,6 +13,14 @@ from typing import Callable, Literal, List, Dict, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 from utils.resource_manager import get_writable_path
+from utils.upload_pipeline import TargetReadiness
+from utils.json_transfer import JsonTransfer
+from utils.step_profiler import StepProfiler, span
+from utils.review_queue import ReviewQueue
+from utils.edit_url_index import EditUrlIndex
+from utils.progress_store import (
+    CheckpointBackend, SqliteCheckpointBackend, STATUS_SUCCESS, STATUS_FAILED, STATUS_SKIPPED, STATUS_DEFERRED
+)
 
 # =========================== 日志接口 ===========================
 
@@ -32,6 +43,82 @@ def set_log_callback(callback):
     _log_callback = callback
         
         
+# =========================== 条件等待 ===========================
+
+# 每个处理线程单独记录当前目标的等待情况（多标签页并行时互不干扰）
+_wait_records = threading.local()
+
+def wait_until(condition: Callable[[], Any], timeout: float, label: str,
+               baseline: float = 0.0, interval: float = 0.1) -> bool:
+    """
+    轮询条件直到满足或超时，并报告实际等待时长
+    :param condition: 返回真值即视为满足，抛出异常视为尚未满足
+    :param timeout: 最长等待秒数
+    :param label: 用于报告的等待名称
+    :param baseline: 被替换的固定等待时长，用于统计节省的时间
+    :return: 条件是否在超时前满足
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    while True:
+        try:
+            satisfied = bool(condition())
+        except Exception:
+            satisfied = False
+        if satisfied or time.perf_counter() >= deadline:
+            break
+        time.sleep(interval)
+
+    elapsed = time.perf_counter() - start
+    records = getattr(_wait_records, 'items', None)
+    if records is not None:
+        records.append((label, elapsed, baseline, satisfied))
+    log(f"   ⏱️ 等待{label}: {elapsed:.2f}s" + ("" if satisfied else f"（超时 {timeout}s）"))
+    return satisfied
+
+def begin_wait_recording():
+    """开始记录当前线程的等待"""
+    _wait_records.items = []
+
+def end_wait_recording() -> List[tuple]:
+    """结束记录并返回 (名称, 实际耗时, 原固定等待, 是否满足) 列表"""
+    items = getattr(_wait_records, 'items', None) or []
+    _wait_records.items = None
+    return items
+
+def element_present(page, locator: str, index: int = 1) -> Callable[[], bool]:
+    """条件：元素存在"""
+    return lambda: bool(page.ele(locator, index=index, timeout=0))
+
+def element_gone(element) -> Callable[[], bool]:
+    """条件：元素已移除或不可见（例如对话框已关闭）"""
+    def condition():
+        try:
+            return not element.states.is_displayed
+        except Exception:
+            return True
+    return condition
+
+def tab_closed(tab) -> Callable[[], bool]:
+    """条件：标签页已关闭"""
+    return lambda: tab.tab_id not in tab.browser.tab_ids
+
+def all_of(*conditions: Callable[[], Any]) -> Callable[[], bool]:
+    """条件：按顺序全部满足（前一个满足后才检查下一个），用于把替换同一个固定等待的多个条件合成一次等待"""
+    return lambda: all(condition() for condition in conditions)
+
+def network_idle(page, quiet: float = 0.5) -> Callable[[], bool]:
+    """条件：页面在 quiet 秒内没有新的网络请求"""
+    state = {"count": -1, "since": time.perf_counter()}
+    def condition():
+        count = page.run_js("return performance.getEntriesByType('resource').length;")
+        now = time.perf_counter()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+            return False
+        return now - state["since"] >= quiet
+    return condition
+
 # =========================== 基础定义 ===========================
 
 class ProcessResult(Enum):
@@ -52,6 +139,19 @@ class OperationConfig:
     checkpoint_file: str = 'cache/progress.pkl'
     cookie_file: str = 'cache/cookies.pkl'
     xpath_config_file: str = 'miscellaneous/web_ui_xpath.json'
+    # 后台接口配置（API 模式使用），可指向本地替身服务器进行测试
+    # 以下接口路径和字段名尚未与线上后台核实，API 模式目前为实验功能
+    api_base_url: str = 'https://op.pacdora.com/api'
+    api_list_endpoint: str = '/topic/list'
+    api_get_endpoint: str = '/topic/detail'
+    api_save_endpoint: str = '/topic/update'
+    api_path_field: str = 'path'
+    api_id_field: str = 'id'
+    api_json_field: str = 'json'
+    api_language_param: str = 'language'
+
+# 保存成功后后台会跳回的专题列表页
+DEFAULT_LIST_URL = 'https://op.pacdora.com/topic/List'
 
 # =========================== 策略接口 ===========================
 
@@ -78,6 +178,15 @@ class SearchStrategy(ABC):
     def search_target(self, page, target: str) -> int:
         """搜索目标，返回结果数量"""
         raise NotImplementedError("必须实现搜索方法")
+
+    def describe_results(self, page, target: str) -> List[str]:
+        """返回当前搜索结果的文本快照（不含表头），暂存待复核时使用"""
+        if page is None:
+            return []
+        try:
+            return [row.text.strip() for row in page.eles("tag:tr", timeout=0)[1:]]
+        except Exception:
+            return []
     
 class InteractionStrategy(ABC):
     """交互策略接口，用于处理需要用户确认的场景"""
@@ -190,6 +299,10 @@ class StandardNavigationStrategy(NavigationStrategy):
             log("  ✔️ 成功跳转到操作页面")
             return self._switch_language(page)
         return False
+
+    def restore_language(self, page) -> bool:
+        """列表页被重新加载后重新选择语言（例如直达编辑页后回到列表页搜索）"""
+        return self._switch_language(page)
     
     def _switch_language(self, page) -> bool:
         try:
@@ -224,21 +337,20 @@ class FlexibleSearchStrategy(SearchStrategy):
                 else:
                     return 0
                 
-                time.sleep(1.5)
+                # 等待列表的输入防抖结束（输入后 0.5s 内没有新的网络请求）再回车，最长等待原先固定的 1.5s。
+                # input() 同步写入输入框的值，值本身不能说明防抖已结束；这一步没有可观测的完成事件，
+                # 因此不设 baseline，不计入节省时间的统计
+                wait_until(network_idle(page), 1.5, "搜索输入防抖")
                 page.actions.key_down('Enter').key_up('Enter')
                 
-                # 等待搜索结果
-                max_wait = 30
-                for i in range(max_wait):
-                    tr_elements = page.eles("tag:tr")
-                    if (len(tr_elements) != len(tr_elements_before) and 
-                        len(tr_elements) not in [0, 11]):
-                        break
-                    time.sleep(1)
-                else:
-                    tr_elements = page.eles("tag:tr")
+                # 等待搜索结果：表格行数发生变化即视为结果已刷新
+                before_count = len(tr_elements_before)
+                def results_loaded():
+                    count = len(page.eles("tag:tr", timeout=0))
+                    return count != before_count and count not in [0, 11]
+                wait_until(results_loaded, 30, "搜索结果")
                 
-                result_count = len(tr_elements)
+                result_count = len(page.eles("tag:tr"))
                 log(f"🚩搜索结果数量: {result_count-1}")
                 return result_count
         except Exception as e:
@@ -315,6 +427,8 @@ class GuiInteractionHandler(InteractionStrategy):
         
         # 可选：支持消息回调（如 add_output_message）
         self.on_request = None  # 外部设置，用于显示提示
+        # 可选：终止任务时的回调（如关闭浏览器），由机器人注册
+        self.on_stop_requested = None
 
     def is_waiting_for_input(self) -> bool:
         return self._is_waiting
@@ -369,19 +483,124 @@ class StandardEditorStrategy(EditorStrategy):
                 return False
             
             edit_option.click()
-            time.sleep(2)
+            wait_until(lambda: 'edit' in page.url, 10, "打开编辑页", baseline=2)
             return True
         except Exception as e:
             log(f"    ❌打开编辑页失败: {e}")
             return False
 
+class IndexedSearchStrategy(SearchStrategy):
+    """
+    带编辑页 URL 索引的搜索策略，与 IndexedEditorStrategy 配合使用
+    索引命中时直接打开编辑页，跳过输入搜索和等待结果；未命中或记录已失效时回到列表页按原方式搜索，
+    唯一命中的目标在打开编辑页后记录 URL，同一批页面再次运行时即可直达
+    回到列表页是一次完整的重新加载，会丢失启动时选择的语言，因此需要传入 restore_language 在加载后重新选择
+    """
+
+    def __init__(self, search_strategy: SearchStrategy, edit_url_index: EditUrlIndex, list_url: str,
+                 edit_url_contains: str = "edit", edit_page_marker: str = "编辑值", timeout: float = 15,
+                 restore_language: Optional[Callable[[Any], bool]] = None):
+        self.search_strategy = search_strategy
+        self.restore_language = restore_language
+        self.edit_url_index = edit_url_index
+        self.list_url = list_url
+        self.edit_url_contains = edit_url_contains
+        self.edit_page_marker = edit_page_marker
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        # 直接打开了编辑页的目标
+        self._direct: set = set()
+        # 搜索结果唯一、打开编辑页后可以记录 URL 的目标
+        self._unique: set = set()
+
+    def search_target(self, page, target: str) -> int:
+        url = self.edit_url_index.get(target) if page is not None else None
+        if url:
+            if self._open_direct(page, url):
+                with self._lock:
+                    self._direct.add(target)
+                log(f"  🔗 直接打开编辑页: {url}")
+                # 与搜索唯一命中一致：返回值包含表头行
+                return 2
+            log(f"  🟡 记录的编辑页已失效，改为搜索: {url}")
+            self.edit_url_index.invalidate(target)
+
+        # 搜索需要在列表页进行（上一个目标可能是直接打开的编辑页）
+        if page is not None and not page.url.startswith(self.list_url):
+            page.get(self.list_url)
+            if self.restore_language is not None and not self.restore_language(page):
+                # 语言不对时搜索到的是其他语言的页面，宁可按未找到处理
+                log(f"    ❌回到列表页后未能恢复语言，跳过 {target}")
+                return 0
+        result_count = self.search_strategy.search_target(page, target)
+        if result_count == 2:
+            with self._lock:
+                self._unique.add(target)
+        return result_count
+
+    def _open_direct(self, page, url: str) -> bool:
+        try:
+            page.get(url)
+        except Exception as e:
+            log(f"    ❌打开编辑页失败: {e}")
+            return False
+        return wait_until(
+            lambda: self.edit_url_contains in page.url and page.ele(self.edit_page_marker, timeout=0),
+            self.timeout, "直达编辑页"
+        )
+
+    def describe_results(self, page, target: str) -> List[str]:
+        return self.search_strategy.describe_results(page, target)
+
+    def opened_directly(self, target: str) -> bool:
+        with self._lock:
+            if target in self._direct:
+                self._direct.discard(target)
+                return True
+            return False
+
+    def record_edit_url(self, page, target: str):
+        """编辑页通过搜索打开后记录其 URL（仅限搜索结果唯一的目标）"""
+        with self._lock:
+            if target not in self._unique:
+                return
+            self._unique.discard(target)
+        try:
+            url = page.url
+            # 编辑器等待超时时页面可能仍停留在列表页，不能当作编辑页地址记录
+            if self.edit_url_contains not in url:
+                log(f"    🟡 当前页面不是编辑页，不记录地址: {url}")
+                return
+            self.edit_url_index.put(target, url)
+        except Exception as e:
+            log(f"    ❌记录编辑页地址失败: {e}")
+
+class IndexedEditorStrategy(EditorStrategy):
+    """配合 IndexedSearchStrategy：已直接打开编辑页的目标不再点击菜单，通过菜单打开的记录其 URL"""
+
+    def __init__(self, editor_strategy: EditorStrategy, search_strategy: IndexedSearchStrategy):
+        self.editor_strategy = editor_strategy
+        self.search_strategy = search_strategy
+
+    def open_editor(self, page, target: str) -> bool:
+        if self.search_strategy.opened_directly(target):
+            return True
+        opened = self.editor_strategy.open_editor(page, target)
+        if opened:
+            self.search_strategy.record_edit_url(page, target)
+        return opened
+
 class JsonProcessStrategy(ProcessStrategy):
     """JSON处理策略"""
     
+    def __init__(self, json_transfer: Optional[JsonTransfer] = None, list_url: str = DEFAULT_LIST_URL):
+        # 默认在页面内通过 JS 读写 JSON，失败时回退到剪贴板
+        self.json_transfer = json_transfer or JsonTransfer(log_func=log)
+        # 保存后跳转回的列表页，指向替身服务器时需要替换
+        self.list_url = list_url
+    
     def process_target(self, page, target: str, update_action: Callable[[str], str]) -> ProcessResult:
         try:
-            import pyperclip
-            
             # 等待页面加载
             page.wait.load_start()
             
@@ -390,13 +609,9 @@ class JsonProcessStrategy(ProcessStrategy):
             if not open_editor_button:
                 return ProcessResult.FAILED
             
-            open_editor_button.click()
-            time.sleep(1.5)
-            
-            # 获取编辑器页面
-            browser = page.browser
-            editor_tab = browser.latest_tab
-            editor_tab.set.activate()
+            # 获取编辑器页面（直接取点击打开的新标签页，多标签页并行时不能依赖 latest_tab）
+            editor_tab = open_editor_button.click.for_new_tab()
+            wait_until(element_present(editor_tab, "@@type=button@@class^el-button"), 15, "编辑器加载", baseline=1.5)
             
             # 点击JSON工具按钮
             json_tool_button = editor_tab.ele("@@type=button@@class^el-button")
@@ -404,46 +619,50 @@ class JsonProcessStrategy(ProcessStrategy):
                 return ProcessResult.FAILED
             
             json_tool_button.click(by_js=True)
-            time.sleep(1)
+            wait_until(element_present(editor_tab, "获取当前JSON"), 10, "JSON工具", baseline=1)
             
             # 获取JSON
             get_json_button = editor_tab.ele("获取当前JSON")
             if not get_json_button:
                 return ProcessResult.FAILED
             
-            get_json_button.click()
-            time.sleep(1)
+            with span("get_json"):
+                json_str = self.json_transfer.read_json(editor_tab, get_json_button)
             
             # 处理JSON
-            json_str = pyperclip.paste()
-            replaced_str = update_action(json_str)
+            with span("update_action"):
+                replaced_str = update_action(json_str)
             
             # 输入处理后的JSON
             json_input = editor_tab.ele("@class=app-writer")
             if not json_input:
                 return ProcessResult.FAILED
             
-            json_input.click()
-            json_input.input(replaced_str)
-            
-            # 保存JSON
-            save_json_button = editor_tab.ele("确定")
-            if save_json_button:
-                save_json_button.click()
-                time.sleep(1)
+            with span("input"):
+                self.json_transfer.write_json(json_input, replaced_str)
             
-            # 保存编辑器
-            save_editor_button = editor_tab.ele("@@type=button@@class^el-button", index=8)
-            if save_editor_button:
-                save_editor_button.click()
-                time.sleep(5)
+            with span("save"):
+                # 保存JSON
+                save_json_button = editor_tab.ele("确定")
+                if save_json_button:
+                    save_json_button.click()
+                    wait_until(element_gone(json_input), 10, "JSON对话框关闭", baseline=1)
+                
+                # 保存编辑器
+                save_editor_button = editor_tab.ele("@@type=button@@class^el-button", index=8)
+                if save_editor_button:
+                    save_editor_button.click()
+                    # 原先固定等待 5s，编辑器未关闭时不再多等
+                    wait_until(tab_closed(editor_tab), 5, "编辑器保存并关闭", baseline=5)
             
             # 最终保存
-            edit_page = browser.get_tab(1)
+            edit_page = page
             final_save_button = edit_page.ele('保存')
             if final_save_button:
                 final_save_button.click()
-                if edit_page.wait.url_change('https://op.pacdora.com/topic/List', timeout=60):
+                with span("url_change"):
+                    changed = edit_page.wait.url_change(self.list_url, timeout=60)
+                if changed:
                     return ProcessResult.SUCCESS
             
             return ProcessResult.FAILED
@@ -456,33 +675,48 @@ class ReplacePlaceholderJsonStrategy(ProcessStrategy):
     """
     从本地 cdn.json 读取 CDN 链接并替换 JSON 的策略
     与 GUI 解耦，只需传入 base_folder
+    如果传入 readiness，则在读取 cdn.json 前只等待当前目标的图片上传完成，
+    其余目标可以在机器人操作浏览器的同时在后台上传
     """
-    def __init__(self, base_folder: str):
+    def __init__(self, base_folder: str, readiness: Optional[TargetReadiness] = None,
+                 ready_timeout: float = 600, json_transfer: Optional[JsonTransfer] = None,
+                 list_url: str = DEFAULT_LIST_URL):
         self.base_folder = Path(base_folder)
+        self.list_url = list_url
+        self.readiness = readiness
+        self.ready_timeout = ready_timeout
+        self.json_transfer = json_transfer or JsonTransfer(log_func=log)
 
     def process_target(self, page, target: str, update_action: Callable[[str], str]) -> ProcessResult:
         try:
-            import pyperclip
             page.wait.load_start()
 
-            # 打开编辑器
-            if not page.ele('编辑值').click(by_js=True):
+            # 先等待该目标的图片上传完成，再打开编辑器，避免编辑标签页在等待期间一直开着
+            if self.readiness is not None:
+                if not self.readiness.is_ready(target):
+                    log(f"   ⏳ 等待 {target} 的图片上传完成...")
+                wait_start = time.perf_counter()
+                with span("upload_ready"):
+                    ready = self.readiness.wait(target, timeout=self.ready_timeout)
+                if not ready:
+                    log(f"❌ {target} 的图片上传失败或超时")
+                    return ProcessResult.FAILED
+                log(f"   ✔️ 图片已就绪，等待 {time.perf_counter() - wait_start:.1f}s")
+
+            # 打开编辑器，并直接取点击打开的编辑标签页
+            editor_tab = page.ele('编辑值').click.for_new_tab(by_js=True)
+            if not editor_tab:
                 return ProcessResult.FAILED
-            time.sleep(1.5)
-
-            # 切换到编辑标签页
-            editor_tab = page.browser.latest_tab
-            editor_tab.set.activate()
+            wait_until(element_present(editor_tab, "@@type=button@@class^el-button"), 15, "编辑器加载", baseline=1.5)
             log(f"🚩切换到编辑标签页")
 
             # 获取 JSON
             editor_tab.ele("@@type=button@@class^el-button").click(by_js=True)
-            time.sleep(0.5)
-            editor_tab.ele("获取当前JSON").click()
-            time.sleep(1)
+            wait_until(element_present(editor_tab, "获取当前JSON"), 10, "JSON工具", baseline=0.5)
+            with span("get_json"):
+                original_json = self.json_transfer.read_json(editor_tab, editor_tab.ele("获取当前JSON"))
             log(f"   ✔️ 获取当前JSON成功")
 
-            original_json = pyperclip.paste()
             if not original_json:
                 return ProcessResult.FAILED
 
@@ -497,37 +731,40 @@ class ReplacePlaceholderJsonStrategy(ProcessStrategy):
 
             # 替换（调用 iterate）
             from utils.update_json_action import iterate
-            replaced_json = iterate(
-                original_json,
-                cdn_data.get("step1_cdn", ""),
-                cdn_data.get("step2_cdn", ""),
-                cdn_data.get("step3_cdn", ""),
-                cdn_data.get("feature1_cdn", ""),
-                cdn_data.get("feature2_cdn", ""),
-                cdn_data.get("feature3_cdn", ""),
-                cdn_data.get("feature4_cdn", "")
-            )
+            with span("update_action"):
+                replaced_json = iterate(
+                    original_json,
+                    cdn_data.get("step1_cdn", ""),
+                    cdn_data.get("step2_cdn", ""),
+                    cdn_data.get("step3_cdn", ""),
+                    cdn_data.get("feature1_cdn", ""),
+                    cdn_data.get("feature2_cdn", ""),
+                    cdn_data.get("feature3_cdn", ""),
+                    cdn_data.get("feature4_cdn", "")
+                )
 
             # 输入新 JSON
             input_ele = editor_tab.ele("@class=app-writer")
-            input_ele.click()
-            input_ele.input(replaced_json)
+            with span("input"):
+                self.json_transfer.write_json(input_ele, replaced_json)
             log(f"   ✔️ 输入替换后的JSON成功")
-            # 保存JSON
-            save_json_button = editor_tab.ele("确定")
-            if save_json_button:
-                save_json_button.click()
-                time.sleep(1)
-            log(f"   ✔️ 保存JSON成功")
-
-            # 保存编辑器
-            save_editor_button = editor_tab.ele("@@type=button@@class^el-button", index=8)
-            if save_editor_button:
-                save_editor_button.click()
-                time.sleep(5)
-            log(f"   ✔️ 保存编辑器成功")
+            with span("save"):
+                # 保存JSON
+                save_json_button = editor_tab.ele("确定")
+                if save_json_button:
+                    save_json_button.click()
+                    wait_until(element_gone(input_ele), 10, "JSON对话框关闭", baseline=1)
+                log(f"   ✔️ 保存JSON成功")
+
+                # 保存编辑器
+                save_editor_button = editor_tab.ele("@@type=button@@class^el-button", index=8)
+                if save_editor_button:
+                    save_editor_button.click()
+                    # 原先固定等待 5s，编辑器未关闭时不再多等
+                    wait_until(tab_closed(editor_tab), 5, "编辑器保存并关闭", baseline=5)
+                log(f"   ✔️ 保存编辑器成功")
             # 回主页面保存
-            edit_page = page.browser.get_tab(1)
+            edit_page = page
             
             thumbnail = page.ele('修改字段',-6)
             thumbnail.click()
@@ -548,7 +785,9 @@ class ReplacePlaceholderJsonStrategy(ProcessStrategy):
             confirm.click()
             
             edit_page.ele('保存').click()
-            if edit_page.wait.url_change('https://op.pacdora.com/topic/List', timeout=60):
+            with span("url_change"):
+                changed = edit_page.wait.url_change(self.list_url, timeout=60)
+            if changed:
                 return ProcessResult.SUCCESS
 
         except Exception as e:
@@ -583,7 +822,7 @@ class SyncOnlineProcessStrategy(ProcessStrategy):
                 return ProcessResult.FAILED
                 
             sync_button.hover()
-            time.sleep(1)
+            wait_until(lambda: page.ele('同步启用', timeout=0).states.is_displayed, 5, "同步菜单", baseline=1)
             
             # 点击同步启用
             sync_online_button = page.ele('同步启用')
@@ -598,8 +837,9 @@ class SyncOnlineProcessStrategy(ProcessStrategy):
             sync_confirm_button.click()
             log(f"   ✔️ 确认同步启用，请等待同步完成...")
 
-            # 等待处理完成
-            page.wait(8,10)
+            # 等待处理完成：确认对话框关闭且网络请求平静下来
+            # 两个条件共同替换原先的固定等待 page.wait(8, 10)，合成一次等待以便与原等待时长对比
+            wait_until(all_of(element_gone(sync_confirm_button), network_idle(page)), 20, "同步确认及请求完成", baseline=9)
             
             log(f"  ✔️ {target} 同步状态设置成功")
 
@@ -612,8 +852,221 @@ class SyncOnlineProcessStrategy(ProcessStrategy):
             return ProcessResult.FAILED
 
 
+# =========================== API 模式 ===========================
+
+# GUI 中的语言名称 -> 后台接口使用的语言代码
+API_LANGUAGE_CODES = {
+    "英语": "en", "西班牙语": "es", "葡萄牙语": "pt", "法语": "fr",
+    "印度尼西亚语": "id", "日语": "ja", "中文": "zh",
+}
+
+class OpApiClient:
+    """
+    op.pacdora.com 后台接口客户端
+    复用 CookieLoginStrategy 保存的 cookie，使用带连接池的 requests.Session，
+    供 API 模式下的搜索和处理策略共用（线程安全，可被多个工作线程同时使用）
+    """
+
+    def __init__(self, config: OperationConfig, pool_size: int = 8):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.config = config
+        self.language: Optional[str] = None
+        self.session = requests.Session()
+        # 只对幂等的 GET 请求自动重试，保存请求失败时交由上层决定
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], allowed_methods=["GET"])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json"})
+        # 搜索到的目标 -> 页面 id，供处理策略使用
+        self._target_ids: Dict[str, Any] = {}
+        self._ids_lock = threading.Lock()
+
+    def load_cookies(self, cookie_file: str) -> bool:
+        """从 CookieLoginStrategy 保存的 pickle 文件加载 cookie"""
+        path = Path(get_writable_path(cookie_file))
+        if not path.exists():
+            log(f"    🟡 cookie 文件不存在，请先用浏览器模式登录一次: {path}")
+            return False
+        try:
+            with open(path, 'rb') as f:
+                cookies = pickle.load(f)
+            for cookie in cookies:
+                self.session.cookies.set(
+                    cookie['name'], cookie['value'],
+                    domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+                )
+            log(f"✅ 成功加载 {len(cookies)} 个 cookies 到 API 会话")
+            return True
+        except Exception as e:
+            log(f"    ❌ 加载 cookie 失败: {type(e).__name__}: {e}")
+            return False
+
+    def _url(self, endpoint: str) -> str:
+        return self.config.api_base_url.rstrip('/') + endpoint
+
+    @staticmethod
+    def _unwrap(response):
+        """校验响应并取出 data 字段，兼容 {code, msg, data} 和直接返回数据两种格式"""
+        response.raise_for_status()
+        body = response.json()
+        if isinstance(body, dict) and 'data' in body:
+            code = body.get('code')
+            if code not in (None, 0, 200):
+                raise RuntimeError(f"接口返回错误 {code}: {body.get('msg') or body.get('message')}")
+            return body['data']
+        return body
+
+    def _language_params(self) -> dict:
+        if self.language and self.config.api_language_param:
+            return {self.config.api_language_param: self.language}
+        return {}
+
+    def list_pages(self, target: str) -> list:
+        """按页面路径搜索，返回完全匹配的记录列表"""
+        params = {self.config.api_path_field: target, **self._language_params()}
+        data = self._unwrap(self.session.get(self._url(self.config.api_list_endpoint), params=params, timeout=self.config.timeout))
+        if isinstance(data, dict):
+            data = data.get('list') or data.get('records') or data.get('items') or []
+        return [row for row in data if str(row.get(self.config.api_path_field, '')).strip('/') == target.strip('/')]
+
+    def get_page(self, page_id) -> dict:
+        params = {self.config.api_id_field: page_id, **self._language_params()}
+        return self._unwrap(self.session.get(self._url(self.config.api_get_endpoint), params=params, timeout=self.config.timeout))
+
+    def save_page(self, page_data: dict):
+        return self._unwrap(self.session.post(
+            self._url(self.config.api_save_endpoint), params=self._language_params(),
+            json=page_data, timeout=self.config.timeout
+        ))
+
+    def remember_target(self, target: str, page_id):
+        with self._ids_lock:
+            self._target_ids[target] = page_id
+
+    def target_id(self, target: str):
+        with self._ids_lock:
+            return self._target_ids.get(target)
+
+class ApiLoginStrategy(LoginStrategy):
+    """API 登录策略：复用浏览器模式保存的 cookie，不打开浏览器"""
+
+    def __init__(self, client: OpApiClient):
+        self.client = client
+
+    def execute_login(self, page, config: OperationConfig) -> bool:
+        if not self.client.load_cookies(config.cookie_file):
+            return False
+        try:
+            # 用一次列表请求验证 cookie 是否仍然有效
+            response = self.client.session.get(self.client._url(config.api_list_endpoint), timeout=config.timeout)
+        except Exception as e:
+            log(f"    ❌ 无法连接后台接口: {e}")
+            return False
+        if response.status_code in (401, 403):
+            log("    ❌ API 会话验证失败，cookie 可能已过期，请先用浏览器模式重新登录")
+            return False
+        if not response.ok:
+            log(f"    ❌ API 会话验证失败: {config.api_list_endpoint} 返回 HTTP {response.status_code}，请确认接口地址")
+            return False
+        # 未登录时后台可能返回 200 的登录页，必须是预期结构的 JSON 才算验证通过
+        try:
+            data = self.client._unwrap(response)
+        except Exception as e:
+            log(f"    ❌ API 会话验证失败，响应不是预期的 JSON: {type(e).__name__}: {e}")
+            return False
+        if isinstance(data, dict):
+            data = data.get('list', data.get('records', data.get('items')))
+        if not isinstance(data, list):
+            log(f"    ❌ API 会话验证失败，{config.api_list_endpoint} 的响应中没有记录列表")
+            return False
+        log("  ✔️ API 会话验证成功")
+        return True
+
+class ApiNavigationStrategy(NavigationStrategy):
+    """API 导航策略：只需设置请求使用的语言"""
+
+    def __init__(self, client: OpApiClient, language: str):
+        self.client = client
+        self.language = language
+
+    def navigate_to_target(self, page, config: OperationConfig) -> bool:
+        self.client.language = API_LANGUAGE_CODES.get(self.language, self.language)
+        log(f"  ✔️ API 模式使用语言: {self.language} ({self.client.language})")
+        return True
+
+class ApiSearchStrategy(SearchStrategy):
+    """通过列表接口搜索目标"""
+
+    def __init__(self, client: OpApiClient):
+        self.client = client
+        # 多个结果时保留记录，供复核快照使用
+        self._ambiguous_rows: Dict[str, list] = {}
+
+    def search_target(self, page, target: str) -> int:
+        try:
+            rows = self.client.list_pages(target)
+        except Exception as e:
+            log(f"    ❌搜索目标失败: {e}")
+            return 0
+        if len(rows) == 1:
+            self.client.remember_target(target, rows[0].get(self.client.config.api_id_field))
+        elif len(rows) > 1:
+            self._ambiguous_rows[target] = rows
+        log(f"🚩搜索结果数量: {len(rows)}")
+        # 与浏览器模式保持一致：返回值包含表头行
+        return len(rows) + 1
+
+    def describe_results(self, page, target: str) -> List[str]:
+        return [json.dumps(row, ensure_ascii=False) for row in self._ambiguous_rows.pop(target, [])]
+
+class ApiProcessStrategy(ProcessStrategy):
+    """通过详情/保存接口读取、更新并保存页面 JSON"""
+
+    def __init__(self, client: OpApiClient):
+        self.client = client
+
+    def process_target(self, page, target: str, update_action: Callable[[str], str]) -> ProcessResult:
+        page_id = self.client.target_id(target)
+        if page_id is None:
+            log(f"    ❌{target} 没有唯一的页面 id，请在浏览器模式下处理")
+            return ProcessResult.FAILED
+        json_field = self.client.config.api_json_field
+        try:
+            start = time.perf_counter()
+            with span("get_json"):
+                page_data = self.client.get_page(page_id)
+            original = page_data.get(json_field)
+            if original is None:
+                log(f"    ❌{target} 的详情中没有字段 {json_field}")
+                return ProcessResult.FAILED
+
+            # 接口可能直接返回对象，也可能返回 JSON 字符串
+            is_text = isinstance(original, str)
+            json_str = original if is_text else json.dumps(original, ensure_ascii=False)
+            with span("update_action"):
+                replaced_str = update_action(json_str)
+            if replaced_str == json_str:
+                log(f"   ➖ {target} 无需修改")
+                return ProcessResult.SUCCESS
+
+            page_data[json_field] = replaced_str if is_text else json.loads(replaced_str)
+            with span("save"):
+                self.client.save_page(page_data)
+            log(f"   ✔️ 已通过接口保存，用时 {time.perf_counter() - start:.2f}s")
+            return ProcessResult.SUCCESS
+        except Exception as e:
+            log(f"    ❌处理目标失败: {e}")
+            return ProcessResult.FAILED
+
 # =========================== 主框架 ===========================
 
+# 完成多少个目标后输出一次剩余用时预估
+PROFILE_WARMUP_TARGETS = 3
+
 class ModularBatchBot:
     """模块化批量处理机器人"""
     
@@ -627,7 +1080,12 @@ class ModularBatchBot:
                  update_action: Callable[[str], str],
                  interaction_strategy: Optional[InteractionStrategy] = None,
                  target_list: Optional[List[str]] = None,
-                 target_csv_path: Optional[str] = None):
+                 target_csv_path: Optional[str] = None,
+                 worker_tabs: int = 1,
+                 use_browser: bool = True,
+                 progress_store: Optional[CheckpointBackend] = None,
+                 browser_options: Optional[Any] = None,
+                 review_queue: Optional[ReviewQueue] = None):
         
         if target_list is None and target_csv_path is None:
             raise ValueError("Either 'target_list' or 'target_csv_path' must be provided")
@@ -644,8 +1102,25 @@ class ModularBatchBot:
         self.target_list = target_list
         self.target_csv_path = target_csv_path
         self.interaction_strategy = interaction_strategy
+        # 并行处理的标签页数量，1 表示沿用单标签页串行处理
+        self.worker_tabs = max(1, worker_tabs)
         
-        self.browser = Chromium()
+        # API 模式下所有策略都直接调用后台接口，不需要启动浏览器
+        # browser_options（ChromiumOptions）用于指定独立的用户目录和端口，供多浏览器分片使用
+        self.browser = Chromium(browser_options) if use_browser else None
+        # 断点进度默认存入与断点文件同目录的 SQLite 数据库，首次使用时自动迁移旧的 pickle 断点
+        self.progress_store = progress_store or SqliteCheckpointBackend.for_checkpoint(config.checkpoint_file)
+        self._progress_lock = threading.Lock()
+        # 全部目标的条件等待累计：[实际等待, 原固定等待, 目标数]
+        self._wait_totals = [0.0, 0.0, 0]
+        self._confirm_lock = threading.Lock()
+        # 分步计时：报告写入断点文件所在的 cache 目录
+        self.profiler = StepProfiler(Path(config.checkpoint_file).stem)
+        self._remaining_count = 0
+        # 传入复核队列时，多个搜索结果的目标暂存待复核而不是阻塞等待确认
+        self.review_queue = review_queue
+        # 已复核确认、重新处理时不再检查搜索结果数量的目标
+        self._approved_targets: set = set()
     
     def run(self):
         """主运行流程 - 模板方法"""
@@ -653,8 +1128,8 @@ class ModularBatchBot:
         cache_dir = Path(get_writable_path('cache')).parent
         cache_dir.mkdir(parents=True, exist_ok=True)
         
-        completed_targets = []  # 定义在外部，确保 finally 可访问
         all_targets = []
+        self.profiler.activate()
 
         try:
             # 1. 准备目标列表
@@ -664,14 +1139,14 @@ class ModularBatchBot:
                 return
 
             # 注册 stop 回调：允许 GUI 请求立即 quit
-            if hasattr(self.interaction_strategy, 'on_stop_requested'):
+            if hasattr(self.interaction_strategy, 'on_stop_requested') and self.browser is not None:
                 self.interaction_strategy.on_stop_requested = self.browser.quit
             
             # 2. 加载进度
-            completed_targets = self._load_progress()
-            remaining_targets = [t for t in all_targets if t not in completed_targets]
+            remaining_targets = self.progress_store.remaining(all_targets)
+            self._remaining_count = len(remaining_targets)
             
-            log(f"🔄总目标数: {len(all_targets)}, 已完成: {len(completed_targets)}, 剩余: {len(remaining_targets)}")
+            log(f"🔄总目标数: {len(all_targets)}, 已完成: {len(all_targets) - len(remaining_targets)}, 剩余: {len(remaining_targets)}")
             
             # 3. 登录
             if not self._execute_login():
@@ -682,26 +1157,56 @@ class ModularBatchBot:
                 return
             
             # 5. 批量处理目标
-            self._process_targets(remaining_targets, all_targets, completed_targets)
+            if self.worker_tabs > 1 and len(remaining_targets) > 1:
+                self._process_targets_parallel(remaining_targets, all_targets)
+            else:
+                self._process_targets(remaining_targets, all_targets)
 
             # ✅ 处理完成后，计算失败/未完成的目标
-            failed_targets = [t for t in all_targets if t not in completed_targets]
+            failed_targets = self.progress_store.remaining(all_targets)
 
             if failed_targets:
                 failed_list = "\n".join(f"{target}" for target in failed_targets)
                 log(f"❌ 以下 {len(failed_targets)} 个目标处理失败或未完成:\n{failed_list}")
             else:
                 log("🎉 所有目标均已成功处理！")
+
+            # 输出条件等待节省的时间
+            replaced_actual, baseline, counted = self._wait_totals
+            if counted:
+                log(f"⏱️ 条件等待共节省 {baseline - replaced_actual:.1f}s，平均每页 {(baseline - replaced_actual) / counted:.1f}s")
+
+            # 输出JSON读写方式的耗时对比
+            json_transfer = getattr(self.process_strategy, 'json_transfer', None)
+            if json_transfer is not None:
+                log(json_transfer.summary())
+
+            # 输出编辑页直达的命中情况
+            edit_url_index = getattr(self.search_strategy, 'edit_url_index', None)
+            if edit_url_index is not None:
+                log(edit_url_index.summary())
             
         except Exception as e:
             log(f"    ❌程序运行出错: {e}")
             # 出错后也输出失败列表
-            failed_targets = [t for t in all_targets if t not in completed_targets]
+            failed_targets = self.progress_store.remaining(all_targets)
             if failed_targets:
                 failed_list = "\n".join(f"{target}" for target in failed_targets)
                 log(f"❌ 异常中断，以下 {len(failed_targets)} 个目标未完成:\n{failed_list}")
         finally:
-            pass
+            self._write_profile_report()
+            self.profiler.deactivate()
+
+    def _write_profile_report(self):
+        """输出分步耗时统计并保存 JSON/CSV 报告"""
+        if not self.profiler.step_stats():
+            return
+        log(self.profiler.summary())
+        try:
+            json_path, csv_path = self.profiler.write_report(Path(self.config.checkpoint_file).parent)
+            log(f"📊 耗时报告已保存: {json_path}，明细: {csv_path}")
+        except Exception as e:
+            log(f"    ❌保存耗时报告失败: {e}")
     
     def _prepare_targets(self) -> List[str]:
         """准备目标列表"""
@@ -710,6 +1215,10 @@ class ModularBatchBot:
         elif self.target_csv_path:
             return self._read_csv_to_list(self.target_csv_path)
         return []
+
+    def pending_targets(self) -> List[str]:
+        """按处理顺序返回尚未完成的目标（断点续跑时已完成的目标不在其中）"""
+        return self.progress_store.remaining(self._prepare_targets())
     
     def _read_csv_to_list(self, csv_path: str) -> List[str]:
         """读取CSV文件"""
@@ -724,142 +1233,320 @@ class ModularBatchBot:
             log(f"    ❌读取CSV文件出错: {e}")
         return targets
     
-    def _load_progress(self) -> List[str]:
-        """加载进度"""
-        if Path(self.config.checkpoint_file).exists():
-            try:
-                with open(self.config.checkpoint_file, 'rb') as f:
-                    return pickle.load(f)
-            except Exception as e:
-                log(f"    ❌加载进度失败: {e}")
-        return []
-    
-    def _save_progress(self, completed_targets: List[str]):
-        """保存进度"""
-        try:
-            Path(self.config.checkpoint_file).parent.mkdir(exist_ok=True)
-            with open(self.config.checkpoint_file, 'wb') as f:
-                pickle.dump(completed_targets, f)
-        except Exception as e:
-            log(f"    ❌保存进度失败: {e}")
-    
+    @property
+    def page(self):
+        """当前操作的标签页，API 模式下为 None"""
+        return self.browser.latest_tab if self.browser is not None else None
+
+    @staticmethod
+    def _refresh(page):
+        if page is not None:
+            page.refresh()
+
     def _execute_login(self) -> bool:
         """执行登录"""
-        return self.login_strategy.execute_login(self.browser.latest_tab, self.config)
+        with span("login"):
+            return self.login_strategy.execute_login(self.page, self.config)
     
     def _execute_navigation(self) -> bool:
         """执行导航"""
-        return self.navigation_strategy.navigate_to_target(self.browser.latest_tab, self.config)
+        with span("navigation"):
+            return self.navigation_strategy.navigate_to_target(self.page, self.config)
     
-    def _process_targets(self, remaining_targets: List[str], all_targets: List[str], completed_targets: List[str]):
-        """批量处理目标"""
-        i = 0
-
-        def should_exit():
-            """检查是否需要退出"""
-            if hasattr(self.interaction_strategy, 'should_stop'):
-                return self.interaction_strategy.should_stop()
-            return False
+    def _process_targets(self, remaining_targets: List[str], all_targets: List[str]):
+        """
+        批量处理目标
+        使用显式的工作队列逐个处理，栈深度恒定；需要确认时在当前线程等待回调唤醒，
+        而不是在回调里递归处理下一个目标，单个目标的页面和JSON在处理完后即可释放
+        """
+        pending = deque(remaining_targets)
+        processed = len(all_targets) - len(remaining_targets)
 
-        def process_next_target():
-            nonlocal i
-            if i >= len(remaining_targets):
-                log("✅ 无目标可处理。")
-                return
-            
-             # 🔒 每次处理前检查中断标志
-            if should_exit():
+        while True:
+            # 🔒 每次处理前检查中断标志
+            if self._should_exit():
                 log(" CANCEL : 任务已被用户终止。")
-                self._save_progress(completed_targets)
-                return  # 直接退出，不再递归
+                return
 
-            target = remaining_targets[i]
+            # 已复核确认的目标插到队首优先处理
+            pending.extendleft(reversed(self._take_reviewed()))
+            if not pending:
+                if self._await_review():
+                    continue
+                break
+
+            target = pending.popleft()
+            if target in self._approved_targets:
+                log(f"🚩正在处理已复核目标: {target}")
+            else:
+                processed += 1
+                log(f"🚩正在处理: {target} (进度: {processed}/{len(all_targets)})")
+            start = time.perf_counter()
+            begin_wait_recording()
+            self.profiler.activate(target)
             try:
-                current_progress = len(all_targets) - len(remaining_targets) + i + 1
-                log(f"🚩正在处理: {target} (进度: {current_progress}/{len(all_targets)})")
+                result = self._process_one(self.page, target)
+            except Exception as e:
+                log(f"    ❌处理{target}时发生错误: {e}")
+                self._record_result(target, ProcessResult.FAILED, time.perf_counter() - start, str(e))
+                self._report_waits(target)
+                return
 
-                # 搜索目标
-                result_count = self.search_strategy.search_target(self.browser.latest_tab, target)
+            self._record_result(target, result, time.perf_counter() - start)
+            self._report_waits(target)
+            log('='*50)
 
-                if should_exit():  # 🔁 搜索后也检查
-                    log(" CANCEL : 任务在搜索后被终止。")
-                    self._save_progress(completed_targets)
-                    return
+        log("✅ 无目标可处理。")
 
-                if result_count == 0:
-                    log(f"  ❌ {target}未找到搜索结果")
-                    self.browser.latest_tab.refresh()  # 刷新页面
-                    i += 1
-                    process_next_target()
-                elif result_count >= 3:
-                    log(f"  ⚠️ {target}有多个搜索结果")
-
-                    # ✅ 使用交互策略
-                    self.interaction_strategy.request_confirmation(
-                        f"目标 '{target}' 有多个结果，是否继续？",
-                        on_confirm=lambda confirmed: handle_confirm(confirmed, target, result_count)
-                    )
-                elif result_count == 2:
-                    log("  ✔️ 定位成功")
-                    if self.editor_strategy.open_editor(self.browser.latest_tab, target):
-                        finalize_process(target)
-                    else:
-                        i += 1
-                        process_next_target()
+    def _take_reviewed(self) -> List[str]:
+        """取走已复核的目标：跳过的直接记录，确认的返回以便重新处理"""
+        if self.review_queue is None:
+            return []
+        approved, rejected = self.review_queue.take_resolved()
+        for target in rejected:
+            self._record_result(target, ProcessResult.SKIP, 0.0)
+        with self._progress_lock:
+            self._approved_targets.update(approved)
+        return approved
 
-            except Exception as e:
-                log(f"    ❌处理{target}时发生错误: {e}")
-                self._save_progress(completed_targets)
-        
-        def handle_confirm(confirmed, target, result_count):
-            if should_exit():
-                log(" CANCEL : 用户在确认阶段终止任务。")
-                return
+    def _await_review(self) -> bool:
+        """
+        其余目标都处理完后，等待操作员复核暂存的目标
+        没有复核界面时逐个请求确认；返回是否有需要继续处理的目标
+        """
+        if self.review_queue is None or not self.review_queue.unresolved_count:
+            return False
+        parked = self.review_queue.pending()
+        summary = "\n".join(
+            f"  {p.target}" + "".join(f"\n    {line}" for line in p.snapshot) for p in parked
+        )
+        log(f"⏸️ 其余目标已处理完，以下 {len(parked)} 个目标有多个搜索结果，等待复核:\n{summary}")
 
-            if confirmed and result_count >= 2:
-                if self.editor_strategy.open_editor(self.browser.latest_tab, target):
-                    finalize_process(target)
-                else:
-                    i += 1
-                    process_next_target()
-            else:
-                i += 1
-                process_next_target()
+        if not self.review_queue.has_reviewer:
+            self.review_queue.resolve_many({p.target: self._confirm(p.message) for p in parked})
+            return True
+        while not self._should_exit():
+            if self.review_queue.wait_for_decisions(timeout=0.5):
+                return True
+            if not self.review_queue.unresolved_count:
+                return False
+        return False
 
-        def finalize_process(target):
-            if should_exit():
-                log(" CANCEL : 任务在处理前被终止。")
-                return
+    def _report_waits(self, target: str):
+        """输出当前目标的条件等待耗时，并与原先的固定等待对比"""
+        records = end_wait_recording()
+        if not records:
+            return
+        actual = sum(r[1] for r in records)
+        baseline = sum(r[2] for r in records if r[2])
+        # 只有替换了固定等待的步骤参与对比
+        replaced_actual = sum(r[1] for r in records if r[2])
+        timeouts = [r[0] for r in records if not r[3]]
+        with self._progress_lock:
+            self._wait_totals[0] += replaced_actual
+            self._wait_totals[1] += baseline
+            self._wait_totals[2] += 1
+        message = f"  ⏱️ {target} 等待共 {actual:.1f}s，原固定等待 {baseline:.1f}s 的步骤实际用时 {replaced_actual:.1f}s，节省 {baseline - replaced_actual:.1f}s"
+        if timeouts:
+            message += f"（超时: {', '.join(timeouts)}）"
+        log(message)
+
+    def _record_result(self, target: str, result: ProcessResult, duration: float, error: Optional[str] = None):
+        """记录单个目标的处理结果（状态、耗时和错误）到进度存储，并计入分步耗时统计"""
+        self.profiler.end_target(target, duration)
+        if self.profiler.target_count == PROFILE_WARMUP_TARGETS and self._remaining_count > PROFILE_WARMUP_TARGETS:
+            # 前几个目标完成后给出预估，管理后台变慢时可以在大批量任务跑完前及时停止
+            log(f"⏱️ {self.profiler.estimate(self._remaining_count - PROFILE_WARMUP_TARGETS)}")
+        if result == ProcessResult.SUCCESS:
+            log(f"✅ {target}已成功更新")
+            status = STATUS_SUCCESS
+        elif result == ProcessResult.FAILED:
+            log(f"    ❌{target}处理失败")
+            status = STATUS_FAILED
+        elif result == ProcessResult.MANUAL_REQUIRED:
+            log(f"  ⏸️ {target} 已暂存待复核（待复核: {self.review_queue.unresolved_count}）")
+            status = STATUS_DEFERRED
+        else:
+            if not self._should_exit():
+                log(f"  ⏭️ 已跳过 {target}")
+            status = STATUS_SKIPPED
+        try:
+            self.progress_store.mark(target, status, duration=duration, error=error)
+        except Exception as e:
+            log(f"    ❌保存进度失败: {e}")
 
-            result = self.process_strategy.process_target(
-                self.browser.latest_tab, target, self.update_action
-            )
-            if result == ProcessResult.SUCCESS:
-                log(f"✅ {target}已成功更新")
-                completed_targets.append(target)
-                self._save_progress(completed_targets)
+    def _should_exit(self) -> bool:
+        """检查是否需要退出"""
+        if hasattr(self.interaction_strategy, 'should_stop'):
+            return self.interaction_strategy.should_stop()
+        return False
+
+    def _confirm(self, message: str) -> bool:
+        """
+        同步等待用户确认：回调只负责记录结果并唤醒当前处理线程。
+        交互处理器同一时间只能挂起一个确认请求，因此多个标签页的确认需要排队。
+        """
+        if self.interaction_strategy is None:
+            return False
+        with self._confirm_lock:
+            decided = threading.Event()
+            answer = {"confirmed": False}
+
+            def on_confirm(confirmed: bool):
+                answer["confirmed"] = confirmed
+                decided.set()
+
+            self.interaction_strategy.request_confirmation(message, on_confirm=on_confirm)
+            while not decided.wait(0.5):
+                if self._should_exit():
+                    return False
+            return answer["confirmed"]
+
+    def _process_one(self, page, target: str) -> ProcessResult:
+        """在指定标签页中完成单个目标的 搜索 → 打开编辑页 → 处理 流程"""
+        with span("search"):
+            result_count = self.search_strategy.search_target(page, target)
+        if self._should_exit():
+            return ProcessResult.SKIP
+
+        # 结果数量包含表头行，小于 2 即没有命中
+        if result_count < 2:
+            log(f"  ❌ {target}未找到搜索结果")
+            self._refresh(page)
+            return ProcessResult.FAILED
+        if result_count >= 3 and target not in self._approved_targets:
+            log(f"  ⚠️ {target}有多个搜索结果")
+            message = f"目标 '{target}' 有多个结果，是否继续？"
+            if self.review_queue is not None:
+                self.review_queue.park(target, message, self.search_strategy.describe_results(page, target))
+                self._refresh(page)
+                return ProcessResult.MANUAL_REQUIRED
+            if not self._confirm(message):
+                return ProcessResult.SKIP
+        else:
+            log("  ✔️ 定位成功")
+
+        with span("open_editor"):
+            opened = self.editor_strategy.open_editor(page, target)
+        if not opened:
+            return ProcessResult.FAILED
+        if self._should_exit():
+            return ProcessResult.SKIP
+
+        # process 包含 get_json / update_action / input / save / url_change 等子步骤
+        with span("process"):
+            result = self.process_strategy.process_target(page, target, self.update_action)
+        if result != ProcessResult.SUCCESS:
+            self._refresh(page)
+        return result
+
+    def _process_targets_parallel(self, remaining_targets: List[str], all_targets: List[str]):
+        """
+        在同一个已登录的浏览器中打开多个标签页，从共享队列中取目标并行处理。
+        每个标签页独立完成搜索、编辑和保存，完成的目标写入同一个进度文件。
+        """
+        tab_count = min(self.worker_tabs, len(remaining_targets))
+        tabs = [self.page]
+        for _ in range(tab_count - 1):
+            if self.browser is None:
+                # API 模式没有标签页，每个线程共用同一个连接池
+                tabs.append(None)
+                continue
+            tab = self.browser.new_tab()
+            # 新标签页共享浏览器的登录状态，只需导航并切换语言
+            if self.navigation_strategy.navigate_to_target(tab, self.config):
+                tabs.append(tab)
             else:
-                log(f"    ❌{target}处理失败")
-                self.browser.latest_tab.refresh()
-            log('='*50)
-            nonlocal i
-            i += 1
-            process_next_target()
+                log("    ❌新标签页导航失败，已关闭")
+                tab.close()
+        log(f"🗂️ 使用 {len(tabs)} 个{'标签页' if self.browser is not None else '线程'}并行处理 {len(remaining_targets)} 个目标")
+
+        target_queue: queue.Queue[str] = queue.Queue()
+        for target in remaining_targets:
+            target_queue.put(target)
+        processed = len(all_targets) - len(remaining_targets)
+
+        def worker(worker_id: int, page):
+            nonlocal processed
+            while not self._should_exit():
+                for reviewed in self._take_reviewed():
+                    target_queue.put(reviewed)
+                try:
+                    target = target_queue.get_nowait()
+                except queue.Empty:
+                    return
+                if target in self._approved_targets:
+                    log(f"🚩[标签页{worker_id}] 正在处理已复核目标: {target}")
+                else:
+                    with self._progress_lock:
+                        processed += 1
+                        current_progress = processed
+                    log(f"🚩[标签页{worker_id}] 正在处理: {target} (进度: {current_progress}/{len(all_targets)})")
+                start = time.perf_counter()
+                error = None
+                begin_wait_recording()
+                self.profiler.activate(target)
+                try:
+                    result = self._process_one(page, target)
+                except Exception as e:
+                    log(f"    ❌[标签页{worker_id}] 处理{target}时发生错误: {e}")
+                    result, error = ProcessResult.FAILED, str(e)
+                    try:
+                        self._refresh(page)
+                    except Exception:
+                        pass
+
+                self._record_result(target, result, time.perf_counter() - start, error)
+                self._report_waits(target)
+
+        threads = [
+            threading.Thread(target=worker, args=(i + 1, tab), name=f"bot-tab-{i + 1}", daemon=True)
+            for i, tab in enumerate(tabs)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._should_exit():
+            log(" CANCEL : 任务已被用户终止。")
+            return
 
-        # 开始处理第一个
-        process_next_target()
+        # 运行期间未被取走的复核结果以及结束时的复核，在当前标签页中串行处理
+        if self.review_queue is not None:
+            self._process_targets([], all_targets)
 
 # =========================== 工厂方法 ===========================
 
 class BotFactory:
     """机器人工厂"""
     
+    @staticmethod
+    def _indexed_search(config: OperationConfig, language: str) -> tuple:
+        """创建带编辑页 URL 索引的搜索和编辑器策略，索引与断点进度存在同一个数据库中"""
+        search_strategy = IndexedSearchStrategy(
+            FlexibleSearchStrategy(),
+            EditUrlIndex.for_checkpoint(config.checkpoint_file, scope=language),
+            list_url=config.operate_url,
+            edit_url_contains=config.edit_url_contains,
+            restore_language=StandardNavigationStrategy(language).restore_language
+        )
+        return search_strategy, IndexedEditorStrategy(StandardEditorStrategy(), search_strategy)
+
     @staticmethod
     def create_pacdora_json_bot(language: str, update_action: Callable[[str], str], 
                                target_list: Optional[List[str]] = None,
                                target_csv_path: Optional[str] = None,
-                               interaction_strategy: Optional[InteractionStrategy] = None) -> ModularBatchBot:
-        """创建默认的Pacdora JSON处理机器人"""
+                               interaction_strategy: Optional[InteractionStrategy] = None,
+                               worker_tabs: int = 1,
+                               use_browser: bool = True,
+                               browser_options: Optional[Any] = None,
+                               review_queue: Optional[ReviewQueue] = None,
+                               use_js_transfer: bool = True) -> ModularBatchBot:
+        """
+        创建默认的Pacdora JSON处理机器人
+        use_js_transfer 为 False 时强制使用剪贴板 + 模拟输入读写JSON，用于与页面内JS方式对比
+        """
         
         config = OperationConfig(
             login_url="https://op.pacdora.com/login",
@@ -869,17 +1556,24 @@ class BotFactory:
             edit_url_contains="edit"
         )
         
+        search_strategy, editor_strategy = BotFactory._indexed_search(config, language)
+        
         return ModularBatchBot(
             config=config,
             login_strategy=CookieLoginStrategy(),
             navigation_strategy=StandardNavigationStrategy(language),
-            search_strategy=FlexibleSearchStrategy(),
-            editor_strategy=StandardEditorStrategy(),
-            process_strategy=JsonProcessStrategy(),
+            search_strategy=search_strategy,
+            editor_strategy=editor_strategy,
+            process_strategy=JsonProcessStrategy(json_transfer=JsonTransfer(use_js=use_js_transfer, log_func=log),
+                                                 list_url=config.operate_url),
             update_action=update_action,
             interaction_strategy=interaction_strategy,
             target_list=target_list,
-            target_csv_path=target_csv_path
+            target_csv_path=target_csv_path,
+            worker_tabs=worker_tabs,
+            use_browser=use_browser,
+            browser_options=browser_options,
+            review_queue=review_queue
         )
         
     # dp_bot_manager.py
@@ -890,10 +1584,18 @@ class BotFactory:
         base_folder: str,
         target_list: Optional[List[str]] = None,
         target_csv_path: Optional[str] = None,
-        interaction_strategy: Optional[InteractionStrategy] = None
+        interaction_strategy: Optional[InteractionStrategy] = None,
+        readiness: Optional[TargetReadiness] = None,
+        worker_tabs: int = 1,
+        use_browser: bool = True,
+        browser_options: Optional[Any] = None,
+        review_queue: Optional[ReviewQueue] = None,
+        use_js_transfer: bool = True
     ) -> ModularBatchBot:
         """
         创建「上传图片 + 替换 CDN」专用机器人
+        传入 readiness 时，图片上传与浏览器替换流水线并行，机器人只等待当前目标就绪
+        use_js_transfer 为 False 时强制使用剪贴板 + 模拟输入读写JSON
         """
         config = OperationConfig(
             login_url="https://op.pacdora.com/login",
@@ -905,24 +1607,36 @@ class BotFactory:
             cookie_file="cache/cookies.pkl"
         )
 
+        search_strategy, editor_strategy = BotFactory._indexed_search(config, language)
+        
         return ModularBatchBot(
             config=config,
             login_strategy=CookieLoginStrategy(),
             navigation_strategy=StandardNavigationStrategy(language),
-            search_strategy=FlexibleSearchStrategy(),
-            editor_strategy=StandardEditorStrategy(),
-            process_strategy=ReplacePlaceholderJsonStrategy(base_folder=base_folder),
+            search_strategy=search_strategy,
+            editor_strategy=editor_strategy,
+            process_strategy=ReplacePlaceholderJsonStrategy(base_folder=base_folder, readiness=readiness,
+                                                            json_transfer=JsonTransfer(use_js=use_js_transfer, log_func=log),
+                                                            list_url=config.operate_url),
             update_action=lambda x: x,  # 占位，实际替换在策略内部完成
             interaction_strategy=interaction_strategy,
             target_list=target_list,
-            target_csv_path=target_csv_path
+            target_csv_path=target_csv_path,
+            worker_tabs=worker_tabs,
+            use_browser=use_browser,
+            browser_options=browser_options,
+            review_queue=review_queue
         )
         
     @staticmethod
     def create_online_sync_bot(language: str,
                               target_list: Optional[List[str]] = None,
                               target_csv_path: Optional[str] = None,
-                              interaction_strategy: Optional[InteractionStrategy] = None) -> ModularBatchBot:
+                              interaction_strategy: Optional[InteractionStrategy] = None,
+                              worker_tabs: int = 1,
+                              use_browser: bool = True,
+                              browser_options: Optional[Any] = None,
+                              review_queue: Optional[ReviewQueue] = None) -> ModularBatchBot:
         """创建同步启用机器人"""
         
         config = OperationConfig(
@@ -944,9 +1658,53 @@ class BotFactory:
             update_action=lambda x: x,  # 不需要更新函数
             interaction_strategy=interaction_strategy,
             target_list=target_list,
-            target_csv_path=target_csv_path
+            target_csv_path=target_csv_path,
+            worker_tabs=worker_tabs,
+            use_browser=use_browser,
+            browser_options=browser_options,
+            review_queue=review_queue
         )
     
+    @staticmethod
+    def create_api_json_bot(language: str, update_action: Callable[[str], str],
+                            target_list: Optional[List[str]] = None,
+                            target_csv_path: Optional[str] = None,
+                            interaction_strategy: Optional[InteractionStrategy] = None,
+                            workers: int = 4,
+                            api_base_url: Optional[str] = None,
+                            review_queue: Optional[ReviewQueue] = None) -> ModularBatchBot:
+        """
+        创建直接调用后台接口的 JSON 处理机器人
+        复用浏览器模式保存的 cookie，不打开浏览器，适合批量修改 FAQ 可翻译性、登录要求等
+        """
+        config = OperationConfig(
+            login_url="https://op.pacdora.com/login",
+            dashboard_url_contains="dashboard",
+            operate_url="https://op.pacdora.com/topic/List",
+            operate_url_contains="List",
+            edit_url_contains="edit",
+            checkpoint_file="cache/api_progress.pkl"
+        )
+        if api_base_url:
+            config.api_base_url = api_base_url
+        client = OpApiClient(config, pool_size=max(workers, 1))
+
+        return ModularBatchBot(
+            config=config,
+            login_strategy=ApiLoginStrategy(client),
+            navigation_strategy=ApiNavigationStrategy(client, language),
+            search_strategy=ApiSearchStrategy(client),
+            editor_strategy=DummyEditorStrategy(),
+            process_strategy=ApiProcessStrategy(client),
+            update_action=update_action,
+            interaction_strategy=interaction_strategy,
+            target_list=target_list,
+            target_csv_path=target_csv_path,
+            worker_tabs=workers,
+            use_browser=False,
+            review_queue=review_queue
+        )
+
     @staticmethod
     def create_custom_bot(config: OperationConfig,
                          login_strategy: LoginStrategy,
@@ -968,6 +1726,212 @@ class BotFactory:
             **kwargs
         )
 
+# =========================== 多浏览器分片 ===========================
+
+class _ShardInteraction(InteractionStrategy):
+    """
+    分片子进程中的交互处理器
+    子进程无法弹出确认，多结果的目标直接跳过（留在进度中未完成，可之后单独处理）；
+    终止信号通过进程间共享的 Event 传递
+    """
+
+    def __init__(self, stop_event):
+        self.stop_event = stop_event
+        self.on_stop_requested = None
+
+    def request_confirmation(self, message: str, on_confirm: Callable[[bool], None]):
+        log(f"⏭️ 分片模式下无法确认，已跳过: {message}", "warning")
+        on_confirm(False)
+
+    def should_stop(self) -> bool:
+        return self.stop_event.is_set()
+
+def _run_shard(shard_id: int, factory_name: str, factory_kwargs: Dict[str, Any], targets: List[str],
+               profile_root: str, log_queue, stop_event) -> Dict[str, Any]:
+    """
+    在独立进程中运行一个分片：独立的浏览器进程和用户目录，共享 cookie 文件和进度数据库
+    必须是模块级函数，以便被进程池 pickle 调用
+    """
+    from DrissionPage import ChromiumOptions
+
+    set_log_callback(lambda msg, level="info": log_queue.put((shard_id, msg, level)))
+    profile_dir = Path(profile_root) / f"shard_{shard_id}"
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    options = ChromiumOptions().set_user_data_path(str(profile_dir)).auto_port()
+
+    start = time.perf_counter()
+    bot = None
+    try:
+        factory = getattr(BotFactory, factory_name)
+        bot = factory(
+            target_list=targets,
+            interaction_strategy=_ShardInteraction(stop_event),
+            browser_options=options,
+            **factory_kwargs
+        )
+        bot.run()
+        completed = bot.progress_store.completed()
+        return {
+            "shard": shard_id,
+            "targets": len(targets),
+            "succeeded": sum(1 for t in targets if t in completed),
+            "duration": time.perf_counter() - start,
+            "error": None,
+        }
+    finally:
+        if bot is not None and bot.browser is not None:
+            try:
+                bot.browser.quit()
+            except Exception:
+                pass
+
+class ShardedBotRunner:
+    """
+    多浏览器分片运行器
+    把目标列表拆成多个分片，每个分片在独立进程中用独立的浏览器和用户目录运行，
+    共享 CookieLoginStrategy 保存的 cookie（只需手动登录一次）和同一个 SQLite 进度库，
+    某个浏览器渲染进程崩溃只影响它自己的分片，最后合并成一份报告
+
+    注意：factory_kwargs 会被 pickle 传给子进程，update_action 必须是模块级函数或可 pickle 对象的方法
+    """
+
+    def __init__(self, factory_name: str, target_list: List[str], shards: int = 4,
+                 factory_kwargs: Optional[Dict[str, Any]] = None,
+                 profile_root: Optional[str] = None):
+        if not hasattr(BotFactory, factory_name):
+            raise ValueError(f"Unknown BotFactory method: {factory_name}")
+        self.factory_name = factory_name
+        self.target_list = list(dict.fromkeys(target_list))
+        self.shards = max(1, min(shards, len(self.target_list)))
+        self.factory_kwargs = factory_kwargs or {}
+        self.profile_root = profile_root or str(get_writable_path('cache/browser_profiles'))
+
+        import multiprocessing
+        # Qt 程序中只能使用 spawn 方式创建子进程
+        self._mp_context = multiprocessing.get_context('spawn')
+        self._manager = None
+        self._stop_event = None
+
+    def stop(self):
+        """请求所有分片在处理完当前目标后退出"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+            log("🛑 已通知所有分片在当前目标完成后停止")
+
+    def _ensure_login(self, config: OperationConfig) -> bool:
+        """如果还没有保存的 cookie，先在主进程里完成一次手动登录"""
+        if Path(get_writable_path(config.cookie_file)).exists():
+            return True
+        log("🍪 尚未保存登录 cookie，请在打开的浏览器中登录一次，所有分片将共用该 cookie")
+        browser = Chromium()
+        try:
+            return CookieLoginStrategy().execute_login(browser.latest_tab, config)
+        finally:
+            browser.quit()
+
+    def run(self) -> Dict[str, Any]:
+        """运行所有分片并返回合并后的报告"""
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        # 用一个不启动浏览器的实例取得配置和进度库
+        probe = getattr(BotFactory, self.factory_name)(
+            target_list=self.target_list, use_browser=False, **self.factory_kwargs
+        )
+        config, store = probe.config, probe.progress_store
+        remaining = store.remaining(self.target_list)
+        if not remaining:
+            log("✅ 所有目标均已完成，无需运行分片")
+            return {"targets": len(self.target_list), "remaining": [], "shards": []}
+        if not self._ensure_login(config):
+            log("    ❌登录失败，分片未启动")
+            return {"targets": len(self.target_list), "remaining": remaining, "shards": []}
+
+        shard_count = min(self.shards, len(remaining))
+        # 轮流分配，使各分片的目标数量均衡
+        shard_targets = [remaining[i::shard_count] for i in range(shard_count)]
+        log(f"🧩 使用 {shard_count} 个浏览器分片处理 {len(remaining)} 个目标")
+
+        self._manager = self._mp_context.Manager()
+        log_queue = self._manager.Queue()
+        self._stop_event = self._manager.Event()
+
+        # 子进程的日志经队列转发到主进程（GUI）
+        forwarding = threading.Event()
+        def forward_logs():
+            while not forwarding.is_set() or not log_queue.empty():
+                try:
+                    shard_id, msg, level = log_queue.get(timeout=0.2)
+                except Exception:
+                    continue
+                log(f"[分片{shard_id}] {msg}", level)
+        forwarder = threading.Thread(target=forward_logs, name="shard-log-forwarder", daemon=True)
+        forwarder.start()
+
+        start = time.perf_counter()
+        shard_reports = []
+        # 每个分片使用独立的单进程池，一个分片的进程崩溃不会连带其他分片
+        executors = [ProcessPoolExecutor(max_workers=1, mp_context=self._mp_context) for _ in shard_targets]
+        try:
+            futures = {
+                executor.submit(
+                    _run_shard, i + 1, self.factory_name, self.factory_kwargs, targets,
+                    self.profile_root, log_queue, self._stop_event
+                ): (i + 1, targets)
+                for i, (executor, targets) in enumerate(zip(executors, shard_targets))
+            }
+            for future in as_completed(futures):
+                shard_id, targets = futures[future]
+                try:
+                    shard_reports.append(future.result())
+                except Exception as e:
+                    # 浏览器或子进程崩溃：记录后继续等待其他分片，已完成的目标以进度库为准
+                    log(f"    ❌分片{shard_id}异常退出: {e}", "error")
+                    completed = store.completed()
+                    shard_reports.append({"shard": shard_id, "targets": len(targets),
+                                          "succeeded": sum(1 for t in targets if t in completed),
+                                          "duration": time.perf_counter() - start, "error": str(e)})
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+            forwarding.set()
+            forwarder.join(timeout=5)
+            self._manager.shutdown()
+            self._manager = self._stop_event = None
+
+        return self._write_report(config, store, shard_reports, time.perf_counter() - start)
+
+    def _write_report(self, config: OperationConfig, store: CheckpointBackend,
+                      shard_reports: List[Dict[str, Any]], duration: float) -> Dict[str, Any]:
+        """合并各分片结果，输出并保存到 cache 目录"""
+        remaining = store.remaining(self.target_list)
+        remaining_set = set(remaining)
+        failed = store.failed() if hasattr(store, 'failed') else []
+        report = {
+            "job": Path(config.checkpoint_file).stem,
+            "targets": len(self.target_list),
+            "succeeded": len(self.target_list) - len(remaining),
+            "remaining": remaining,
+            "failed": [{"target": t, "attempts": a, "last_error": e} for t, a, e in failed if t in remaining_set],
+            "duration": round(duration, 1),
+            "shards": sorted(shard_reports, key=lambda r: r["shard"]),
+        }
+        report_path = Path(config.checkpoint_file).parent / f"shard_report_{report['job']}.json"
+        try:
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            log(f"    ❌保存分片报告失败: {e}")
+
+        for shard in report["shards"]:
+            status = f"异常: {shard['error']}" if shard["error"] else "完成"
+            log(f"  🧩 分片{shard['shard']}: {shard['succeeded']}/{shard['targets']}，用时 {shard['duration']:.0f}s，{status}")
+        throughput = report["succeeded"] / duration * 60 if duration else 0
+        log(f"📊 分片运行完成: {report['succeeded']}/{report['targets']} 成功，用时 {duration:.0f}s（{throughput:.1f} 页/分钟），报告: {report_path}")
+        if remaining:
+            log(f"❌ 以下 {len(remaining)} 个目标处理失败或未完成:\n" + "\n".join(remaining))
+        return report
+
 # =========================== 使用示例 ===========================
 
 def example_usage():
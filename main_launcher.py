@@ -1,6 +1,7 @@
 # main_launcher.py - 现代化启动画面设计
 import sys
 import os
+import multiprocessing
 from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QProgressBar, QGraphicsDropShadowEffect
 from PySide6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve
 from PySide6.QtGui import QFont, QPainter, QColor, QLinearGradient, QRadialGradient, QPen, QBrush
@@ -405,4 +406,6 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # 打包后的程序使用进程池（上传前图片压缩）时需要
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+机器人端到端评测脚本
+启动本地替身服务器，用真实的策略组合运行 ModularBatchBot，输出吞吐量并核对服务器上的结果，
+不需要网络，便于对机器人框架的性能改动做可复现的对比
+
+用法（在项目根目录运行）:
+    python -m miscellaneous.bot_benchmark --task json --pages 20 --tabs 2 --latency 0.2
+    python -m miscellaneous.bot_benchmark --task json --pages 20 --runs 2   # 第二次运行直接打开编辑页
+    python -m miscellaneous.bot_benchmark --task api --pages 200 --tabs 8 --failure-rate 0.05
+    python -m miscellaneous.bot_benchmark --task json --pages 20 --transfer both   # 对比页面内JS与剪贴板读写JSON
+"""
+
+import json
+import time
+import pickle
+import argparse
+import tempfile
+from pathlib import Path
+
+from miscellaneous.op_standin_server import OpStandinServer, StandinConfig, SESSION_COOKIE, SESSION_VALUE
+
+BENCHMARK_MARKER = "__benchmark_run"
+
+
+def _write_cookie_file(path: Path, host: str):
+    """写入替身服务器的会话 cookie，CookieLoginStrategy 加载后即视为已登录"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump([{"name": SESSION_COOKIE, "value": SESSION_VALUE, "domain": host, "path": "/"}], f)
+
+
+def _mark_json(run_id: str):
+    """更新函数：在页面 JSON 中写入本次运行的标记，便于事后核对"""
+    def update(json_str: str) -> str:
+        data = json.loads(json_str)
+        data[BENCHMARK_MARKER] = run_id
+        return json.dumps(data, ensure_ascii=False)
+    return update
+
+
+def build_bot(task: str, server: OpStandinServer, targets: list, tabs: int, work_dir: Path, update_action,
+              use_js: bool = True):
+    """
+    按任务类型组装与 BotFactory 相同的策略，但把地址和缓存文件指向替身服务器和临时目录
+    use_js 为 False 时 json 任务强制使用剪贴板 + 模拟输入读写JSON
+    """
+    from dp_bot_manager import (
+        OperationConfig, ModularBatchBot, CookieLoginStrategy, StandardNavigationStrategy,
+        FlexibleSearchStrategy, DummyEditorStrategy, JsonProcessStrategy,
+        SyncOnlineProcessStrategy, ConsoleInteractionHandler, OpApiClient, ApiLoginStrategy,
+        ApiNavigationStrategy, ApiSearchStrategy, ApiProcessStrategy, BotFactory, JsonTransfer, log
+    )
+
+    base_url = server.base_url
+    config = OperationConfig(
+        login_url=f"{base_url}/login",
+        dashboard_url_contains="dashboard",
+        operate_url=f"{base_url}/topic/List",
+        operate_url_contains="List",
+        edit_url_contains="edit",
+        checkpoint_file=str(work_dir / f"{task}_benchmark.pkl"),
+        cookie_file=str(work_dir / "cookies.pkl"),
+        api_base_url=f"{base_url}/api",
+    )
+    common = dict(
+        config=config,
+        update_action=update_action,
+        interaction_strategy=ConsoleInteractionHandler(),
+        target_list=targets,
+        worker_tabs=tabs,
+    )
+
+    if task == "api":
+        client = OpApiClient(config, pool_size=max(tabs, 4))
+        return ModularBatchBot(
+            login_strategy=ApiLoginStrategy(client),
+            navigation_strategy=ApiNavigationStrategy(client, "英语"),
+            search_strategy=ApiSearchStrategy(client),
+            editor_strategy=DummyEditorStrategy(),
+            process_strategy=ApiProcessStrategy(client),
+            use_browser=False,
+            **common
+        )
+    if task == "sync":
+        return ModularBatchBot(
+            login_strategy=CookieLoginStrategy(),
+            navigation_strategy=StandardNavigationStrategy("英语"),
+            search_strategy=FlexibleSearchStrategy(),
+            editor_strategy=DummyEditorStrategy(),
+            process_strategy=SyncOnlineProcessStrategy(),
+            **common
+        )
+    # 与 create_pacdora_json_bot 相同，使用编辑页 URL 索引（第二次运行起直接打开编辑页）
+    search_strategy, editor_strategy = BotFactory._indexed_search(config, "英语")
+    return ModularBatchBot(
+        login_strategy=CookieLoginStrategy(),
+        navigation_strategy=StandardNavigationStrategy("英语"),
+        search_strategy=search_strategy,
+        editor_strategy=editor_strategy,
+        process_strategy=JsonProcessStrategy(json_transfer=JsonTransfer(use_js=use_js, log_func=log),
+                                             list_url=config.operate_url),
+        **common
+    )
+
+
+def verify(task: str, server: OpStandinServer, targets: list, run_id: str) -> int:
+    """统计服务器上确实被修改的目标数量"""
+    by_path = {page["path"]: page for page in server.pages.values()}
+    verified = 0
+    for target in targets:
+        page = by_path.get(target)
+        if page is None:
+            continue
+        if task == "sync":
+            verified += page["online"]
+        elif json.loads(page["json"]).get(BENCHMARK_MARKER) == run_id:
+            verified += 1
+    return verified
+
+
+def run_benchmark(task: str = "json", pages: int = 20, tabs: int = 1, config: StandinConfig = None,
+                  output_dir: str = "cache", runs: int = 1, use_js: bool = True) -> dict:
+    """
+    运行一次评测并返回结果
+
+    参数:
+        task (str): json（浏览器编辑JSON）、sync（浏览器同步启用）或 api（接口模式）
+        pages (int): 处理的页面数量
+        tabs (int): 并行标签页/线程数
+        config (StandinConfig): 替身服务器的延迟和失败注入配置
+        output_dir (str): 评测结果的保存目录
+        runs (int): 在同一缓存目录下重复运行的次数，用于衡量重复任务（如编辑页直达）的收益
+        use_js (bool): json 任务是否在页面内通过 JS 读写JSON，False 时使用剪贴板（需要桌面会话）
+    """
+    server = OpStandinServer(config=config, page_count=pages).start()
+    targets = [OpStandinServer.page_path(i) for i in range(1, pages + 1)]
+    run_id = time.strftime('%Y%m%d_%H%M%S')
+
+    transfer = ("js" if use_js else "clipboard") if task == "json" else None
+    result = {"task": task, "pages": pages, "tabs": tabs, "transfer": transfer,
+              "server_config": vars(server.config), "runs": []}
+    try:
+        with tempfile.TemporaryDirectory(prefix="wsa_benchmark_") as tmp:
+            work_dir = Path(tmp)
+            _write_cookie_file(work_dir / "cookies.pkl", server._server.server_address[0])
+            for run in range(1, runs + 1):
+                marker = f"{run_id}_{run}"
+                bot = build_bot(task, server, targets, tabs, work_dir, _mark_json(marker), use_js=use_js)
+                # 每次都重新处理全部页面，只保留编辑页索引等可复用的缓存
+                bot.progress_store.clear()
+
+                start = time.perf_counter()
+                try:
+                    bot.run()
+                finally:
+                    if bot.browser is not None:
+                        bot.browser.quit()
+                elapsed = time.perf_counter() - start
+
+                succeeded = len(bot.progress_store.completed())
+                result["runs"].append({
+                    "run": run,
+                    "elapsed": round(elapsed, 2),
+                    "succeeded": succeeded,
+                    "verified": verify(task, server, targets, marker),
+                    "pages_per_minute": round(succeeded / elapsed * 60, 1) if elapsed else 0,
+                    "steps": bot.profiler.step_stats(),
+                })
+                json_transfer = getattr(bot.process_strategy, 'json_transfer', None)
+                if json_transfer is not None:
+                    result["runs"][-1]["json_transfer"] = json_transfer.stats()
+                bot.progress_store.close()
+            result["server"] = server.snapshot()
+    finally:
+        server.stop()
+
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    result_path = output / f"benchmark_{task}{'_' + transfer if transfer else ''}_{run_id}.json"
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    result["report"] = str(result_path)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='机器人端到端评测（使用本地替身服务器）')
+    parser.add_argument('--task', choices=['json', 'sync', 'api'], default='json', help='评测的任务类型')
+    parser.add_argument('--pages', type=int, default=20, help='处理的页面数量')
+    parser.add_argument('--tabs', type=int, default=1, help='并行标签页（API 模式为线程）数量')
+    parser.add_argument('--latency', type=float, default=0.2, help='每个请求的基础延迟（秒）')
+    parser.add_argument('--jitter', type=float, default=0.1, help='延迟的随机抖动（秒）')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='读取接口随机失败的概率')
+    parser.add_argument('--save-failure-rate', type=float, default=0.0, help='保存接口随机失败的概率')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子，保证多次评测可比')
+    parser.add_argument('--runs', type=int, default=1, help='重复运行次数（第二次起可复用编辑页索引）')
+    parser.add_argument('--transfer', choices=['js', 'clipboard', 'both'], default='js',
+                        help='json 任务读写JSON的方式；both 依次运行两种方式并对比（剪贴板方式需要桌面会话）')
+    args = parser.parse_args()
+
+    modes = [True, False] if args.transfer == 'both' else [args.transfer == 'js']
+    if args.task != 'json':
+        modes = [True]
+    for use_js in modes:
+        config = StandinConfig(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                               save_failure_rate=args.save_failure_rate, seed=args.seed)
+        result = run_benchmark(args.task, args.pages, args.tabs, config, runs=args.runs, use_js=use_js)
+
+        transfer = f"，JSON读写: {result['transfer']}" if result['transfer'] else ""
+        print(f"任务: {result['task']}，页面: {result['pages']}，并行: {result['tabs']}{transfer}")
+        for run in result["runs"]:
+            print(f"第{run['run']}次 用时: {run['elapsed']}s，成功: {run['succeeded']}，服务器核对: {run['verified']}，"
+                  f"吞吐量: {run['pages_per_minute']} 页/分钟")
+            for path, entry in run.get("json_transfer", {}).items():
+                if entry["n"]:
+                    print(f"    {path}: n={entry['n']}, avg={entry['avg_ms']} ms, p50={entry['p50_ms']} ms")
+        print(f"注入失败: {result['server']['injected_failures']}")
+        print(f"评测结果已保存: {result['report']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+机器人工作队列压力测试
+用不访问浏览器和网络的替身策略驱动 ModularBatchBot，处理大批量目标，验证：
+- 串行模式使用显式队列，不随目标数量递归（在很低的递归上限下运行）；
+- 多结果确认在另一个线程中异步回答时，处理线程能正确等待并继续；
+- 处理结束后已完成/未完成的目标数量与按规则计算的预期一致。
+
+目标的结果由序号决定（第 i 个目标）：
+    i % 17 == 0                 搜索无结果 → 失败
+    i % 6 == 0                  多个搜索结果 → 请求确认，i % 12 == 0 时确认，否则跳过
+    i % 13 == 0                 处理失败
+    其余                         成功
+
+用法（在项目根目录运行）:
+    python -m miscellaneous.bot_queue_stress --targets 10000
+    python -m miscellaneous.bot_queue_stress --targets 2000 --tabs 4
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import contextlib
+from pathlib import Path
+
+
+def expected_completed(count: int) -> int:
+    """按上面的规则计算应当成功的目标数"""
+    completed = 0
+    for i in range(1, count + 1):
+        if i % 17 == 0 or (i % 6 == 0 and i % 12 != 0) or i % 13 == 0:
+            continue
+        completed += 1
+    return completed
+
+
+def _index(target: str) -> int:
+    return int(target.rsplit('-', 1)[-1])
+
+
+def build_bot(targets: list, tabs: int, work_dir: Path):
+    """组装使用替身策略的机器人（不启动浏览器）"""
+    from dp_bot_manager import (
+        OperationConfig, ModularBatchBot, LoginStrategy, NavigationStrategy, SearchStrategy,
+        EditorStrategy, ProcessStrategy, InteractionStrategy, ProcessResult
+    )
+
+    class StubLogin(LoginStrategy):
+        def execute_login(self, page, config):
+            return True
+
+    class StubNavigation(NavigationStrategy):
+        def navigate_to_target(self, page, config):
+            return True
+
+    class StubSearch(SearchStrategy):
+        # 返回值包含表头行：1 为无结果，2 为唯一结果，3 为多个结果
+        def search_target(self, page, target):
+            i = _index(target)
+            if i % 17 == 0:
+                return 1
+            return 3 if i % 6 == 0 else 2
+
+    class StubEditor(EditorStrategy):
+        def open_editor(self, page, target):
+            return True
+
+    class StubProcess(ProcessStrategy):
+        def process_target(self, page, target, update_action):
+            # 模拟每个目标处理时产生的临时数据，处理完即应释放
+            update_action("x" * 100_000)
+            return ProcessResult.FAILED if _index(target) % 13 == 0 else ProcessResult.SUCCESS
+
+    class AsyncConfirmHandler(InteractionStrategy):
+        """在另一个线程中回答确认，模拟 GUI 线程点击继续/跳过"""
+
+        def __init__(self):
+            self.requests = 0
+
+        def request_confirmation(self, message, on_confirm):
+            self.requests += 1
+            target = re.search(r"'(.+?)'", message).group(1)
+            threading.Timer(0, on_confirm, args=(_index(target) % 12 == 0,)).start()
+
+    config = OperationConfig(
+        login_url="", dashboard_url_contains="", operate_url="", operate_url_contains="", edit_url_contains="",
+        checkpoint_file=str(work_dir / "queue_stress.pkl"),
+        cookie_file=str(work_dir / "cookies.pkl"),
+    )
+    return ModularBatchBot(
+        config=config,
+        login_strategy=StubLogin(),
+        navigation_strategy=StubNavigation(),
+        search_strategy=StubSearch(),
+        editor_strategy=StubEditor(),
+        process_strategy=StubProcess(),
+        update_action=lambda text: text,
+        interaction_strategy=AsyncConfirmHandler(),
+        target_list=targets,
+        worker_tabs=tabs,
+        use_browser=False,
+    )
+
+
+def run_stress(count: int = 10000, tabs: int = 1, recursion_limit: int = 150, verbose: bool = False) -> dict:
+    """
+    运行一次压力测试并返回结果
+
+    参数:
+        count (int): 目标数量
+        tabs (int): 并行线程数，1 为串行队列模式
+        recursion_limit (int): 运行期间的递归上限，递归处理目标时会触发 RecursionError
+        verbose (bool): 是否输出机器人的日志
+    """
+    targets = [f"stress/page-{i}" for i in range(1, count + 1)]
+    with tempfile.TemporaryDirectory(prefix="wsa_queue_stress_") as tmp:
+        bot = build_bot(targets, tabs, Path(tmp))
+        old_limit = sys.getrecursionlimit()
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(open(os.devnull, 'w'))
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            with output:
+                sys.setrecursionlimit(recursion_limit)
+                try:
+                    bot.run()
+                finally:
+                    sys.setrecursionlimit(old_limit)
+        finally:
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        completed = len(bot.progress_store.completed())
+        remaining = len(bot.progress_store.remaining(targets))
+        bot.progress_store.close()
+
+    expected = expected_completed(count)
+    return {
+        "targets": count,
+        "tabs": tabs,
+        "recursion_limit": recursion_limit,
+        "confirmations": bot.interaction_strategy.requests,
+        "completed": completed,
+        "remaining": remaining,
+        "expected_completed": expected,
+        "ok": completed == expected and remaining == count - expected,
+        "elapsed": round(elapsed, 2),
+        "peak_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='机器人工作队列压力测试（替身策略，不需要浏览器）')
+    parser.add_argument('--targets', type=int, default=10000, help='目标数量')
+    parser.add_argument('--tabs', type=int, default=1, help='并行线程数，1 为串行队列模式')
+    parser.add_argument('--recursion-limit', type=int, default=150, help='运行期间的递归上限')
+    parser.add_argument('--verbose', action='store_true', help='输出机器人的日志')
+    args = parser.parse_args()
+
+    result = run_stress(args.targets, args.tabs, args.recursion_limit, args.verbose)
+    print(f"目标: {result['targets']}，并行: {result['tabs']}，递归上限: {result['recursion_limit']}")
+    print(f"异步确认: {result['confirmations']} 次")
+    print(f"已完成: {result['completed']}（预期 {result['expected_completed']}），未完成: {result['remaining']}")
+    print(f"用时: {result['elapsed']}s，峰值内存: {result['peak_mb']} MB")
+    print("结果一致" if result["ok"] else "❌ 结果与预期不一致")
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
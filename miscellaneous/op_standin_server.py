@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+op.pacdora.com 后台的本地替身服务器
+提供与真实后台结构一致的 登录 / 专题列表 / 编辑页 / 编辑器 页面和对应的接口，
+可配置延迟和失败注入，用于在没有网络的机器上测试和评测机器人策略
+
+用法:
+    python -m miscellaneous.op_standin_server --port 8765 --latency 0.2 --failure-rate 0.05
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from http.cookies import SimpleCookie
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+SESSION_COOKIE = "standin_session"
+SESSION_VALUE = "standin"
+
+LANGUAGES = ["英语", "西班牙语", "葡萄牙语", "法语", "印度尼西亚语", "日语", "中文"]
+
+# 与真实后台一致：操作按钮使用 vuetify 的主按钮样式，同步确认对话框中的第二个即为"确定"
+PRIMARY_BUTTON_CLASS = "v-btn v-btn--is-elevated v-btn--has-bg theme--light v-size--default primary"
+
+# 列表页默认显示的行数（真实后台为10行，搜索策略据此判断结果是否已刷新）
+LIST_PAGE_SIZE = 10
+
+DEFAULT_TEMPLATE = Path(__file__).parent.parent / "json_templates" / "mockup_tool.json"
+
+
+@dataclass
+class StandinConfig:
+    """替身服务器配置"""
+    # 每个请求的基础延迟和随机抖动（秒）
+    latency: float = 0.2
+    jitter: float = 0.1
+    # 读取类接口随机返回 500 的概率
+    failure_rate: float = 0.0
+    # 保存类接口（编辑器保存、编辑页保存、同步启用）随机失败的概率
+    save_failure_rate: float = 0.0
+    # 编辑器加载数据后再渲染工具栏的额外延迟（秒）
+    editor_load_delay: float = 0.5
+    seed: Optional[int] = None
+
+
+@dataclass
+class StandinStats:
+    """请求计数，用于核对机器人的行为"""
+    requests: Dict[str, int] = field(default_factory=dict)
+    injected_failures: Dict[str, int] = field(default_factory=dict)
+    saves: int = 0
+    syncs: int = 0
+
+
+def _page(title: str, body: str, script: str = "") -> str:
+    return f"""<!DOCTYPE html>
+<html lang="zh-CN"><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 16px; }}
+.menu, .submenu, .dialog {{ display: none; border: 1px solid #999; padding: 6px; background: #fff; }}
+.dialog {{ position: fixed; top: 80px; left: 80px; }}
+.table-td {{ padding: 2px 8px; }}
+textarea.app-writer {{ width: 600px; height: 300px; }}
+</style></head>
+<body><div id="app">{body}</div>
+<script>
+async function api(url, options) {{
+    const response = await fetch(url, options);
+    const body = await response.json();
+    if (!response.ok || body.code !== 0) throw new Error(body.msg || response.status);
+    return body.data;
+}}
+{script}
+</script></body></html>"""
+
+
+LOGIN_BODY = """
+<h2>登录</h2>
+<input type="text" placeholder="账号"><input type="password" placeholder="密码">
+<button id="login">登录</button>
+"""
+LOGIN_SCRIPT = (
+    "document.getElementById('login').onclick = () => {\n"
+    f"    document.cookie = '{SESSION_COOKIE}={SESSION_VALUE}; path=/';\n"
+    "    location.href = '/dashboard';\n"
+    "};\n"
+)
+
+DASHBOARD_BODY = """<h2>dashboard</h2><a href="/topic/List">专题列表</a>"""
+
+LIST_BODY = """
+<div class="languages">{{LANGUAGES}}</div>
+<div class="v-text-field__slot">
+    <label for="input-138">专题页路径</label>
+    <input id="input-138" type="text">
+</div>
+<table>
+    <thead><tr><th>ID</th><th>专题页路径</th><th>状态</th><th>操作</th></tr></thead>
+    <tbody id="rows">{{ROWS}}</tbody>
+</table>
+<div class="menu" id="menu">
+    <div role="option" data-action="edit">编辑</div>
+    <div class="sync-state" id="sync-state">同步状态
+        <div class="submenu" id="sync-submenu"><div id="sync-online">同步启用</div></div>
+    </div>
+    <div role="option" data-action="copy">复制</div>
+    <div role="option" data-action="delete">删除</div>
+</div>
+<div class="dialog" id="sync-dialog">
+    <p>确认同步启用？</p>
+    <button class="{{PRIMARY}}" id="sync-cancel">取消</button>
+    <button class="{{PRIMARY}}" id="sync-confirm">确定</button>
+</div>
+"""
+LIST_SCRIPT = """
+let activeId = null;
+const rows = document.getElementById('rows');
+const menu = document.getElementById('menu');
+const submenu = document.getElementById('sync-submenu');
+const dialog = document.getElementById('sync-dialog');
+
+function renderRows(list) {
+    rows.innerHTML = list.map(row =>
+        `<tr><td class="table-td">${row.id}</td><td class="table-td">${row.path}</td>` +
+        `<td class="table-td">${row.online ? '已启用' : '未启用'}</td>` +
+        `<td class="table-td" data-id="${row.id}"><button type="button">...</button></td></tr>`
+    ).join('');
+}
+
+document.getElementById('input-138').addEventListener('keydown', async (event) => {
+    if (event.key !== 'Enter') return;
+    try {
+        renderRows(await api('/api/topic/list?path=' + encodeURIComponent(event.target.value)));
+    } catch (e) {
+        console.error('搜索失败', e);
+    }
+});
+
+rows.addEventListener('click', (event) => {
+    const cell = event.target.closest('td[data-id]');
+    if (!cell) return;
+    activeId = cell.dataset.id;
+    menu.style.display = 'block';
+});
+
+menu.addEventListener('click', (event) => {
+    const option = event.target.closest('[role=option]');
+    if (option && option.dataset.action === 'edit') {
+        location.href = '/topic/edit?id=' + activeId;
+    }
+});
+
+document.getElementById('sync-state').addEventListener('mouseenter', () => { submenu.style.display = 'block'; });
+document.getElementById('sync-online').addEventListener('click', () => {
+    menu.style.display = 'none';
+    submenu.style.display = 'none';
+    dialog.style.display = 'block';
+});
+document.getElementById('sync-cancel').addEventListener('click', () => { dialog.style.display = 'none'; });
+document.getElementById('sync-confirm').addEventListener('click', async () => {
+    dialog.style.display = 'none';
+    try {
+        await api('/api/topic/sync?id=' + activeId, {method: 'POST'});
+    } catch (e) {
+        console.error('同步失败', e);
+    }
+});
+"""
+
+EDIT_BODY = """
+<h2>编辑专题页 {{PATH}}</h2>
+<div class="fields">{{FIELDS}}</div>
+<button type="button" id="open-editor">编辑值</button>
+<div class="dialog" id="field-dialog">
+    <input type="text" required="required">
+    <button type="button" id="field-confirm">确定</button>
+</div>
+<div class="btn-box"><button class="{{PRIMARY}}" id="save">保存</button></div>
+<p id="status"></p>
+"""
+EDIT_SCRIPT = """
+const pageId = new URLSearchParams(location.search).get('id');
+document.getElementById('open-editor').onclick = () => window.open('/editor?id=' + pageId);
+document.querySelectorAll('.field-edit').forEach(button => {
+    button.onclick = () => { document.getElementById('field-dialog').style.display = 'block'; };
+});
+document.getElementById('field-confirm').onclick = () => {
+    document.getElementById('field-dialog').style.display = 'none';
+};
+document.getElementById('save').onclick = async () => {
+    try {
+        await api('/api/topic/commit?id=' + pageId, {method: 'POST'});
+        location.href = '/topic/List';
+    } catch (e) {
+        document.getElementById('status').textContent = '保存失败: ' + e.message;
+    }
+};
+"""
+
+EDITOR_BODY = """<div class="app-root"><div class="app-header"><div class="tools" id="tools"></div></div></div><div id="dialog-root"></div>"""
+EDITOR_SCRIPT = """
+const pageId = new URLSearchParams(location.search).get('id');
+let state = null;
+
+function renderTools() {
+    const names = ['JSON', '撤销', '重做', '预览', '桌面', '移动', '设置', '保存'];
+    const tools = document.getElementById('tools');
+    tools.innerHTML = names.map((name, i) =>
+        `<button type="button" class="el-button el-button--primary is-round" data-index="${i}"><span>${name}</span></button>`
+    ).join('');
+    // 与真实编辑器一致：第1个按钮为JSON工具，第8个为保存
+    tools.children[0].onclick = openJsonDialog;
+    tools.children[7].onclick = save;
+}
+
+function openJsonDialog() {
+    const root = document.getElementById('dialog-root');
+    root.innerHTML = `<div class="json-dialog">
+        <button type="button" class="dialog-button" id="copy-json">获取当前JSON</button>
+        <textarea class="app-writer"></textarea>
+        <button type="button" class="dialog-button" id="apply-json">确定</button>
+        <p id="json-error"></p></div>`;
+    document.getElementById('copy-json').onclick = () => {
+        const text = JSON.stringify(state);
+        if (navigator.clipboard && navigator.clipboard.writeText) {
+            navigator.clipboard.writeText(text);
+        } else {
+            const writer = document.querySelector('.app-writer');
+            writer.value = text;
+            writer.select();
+            document.execCommand('copy');
+        }
+    };
+    document.getElementById('apply-json').onclick = () => {
+        try {
+            state = JSON.parse(document.querySelector('.app-writer').value);
+            root.innerHTML = '';
+        } catch (e) {
+            document.getElementById('json-error').textContent = 'JSON 格式错误';
+        }
+    };
+}
+
+async function save() {
+    try {
+        await api('/api/topic/update', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({id: Number(pageId), json: JSON.stringify(state), draft: true})
+        });
+        window.close();
+    } catch (e) {
+        console.error('保存失败', e);
+    }
+}
+
+api('/api/topic/detail?id=' + pageId).then(data => {
+    state = JSON.parse(data.json);
+    setTimeout(renderTools, {{EDITOR_DELAY}});
+});
+"""
+
+class OpStandinServer:
+    """
+    替身服务器
+    页面数据保存在内存中，接口格式与 OpApiClient 使用的 {code, msg, data} 一致，
+    因此浏览器模式和 API 模式的机器人都可以直接指向它运行
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[StandinConfig] = None,
+                 page_count: int = 50, template_path: Optional[str] = None):
+        self.config = config or StandinConfig()
+        self.stats = StandinStats()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.pages: Dict[int, dict] = {}
+        self._seed_pages(page_count, Path(template_path) if template_path else DEFAULT_TEMPLATE)
+
+        handler = type("StandinHandler", (_StandinHandler,), {"standin": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @staticmethod
+    def page_path(index: int) -> str:
+        return f"standin-page-{index:03d}"
+
+    def _seed_pages(self, page_count: int, template_path: Path):
+        """用录制的模板 JSON 生成页面，保证 JSON 体积与真实页面接近"""
+        try:
+            with open(template_path, 'r', encoding='utf-8') as f:
+                template = json.load(f)
+        except Exception:
+            template = {"title": "", "modules": []}
+        for i in range(1, page_count + 1):
+            data = {"path": self.page_path(i), "content": template}
+            self.pages[i] = {"id": i, "path": self.page_path(i), "json": json.dumps(data, ensure_ascii=False),
+                             "online": False, "draft": None}
+
+    def start(self) -> "OpStandinServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="op-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def snapshot(self) -> dict:
+        """返回请求计数和页面状态，供评测脚本核对结果"""
+        with self._lock:
+            return {
+                "requests": dict(self.stats.requests),
+                "injected_failures": dict(self.stats.injected_failures),
+                "saves": self.stats.saves,
+                "syncs": self.stats.syncs,
+            }
+
+    # ---------- 请求处理中使用的辅助方法 ----------
+
+    def count(self, route: str):
+        with self._lock:
+            self.stats.requests[route] = self.stats.requests.get(route, 0) + 1
+
+    def delay(self):
+        seconds = self.config.latency + self._random.uniform(0, self.config.jitter) if self.config.latency else 0
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def should_fail(self, route: str, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            failed = self._random.random() < rate
+            if failed:
+                self.stats.injected_failures[route] = self.stats.injected_failures.get(route, 0) + 1
+        return failed
+
+    def search(self, path: str) -> list:
+        """与真实后台一致按包含关系搜索，路径为空时返回第一页"""
+        with self._lock:
+            rows = [p for p in self.pages.values() if path.strip('/') in p["path"]]
+        rows = rows if path else rows[:LIST_PAGE_SIZE]
+        return [{"id": p["id"], "path": p["path"], "online": p["online"]} for p in rows]
+
+
+class _StandinHandler(BaseHTTPRequestHandler):
+    standin: OpStandinServer = None
+
+    def log_message(self, format, *args):
+        pass
+
+    # ---------- 响应 ----------
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _html(self, html: str):
+        self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _json(self, data=None, status: int = 200, code: int = 0, msg: str = "ok"):
+        body = json.dumps({"code": code, "msg": msg, "data": data}, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8")
+
+    def _redirect(self, location: str):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _logged_in(self) -> bool:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return SESSION_COOKIE in cookie and cookie[SESSION_COOKIE].value == SESSION_VALUE
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    # ---------- 路由 ----------
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        standin = self.standin
+        standin.count(f"GET {url.path}")
+        standin.delay()
+
+        if url.path == "/__stats":
+            return self._json(standin.snapshot())
+        if url.path == "/login":
+            if self._logged_in():
+                return self._redirect("/dashboard")
+            return self._html(_page("登录", LOGIN_BODY, LOGIN_SCRIPT))
+
+        if not self._logged_in():
+            if url.path.startswith("/api/"):
+                return self._json(None, status=401, code=401, msg="未登录")
+            return self._redirect("/login")
+
+        if url.path == "/dashboard":
+            return self._html(_page("dashboard", DASHBOARD_BODY))
+        if url.path == "/topic/List":
+            return self._html(self._list_page())
+        if url.path == "/topic/edit":
+            return self._edit_page(query.get("id"))
+        if url.path == "/editor":
+            script = EDITOR_SCRIPT.replace("{{EDITOR_DELAY}}", str(int(standin.config.editor_load_delay * 1000)))
+            return self._html(_page("编辑器", EDITOR_BODY, script))
+
+        if url.path == "/api/topic/list":
+            if standin.should_fail("list", standin.config.failure_rate):
+                return self._json(None, status=500, code=500, msg="injected failure")
+            return self._json(standin.search(query.get("path", "")))
+        if url.path == "/api/topic/detail":
+            if standin.should_fail("detail", standin.config.failure_rate):
+                return self._json(None, status=500, code=500, msg="injected failure")
+            page = standin.pages.get(int(query.get("id", 0)))
+            if page is None:
+                return self._json(None, status=404, code=404, msg="not found")
+            return self._json({"id": page["id"], "path": page["path"], "json": page["json"]})
+
+        self._send(404, b"not found", "text/plain")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        standin = self.standin
+        standin.count(f"POST {url.path}")
+        standin.delay()
+
+        if not self._logged_in():
+            return self._json(None, status=401, code=401, msg="未登录")
+
+        if url.path == "/api/topic/update":
+            data = self._read_json()
+            if standin.should_fail("update", standin.config.save_failure_rate):
+                return self._json(None, status=500, code=500, msg="injected failure")
+            with standin._lock:
+                page = standin.pages.get(int(data.get("id", 0)))
+                if page is None:
+                    return self._json(None, status=404, code=404, msg="not found")
+                # 浏览器编辑器先保存为草稿，编辑页点击"保存"后才生效；API 模式直接生效
+                if data.get("draft"):
+                    page["draft"] = data["json"]
+                else:
+                    page["json"] = data["json"]
+                    standin.stats.saves += 1
+            return self._json(True)
+        if url.path == "/api/topic/commit":
+            if standin.should_fail("commit", standin.config.save_failure_rate):
+                return self._json(None, status=500, code=500, msg="injected failure")
+            with standin._lock:
+                page = standin.pages.get(int(query.get("id", 0)))
+                if page is None:
+                    return self._json(None, status=404, code=404, msg="not found")
+                if page["draft"] is not None:
+                    page["json"], page["draft"] = page["draft"], None
+                    standin.stats.saves += 1
+            return self._json(True)
+        if url.path == "/api/topic/sync":
+            if standin.should_fail("sync", standin.config.save_failure_rate):
+                return self._json(None, status=500, code=500, msg="injected failure")
+            with standin._lock:
+                page = standin.pages.get(int(query.get("id", 0)))
+                if page is None:
+                    return self._json(None, status=404, code=404, msg="not found")
+                page["online"] = True
+                standin.stats.syncs += 1
+            return self._json(True)
+
+        self._send(404, b"not found", "text/plain")
+
+    # ---------- 页面 ----------
+
+    def _list_page(self) -> str:
+        languages = "".join(f'<span class="language">{name}</span> ' for name in LANGUAGES)
+        rows = "".join(
+            f'<tr><td class="table-td">{row["id"]}</td><td class="table-td">{row["path"]}</td>'
+            f'<td class="table-td">{"已启用" if row["online"] else "未启用"}</td>'
+            f'<td class="table-td" data-id="{row["id"]}"><button type="button">...</button></td></tr>'
+            for row in self.standin.search("")
+        )
+        body = (LIST_BODY.replace("{{LANGUAGES}}", languages)
+                .replace("{{ROWS}}", rows)
+                .replace("{{PRIMARY}}", PRIMARY_BUTTON_CLASS))
+        return _page("专题列表", body, LIST_SCRIPT)
+
+    def _edit_page(self, page_id: Optional[str]):
+        page = self.standin.pages.get(int(page_id or 0))
+        if page is None:
+            return self._send(404, b"not found", "text/plain")
+        fields = "".join(f'<div class="field">字段{i} <button type="button" class="field-edit">修改字段</button></div>'
+                         for i in range(1, 9))
+        body = (EDIT_BODY.replace("{{PATH}}", page["path"])
+                .replace("{{FIELDS}}", fields)
+                .replace("{{PRIMARY}}", PRIMARY_BUTTON_CLASS))
+        self._html(_page("编辑", body, EDIT_SCRIPT))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='op.pacdora.com 本地替身服务器')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pages', type=int, default=50, help='生成的页面数量')
+    parser.add_argument('--latency', type=float, default=0.2, help='每个请求的基础延迟（秒）')
+    parser.add_argument('--jitter', type=float, default=0.1, help='延迟的随机抖动（秒）')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='读取接口随机失败的概率')
+    parser.add_argument('--save-failure-rate', type=float, default=0.0, help='保存接口随机失败的概率')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    config = StandinConfig(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                           save_failure_rate=args.save_failure_rate, seed=args.seed)
+    server = OpStandinServer(args.host, args.port, config, page_count=args.pages).start()
+    print(f"替身服务器已启动: {server.base_url}/login （Ctrl+C 退出）")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# 第三方库导入
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+    QTextEdit, QPushButton, QDialogButtonBox
+)
+from PySide6.QtCore import Qt
+from typing import Dict, List
+
+from utils.review_queue import ParkedTarget
+
+
+class ReviewParkedDialog(QDialog):
+    """
+    一次性复核机器人暂存的目标
+    勾选的目标会重新处理（搜索结果不唯一时按原先"继续"的方式处理），未勾选的目标记为跳过
+    """
+    def __init__(self, parked: List[ParkedTarget], parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Review parked targets ({len(parked)})")
+        self.setMinimumSize(640, 420)
+        self.parked = parked
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("以下目标有多个搜索结果。勾选需要继续处理的目标，未勾选的将被跳过："))
+
+        content_layout = QHBoxLayout()
+        self.target_list = QListWidget()
+        for item in parked:
+            list_item = QListWidgetItem(item.target)
+            list_item.setFlags(list_item.flags() | Qt.ItemIsUserCheckable)
+            list_item.setCheckState(Qt.Unchecked)
+            self.target_list.addItem(list_item)
+        self.target_list.currentRowChanged.connect(self._show_snapshot)
+        content_layout.addWidget(self.target_list, 1)
+
+        # 选中目标的搜索结果快照
+        self.snapshot_view = QTextEdit()
+        self.snapshot_view.setReadOnly(True)
+        content_layout.addWidget(self.snapshot_view, 2)
+        layout.addLayout(content_layout)
+
+        select_layout = QHBoxLayout()
+        select_all_button = QPushButton("全选")
+        select_all_button.clicked.connect(lambda: self._set_all(Qt.Checked))
+        select_layout.addWidget(select_all_button)
+        select_none_button = QPushButton("全不选")
+        select_none_button.clicked.connect(lambda: self._set_all(Qt.Unchecked))
+        select_layout.addWidget(select_none_button)
+        select_layout.addStretch()
+        layout.addLayout(select_layout)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.button(QDialogButtonBox.Ok).setText("提交复核")
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+        if parked:
+            self.target_list.setCurrentRow(0)
+
+    def _show_snapshot(self, row: int):
+        if 0 <= row < len(self.parked):
+            item = self.parked[row]
+            lines = item.snapshot or ["（没有搜索结果快照）"]
+            self.snapshot_view.setPlainText(f"{item.message}\n\n" + "\n".join(lines))
+
+    def _set_all(self, state):
+        for i in range(self.target_list.count()):
+            self.target_list.item(i).setCheckState(state)
+
+    def decisions(self) -> Dict[str, bool]:
+        """返回 目标 -> 是否继续处理"""
+        return {
+            self.target_list.item(i).text(): self.target_list.item(i).checkState() == Qt.Checked
+            for i in range(self.target_list.count())
+        }
@@ -0,0 +1,185 @@
+import os
+import json
+import logging
+import tempfile
+import threading
+
+# 页面文件夹中可被上传的图片格式
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+
+def new_cdn_record() -> dict:
+    """
+    返回一个空白的cdn.json模板。
+    """
+    return {
+        "cover_cdn": "", "cover_more_cdn": "",
+        "mockup_list_1_number": "", "mockup_list_2_number": "",
+        "step1_cdn": "", "step2_cdn": "", "step3_cdn": "",
+        "feature1_cdn": "", "feature2_cdn": "", "feature3_cdn": "", "feature4_cdn": "",
+        "banner_cdn": ""
+    }
+
+
+def list_folder_images(folder_path: str) -> list:
+    """
+    列出文件夹中所有可上传的图片文件名。
+    """
+    return [f for f in os.listdir(folder_path) if f.lower().endswith(IMAGE_EXTENSIONS)]
+
+
+def resolve_cdn_key(image_name: str, cdn_data: dict) -> str:
+    """
+    根据图片文件名确定其在cdn.json中对应的键。
+
+    - banner -> banner_cdn
+    - 1/2/3 -> stepN_cdn
+    - a/b/c/d -> featureN_cdn
+    - 含mockup或custom的文件名 -> cover_cdn / cover_more_cdn，并顺带记录文件名末尾的样机数量
+    - 其他未知图片直接使用文件名作为键
+
+    注意：样机数量会直接写入传入的cdn_data中（仅当原值为空时）。
+    """
+    filename, _ = os.path.splitext(image_name)
+
+    if filename == 'banner':
+        return 'banner_cdn'
+    if filename in ['1', '2', '3']:
+        return f"step{filename}_cdn"
+    if filename in ['a', 'b', 'c', 'd']:
+        return f"feature{ord(filename) - ord('a') + 1}_cdn"
+    if "mockup" in filename or "custom" in filename:
+        parts = filename.replace("_", " ").split()
+        number = parts[-1] if parts[-1].isdigit() else ""
+        if "more" in parts:
+            if number and not cdn_data.get("mockup_list_2_number"):
+                cdn_data["mockup_list_2_number"] = number
+            return "cover_more_cdn"
+        if number and not cdn_data.get("mockup_list_1_number"):
+            cdn_data["mockup_list_1_number"] = number
+        return "cover_cdn"
+
+    # 如果是未知图片，使用文件名作为key
+    return filename
+
+
+# 进程内每个页面文件夹一把锁（按解析后的路径），后台监听、手动上传和bot对同一文件夹的写入互相串行
+_folder_locks: dict[str, threading.RLock] = {}
+_folder_locks_guard = threading.Lock()
+
+
+def folder_lock(folder_path: str) -> threading.RLock:
+    """返回页面文件夹对应的进程级锁"""
+    key = os.path.normcase(os.path.realpath(os.path.abspath(folder_path)))
+    with _folder_locks_guard:
+        return _folder_locks.setdefault(key, threading.RLock())
+
+
+class CdnJournal:
+    """
+    单个页面文件夹的cdn.json追加式日志，保证上传中途崩溃也不会丢失已完成的链接。
+
+    - 每张图片上传成功后立即向 cdn.json.journal 追加一行 {"key": ..., "url": ...} 并fsync；
+    - load() 读取cdn.json后重放日志，上一次中断前完成的上传会被直接恢复，不再重新传输；
+    - commit() 先写临时文件再原子替换cdn.json，成功后删除日志。
+
+    同一文件夹的所有 CdnJournal 实例共用一把进程级锁；commit() 会在锁内重新读取cdn.json和日志，
+    只把本实例在 load() 之后修改过的键合并进去，不会覆盖其他写入者（如后台监听）刚写入的链接。
+    """
+
+    JOURNAL_NAME = 'cdn.json.journal'
+
+    def __init__(self, folder_path: str):
+        self.folder_path = folder_path
+        self.json_path = os.path.join(folder_path, 'cdn.json')
+        self.journal_path = os.path.join(folder_path, self.JOURNAL_NAME)
+        self._lock = folder_lock(folder_path)
+        # load() 返回的记录快照，commit() 据此判断调用方修改了哪些键
+        self._baseline: dict | None = None
+
+    def has_pending_entries(self) -> bool:
+        """是否存在上一次未提交的日志"""
+        return os.path.exists(self.journal_path)
+
+    def load(self) -> dict:
+        """
+        读取cdn.json并重放日志，返回合并后的记录。
+        cdn.json损坏时从空白模板开始；日志最后一行写到一半时忽略该行。
+        """
+        with self._lock:
+            cdn_data = self._read_current()
+        self._baseline = dict(cdn_data)
+        return cdn_data
+
+    def _read_current(self) -> dict:
+        """读取磁盘上的cdn.json并重放日志（需在持有锁时调用）"""
+        cdn_data = new_cdn_record()
+        if os.path.exists(self.json_path):
+            try:
+                with open(self.json_path, 'r') as f:
+                    cdn_data.update(json.load(f))
+            except json.JSONDecodeError:
+                logging.warning(f"{self.json_path} is corrupted, starting with a fresh record.")
+
+        for key, cdn_url in self._read_journal():
+            cdn_data[key] = cdn_url
+        return cdn_data
+
+    def _read_journal(self) -> list[tuple[str, str]]:
+        if not os.path.exists(self.journal_path):
+            return []
+        entries = []
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    entries.append((entry['key'], entry['url']))
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # 崩溃时最后一行可能只写了一半
+                    logging.warning(f"Ignoring incomplete line in {self.journal_path}")
+        return entries
+
+    def replayed_count(self) -> int:
+        """日志中可重放的记录数"""
+        return len(self._read_journal())
+
+    def append(self, key: str, cdn_url: str):
+        """记录一条上传成功的链接，写入后立即落盘"""
+        line = json.dumps({"key": key, "url": cdn_url}, ensure_ascii=False) + '\n'
+        with self._lock:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def commit(self, cdn_data: dict) -> dict:
+        """
+        把本实例的修改合并进最新的cdn.json（含其他写入者的日志），原子地写回并清空日志
+
+        返回:
+            dict: 实际写入的记录
+        """
+        with self._lock:
+            merged = self._read_current()
+            for key, value in cdn_data.items():
+                # 没有调用过 load() 时视为全部修改；否则只合并调用方改动过的键
+                if self._baseline is None or self._baseline.get(key) != value:
+                    merged[key] = value
+            fd, tmp_path = tempfile.mkstemp(prefix='cdn.json.', suffix='.tmp', dir=self.folder_path)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(merged, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.json_path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        self._baseline = dict(merged)
+        cdn_data.update(merged)
+        return merged
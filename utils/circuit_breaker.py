@@ -0,0 +1,150 @@
+import time
+import threading
+from typing import Callable, Optional
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    外部接口的熔断器
+
+    连续失败 failure_threshold 次后打开：之后的调用立即返回（由调用方使用缓存或默认值），
+    不再逐个等待超时和重试。打开后在后台线程中每隔 reset_timeout 秒调用一次 probe 探测（半开状态），
+    探测成功则关闭熔断器恢复正常请求；没有 probe 时，过了 reset_timeout 后放行下一次真实调用作为探测。
+    同时统计被短路的调用次数和估计节省的时间。
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 probe: Optional[Callable[[], bool]] = None,
+                 on_state_change: Optional[Callable[[str, str], None]] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        # 状态变化回调 (旧状态, 新状态)，在调用线程或探测线程中执行
+        self.on_state_change = on_state_change
+
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_thread: Optional[threading.Thread] = None
+        self._trial_in_flight = False
+
+        self.failures = 0
+        self.failure_seconds = 0.0
+        self.short_circuited = 0
+        self.seconds_saved = 0.0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    @property
+    def avg_failure_seconds(self) -> float:
+        """失败调用的平均耗时（通常接近超时时间），用于估计短路节省的时间"""
+        with self._lock:
+            return self.failure_seconds / self.failures if self.failures else 0.0
+
+    def _set_state(self, state: str):
+        """需在持有锁时调用，返回需要在锁外执行的回调参数"""
+        old, self._state = self._state, state
+        return (old, state) if old != state else None
+
+    def _notify(self, change):
+        if change and self.on_state_change:
+            try:
+                self.on_state_change(*change)
+            except Exception:
+                pass
+
+    def allow(self, estimated_cost: float = 0.0) -> bool:
+        """
+        是否放行本次调用；不放行时记为一次短路，estimated_cost 为本次调用在故障时预计耗费的秒数
+        """
+        change = None
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return True
+            if (self.probe is None and not self._trial_in_flight
+                    and time.monotonic() - self._opened_at >= self.reset_timeout):
+                # 没有后台探测时，放行一次真实调用作为探测
+                self._trial_in_flight = True
+                change = self._set_state(STATE_HALF_OPEN)
+                allowed = True
+            else:
+                self.short_circuited += 1
+                self.seconds_saved += estimated_cost
+                allowed = False
+        self._notify(change)
+        return allowed
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+            change = self._set_state(STATE_CLOSED)
+        self._notify(change)
+
+    def record_failure(self, elapsed: float = 0.0):
+        change = None
+        with self._lock:
+            self.failures += 1
+            self.failure_seconds += elapsed
+            self._consecutive_failures += 1
+            trial_failed = self._state == STATE_HALF_OPEN
+            self._trial_in_flight = False
+            if trial_failed or (self._state == STATE_CLOSED
+                                and self._consecutive_failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                change = self._set_state(STATE_OPEN)
+                self._start_probe()
+        self._notify(change)
+
+    def _start_probe(self):
+        """需在持有锁时调用：打开时启动后台探测线程（同一时间只有一个）"""
+        if self.probe is None or (self._probe_thread is not None and self._probe_thread.is_alive()):
+            return
+        self._probe_thread = threading.Thread(target=self._probe_loop, daemon=True, name=f"{self.name}-probe")
+        self._probe_thread.start()
+
+    def _probe_loop(self):
+        while True:
+            time.sleep(self.reset_timeout)
+            with self._lock:
+                if self._state == STATE_CLOSED:
+                    return
+                change = self._set_state(STATE_HALF_OPEN)
+            self._notify(change)
+            try:
+                healthy = bool(self.probe())
+            except Exception:
+                healthy = False
+            if healthy:
+                self.record_success()
+                return
+            with self._lock:
+                self._opened_at = time.monotonic()
+                change = self._set_state(STATE_OPEN)
+            self._notify(change)
+
+    def reset(self):
+        """手动关闭熔断器并清零统计"""
+        with self._lock:
+            change = self._set_state(STATE_CLOSED)
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+            self.failures = 0
+            self.failure_seconds = 0.0
+            self.short_circuited = 0
+            self.seconds_saved = 0.0
+        self._notify(change)
+
+    def summary(self) -> str:
+        with self._lock:
+            return (f"{self.name}: {self._state}, {self.failures} failed calls, "
+                    f"{self.short_circuited} short-circuited, ~{self.seconds_saved:.0f}s saved")
@@ -0,0 +1,78 @@
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from utils.progress_store import PROGRESS_DB_NAME
+
+
+class EditUrlIndex:
+    """
+    目标 → 编辑页 URL 的索引，与断点进度存在同一个 SQLite 数据库中
+
+    目标第一次通过搜索唯一定位并打开编辑页时记录 URL，
+    之后同一目标可以直接打开编辑页，跳过输入搜索和等待结果的步骤。
+    不同语言的编辑页可能不同，因此按 scope（通常为语言）分别记录。
+    """
+
+    def __init__(self, db_path: str | Path, scope: str = ""):
+        self.db_path = Path(db_path)
+        self.scope = scope
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS edit_urls (
+                scope TEXT NOT NULL,
+                target TEXT NOT NULL,
+                url TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (scope, target)
+            )"""
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @classmethod
+    def for_checkpoint(cls, checkpoint_file: str | Path, scope: str = "") -> "EditUrlIndex":
+        """与 SqliteCheckpointBackend.for_checkpoint 使用同一个数据库文件"""
+        return cls(Path(checkpoint_file).parent / PROGRESS_DB_NAME, scope)
+
+    def get(self, target: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url FROM edit_urls WHERE scope = ? AND target = ?", (self.scope, target)
+            ).fetchone()
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def put(self, target: str, url: str):
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO edit_urls (scope, target, url, updated_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (scope, target) DO UPDATE SET url = excluded.url, updated_at = excluded.updated_at""",
+                (self.scope, target, url, time.time())
+            )
+            self._conn.commit()
+
+    def invalidate(self, target: str):
+        """记录的 URL 已失效（页面被删除或改版），删除后下次重新搜索"""
+        with self._lock:
+            self._conn.execute("DELETE FROM edit_urls WHERE scope = ? AND target = ?", (self.scope, target))
+            self._conn.commit()
+            self.stale += 1
+
+    def summary(self) -> str:
+        with self._lock:
+            return f"Edit URL index: {self.hits} direct, {self.misses} searched, {self.stale} stale"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,7 +1,50 @@
 import requests
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
-from typing import Callable, Optional
+from typing import Callable, Iterable, List, Optional
+
+from requests.adapters import HTTPAdapter
+
+from utils.mockup_details_cache import MockupDetailsCache, STATUS_OK, get_details_cache
+from utils.circuit_breaker import CircuitBreaker, STATE_CLOSED
+
+# 并行获取时的默认线程数，同时也是共享会话的连接池大小
+DEFAULT_FETCH_WORKERS = 8
+
+DETAILS_API_URL = "https://canary.pacdora.com/api/v2/models/details"
+REQUEST_TIMEOUT_SECONDS = 5
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """
+    进程内共享的 keep-alive 会话，多次获取复用同一批 TCP/TLS 连接
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=DEFAULT_FETCH_WORKERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _probe_details_api() -> bool:
+    """熔断器半开探测：接口能返回非 5xx 的响应即视为恢复"""
+    response = get_shared_session().get(f"{DETAILS_API_URL}?mockupNameKey=", timeout=REQUEST_TIMEOUT_SECONDS)
+    return response.status_code < 500
+
+
+# 详情接口的共享熔断器：连续 3 次请求失败（超时、连接错误、5xx）后打开，
+# 之后的查询直接使用缓存或默认值，后台每 30 秒探测一次接口是否恢复
+details_breaker = CircuitBreaker("Details API", failure_threshold=3, reset_timeout=30.0,
+                                 probe=_probe_details_api)
 
 def remove_trailing_number(model_name: str) -> str:
     """
@@ -20,13 +63,27 @@ def remove_trailing_number(model_name: str) -> str:
         return model_name
 
 
-def fetch_mockup_details(model_name_key: str, output_callback: Optional[Callable[[str, str], None]] = None) -> tuple:
+def _details_cache(log_message) -> Optional[MockupDetailsCache]:
+    """获取共享缓存；缓存不可用（例如数据库损坏）时不影响联网获取"""
+    try:
+        return get_details_cache()
+    except Exception as e:
+        log_message(f"样机详情缓存不可用，直接请求接口：{e}", "warning")
+        return None
+
+
+def fetch_mockup_details(model_name_key: str, output_callback: Optional[Callable[[str, str], None]] = None,
+                         session: Optional[requests.Session] = None, use_cache: bool = True,
+                         refresh: bool = False) -> tuple:
     """
     根据模型名称或URL获取模型/刀模图的详细信息。
 
     参数:
         model_name_key (str): 模型名称键或包含模型ID的URL。
         output_callback (function, optional): 用于输出消息的回调函数。
+        session (requests.Session, optional): 使用的HTTP会话，默认使用共享的 keep-alive 会话。
+        use_cache (bool): 是否使用跨页面的样机详情缓存。
+        refresh (bool): 忽略缓存中的结果，重新请求并更新缓存。
 
     返回:
         tuple: 包含模型名称、图片URL和编辑链接的元组。
@@ -39,11 +96,8 @@ def fetch_mockup_details(model_name_key: str, output_callback: Optional[Callable
             print(message)
 
     # 根据 model_name_key 判断是获取刀模图还是普通模型的信息
-    api_base_url = (
-        "https://canary.pacdora.com/api/v2/models/details?nameKey="
-        if "-dieline-" in model_name_key
-        else "https://canary.pacdora.com/api/v2/models/details?mockupNameKey="
-    )
+    key_kind = "nameKey" if "-dieline-" in model_name_key else "mockupNameKey"
+    api_base_url = f"{DETAILS_API_URL}?{key_kind}="
 
     DEFAULT_MODEL_NAME = "CHECK YOUR SPELLING"
     DEFAULT_IMAGE_URL = "//cdn.pacdora.com/ui/topic/f420bfb0-3584-47ae-88cd-bb5591f49e78.png"
@@ -56,6 +110,8 @@ def fetch_mockup_details(model_name_key: str, output_callback: Optional[Callable
     MAX_RETRIES = 3
     RETRY_DELAY_SECONDS = 1
 
+    http = session or get_shared_session()
+
     try:
         if model_name_key.strip().startswith("https:"):
             parsed_url = urlparse(model_name_key)
@@ -65,19 +121,51 @@ def fetch_mockup_details(model_name_key: str, output_callback: Optional[Callable
                 log_message(f"URL解析失败：无法从 '{model_name_key}' 中提取模型ID。", "error")
                 return model_name, image, editor_link
 
+            cache = _details_cache(log_message) if use_cache else None
+            if cache is not None and not refresh:
+                cached = cache.get(key_kind, model_id)
+                if cached is not None:
+                    if cached.status == STATUS_OK:
+                        log_message(f"Using cached details for: {model_id}", "info")
+                        return cached.name, cached.image, editor_link
+                    log_message(f"缓存中 {model_id} 记录为不存在，请检查链接拼写（python -m utils.mockup_details_cache --refresh 可重新获取）。", "warning")
+                    return model_name, image, editor_link
+
+            def stale_or_default():
+                # 接口熔断中或暂时获取失败：有缓存（即使已过期）就用缓存，否则使用默认值
+                stale = cache.get(key_kind, model_id, allow_stale=True) if cache is not None else None
+                if stale is not None and stale.status == STATUS_OK:
+                    log_message(f"详情接口不可用，{model_id} 使用已过期的缓存。", "warning")
+                    return stale.name, stale.image, editor_link
+                log_message(f"详情接口不可用，{model_id} 使用默认值。", "warning")
+                return model_name, image, editor_link
+
             request_url = api_base_url + model_id
             log_message(f"Fetching details for: {model_id}", "info")
 
             for attempt in range(MAX_RETRIES):
+                # 熔断器打开时不再请求，节省的时间按剩余尝试次数 × 失败请求的平均耗时估计
+                remaining = MAX_RETRIES - attempt
+                attempt_cost = details_breaker.avg_failure_seconds or REQUEST_TIMEOUT_SECONDS
+                if not details_breaker.allow(remaining * attempt_cost + (remaining - 1) * RETRY_DELAY_SECONDS):
+                    return stale_or_default()
+
+                started = time.perf_counter()
                 try:
-                    response = requests.get(request_url, timeout=5)
+                    response = http.get(request_url, timeout=REQUEST_TIMEOUT_SECONDS)
+                    # 服务器有响应（包括 404）就说明接口可用，只有 5xx 计为接口故障
+                    if response.status_code >= 500:
+                        details_breaker.record_failure(time.perf_counter() - started)
+                    else:
+                        details_breaker.record_success()
                     response.raise_for_status()
 
                     data = response.json().get("data", {})
                     if not data:
+                        # 空数据可能只是接口的短暂异常，按原逻辑重试，不写入负缓存
                         log_message(f"API响应数据为空或格式不正确：{response.text}", "warning")
                         if attempt == MAX_RETRIES - 1:
-                            return model_name, image, editor_link
+                            return stale_or_default()
                         else:
                             time.sleep(RETRY_DELAY_SECONDS)
                             continue
@@ -92,12 +180,21 @@ def fetch_mockup_details(model_name_key: str, output_callback: Optional[Callable
                         image = data.get("image", "").strip()
                     
                     log_message(f"Successfully fetched details for: {model_id}", "success")
+                    if cache is not None:
+                        cache.put(key_kind, model_id, model_name_key, model_name, image)
                     break
                 except requests.exceptions.Timeout:
+                    details_breaker.record_failure(time.perf_counter() - started)
                     log_message(f"请求超时：第 {attempt + 1} 次尝试连接 {request_url} 超时。", "warning")
                 except requests.exceptions.HTTPError as e:
                     log_message(f"HTTP错误：第 {attempt + 1} 次尝试请求 {request_url} 失败，状态码：{e.response.status_code}。", "error")
+                    # 404 是确定的结果，不再重试，作为负缓存记录
+                    if e.response.status_code == 404:
+                        if cache is not None:
+                            cache.put_not_found(key_kind, model_id, model_name_key)
+                        return model_name, image, editor_link
                 except requests.exceptions.RequestException as e:
+                    details_breaker.record_failure(time.perf_counter() - started)
                     log_message(f"请求异常：第 {attempt + 1} 次尝试请求 {request_url} 发生错误：{e}", "error")
                 except ValueError as e:
                     log_message(f"JSON解析错误：无法解析响应数据，错误：{e}。响应内容：{response.text}", "error")
@@ -105,11 +202,14 @@ def fetch_mockup_details(model_name_key: str, output_callback: Optional[Callable
                     log_message(f"内部错误：处理请求 {request_url} 时发生未知错误：{e}", "error")
 
                 if attempt < MAX_RETRIES - 1:
+                    if details_breaker.state != STATE_CLOSED:
+                        # 熔断器已打开，下一次循环会直接使用缓存或默认值，无需等待
+                        continue
                     log_message(f"Retrying in {RETRY_DELAY_SECONDS} second(s)...", "info")
                     time.sleep(RETRY_DELAY_SECONDS)
                 else:
                     log_message(f"已达到最大重试次数，未能成功获取 {model_id} 的详细信息。", "error")
-                    return model_name, image, editor_link
+                    return stale_or_default()
 
     except Exception as e:
         log_message(f"发生初始化或URL解析错误：{e}", "error")
@@ -117,6 +217,62 @@ def fetch_mockup_details(model_name_key: str, output_callback: Optional[Callable
     return model_name, image, editor_link
 
 
+def fetch_mockup_details_many(model_name_keys: Iterable[str],
+                              output_callback: Optional[Callable[[str, str], None]] = None,
+                              max_workers: int = DEFAULT_FETCH_WORKERS,
+                              session: Optional[requests.Session] = None) -> List[tuple]:
+    """
+    并行获取多个模型/刀模图的详细信息。
+
+    所有请求复用同一个 keep-alive 会话，在有限大小的线程池中并行执行；
+    每一项仍按 fetch_mockup_details 的逻辑单独重试，失败的项返回默认值，不影响其他项。
+
+    参数:
+        model_name_keys (Iterable[str]): 模型名称键或URL列表。
+        output_callback (function, optional): 用于输出消息的回调函数（会在工作线程中调用）。
+        max_workers (int): 最大并行请求数。
+        session (requests.Session, optional): 使用的HTTP会话，默认使用共享会话。
+
+    返回:
+        List[tuple]: 与输入顺序一致的 (模型名称, 图片URL, 编辑链接) 列表。
+    """
+    keys = list(model_name_keys)
+    if not keys:
+        return []
+    http = session or get_shared_session()
+    skipped_before, saved_before = details_breaker.short_circuited, details_breaker.seconds_saved
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keys))),
+                            thread_name_prefix="mockup-details") as executor:
+        results = list(executor.map(lambda key: fetch_mockup_details(key, output_callback, http), keys))
+
+    skipped = details_breaker.short_circuited - skipped_before
+    if skipped and output_callback:
+        saved = details_breaker.seconds_saved - saved_before
+        output_callback(f"Details API unavailable: {skipped} request(s) short-circuited, ~{saved:.0f}s saved "
+                        f"({details_breaker.summary()})", "warning")
+    return results
+
+
+def refresh_cached_details(expired_only: bool = False,
+                           output_callback: Optional[Callable[[str, str], None]] = None,
+                           max_workers: int = DEFAULT_FETCH_WORKERS) -> int:
+    """
+    批量刷新样机详情缓存：重新请求缓存中的（或仅已过期的）模型并更新缓存
+
+    返回:
+        int: 刷新的模型数量
+    """
+    cache = get_details_cache()
+    keys = [entry.source_key for entry in cache.entries(expired_only=expired_only)]
+    if not keys:
+        return 0
+    http = get_shared_session()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keys))),
+                            thread_name_prefix="mockup-refresh") as executor:
+        list(executor.map(lambda key: fetch_mockup_details(key, output_callback, http, refresh=True), keys))
+    return len(keys)
+
+
 if __name__ == "__main__":
     a,b,c = fetch_mockup_details("https://www.pacdora.com/mockup-detail/stand-up-pouch-coffee-pouch-mockup-605630")
     print(a,b,c)
\ No newline at end of file
@@ -0,0 +1,198 @@
+import os
+import queue
+import threading
+from typing import Callable, Optional
+
+from utils.cdn_records import CdnJournal, folder_lock, list_folder_images, resolve_cdn_key
+
+# 默认扫描间隔（秒）与上传队列容量
+DEFAULT_SCAN_INTERVAL = 30.0
+DEFAULT_QUEUE_SIZE = 64
+
+
+class FolderWatcher:
+    """
+    后台轮询NAS页面文件夹，图片一落地就自动上传并更新该文件夹的cdn.json。
+
+    NAS是SMB网络共享，文件系统事件在mac和win上都不可靠，因此采用按间隔轮询：
+    - 通过 (mtime, size) 判断图片是否新增或被修改；
+    - 同一签名需要在连续两次扫描中保持不变才会入队，避免上传仍在拷贝中的文件；
+    - 首次扫描时，cdn.json中已有链接的图片视为已上传，不会重复上传；
+    - 每个文件夹的cdn.json记录会被缓存，只有cdn.json或日志的mtime/大小变化时才重新读取；
+    - 上传队列有容量上限，队列已满时本轮跳过，留到下一轮扫描再入队。
+    """
+
+    def __init__(
+        self,
+        uploader,
+        folders_provider: Callable[[], list[str]],
+        scan_interval: float = DEFAULT_SCAN_INTERVAL,
+        max_queue_size: int = DEFAULT_QUEUE_SIZE,
+        upload_workers: int = 2,
+        output_callback: Optional[Callable[[str, str], None]] = None
+    ):
+        """
+        参数:
+            uploader (S3Uploader): 用于上传的S3Uploader实例。
+            folders_provider (Callable): 每轮扫描前调用，返回需要监听的文件夹路径列表。
+            scan_interval (float): 扫描间隔（秒）。
+            max_queue_size (int): 上传队列的最大长度。
+            upload_workers (int): 同时从队列中取任务上传的线程数。
+            output_callback (Callable, optional): 输出消息的回调，签名为 (message, msg_type)。
+        """
+        self.uploader = uploader
+        self.folders_provider = folders_provider
+        self.scan_interval = scan_interval
+        self.upload_workers = max(1, upload_workers)
+        self.output_callback = output_callback
+
+        self._queue: queue.Queue[str] = queue.Queue(maxsize=max_queue_size)
+        self._stop_event = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._state_lock = threading.Lock()
+        # 文件路径 -> 已上传（或已有链接）时的签名
+        self._uploaded: dict[str, tuple[float, int]] = {}
+        # 文件路径 -> 上一轮扫描看到的签名，用于稳定性判断
+        self._candidates: dict[str, tuple[float, int]] = {}
+        # 已入队但尚未上传完成的文件
+        self._queued: set[str] = set()
+        # 文件夹 -> (cdn.json和日志的签名, 记录)，空闲时不必每轮都从NAS读取cdn.json
+        self._cdn_cache: dict[str, tuple[tuple, dict]] = {}
+
+    def log(self, message: str, msg_type: str = "info"):
+        if self.output_callback:
+            self.output_callback(message, msg_type)
+        else:
+            print(message)
+
+    @property
+    def is_running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self):
+        """启动扫描线程和上传线程"""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._threads = [threading.Thread(target=self._scan_loop, name="folder-watch-scan", daemon=True)]
+        for i in range(self.upload_workers):
+            self._threads.append(threading.Thread(target=self._upload_loop, name=f"folder-watch-upload-{i}", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        self.log(f"Folder watcher started (interval {self.scan_interval:.0f}s).", "success")
+
+    def stop(self):
+        """停止监听，正在进行的上传会在完成后退出"""
+        self._stop_event.set()
+        self.log("Folder watcher stopping...", "info")
+
+    def scan_once(self):
+        """扫描一次所有文件夹，把新增或变化且已稳定的图片放入上传队列"""
+        try:
+            folders = self.folders_provider()
+        except Exception as e:
+            self.log(f"Folder watcher cannot resolve folders: {e}", "error")
+            return
+
+        for folder_path in folders:
+            if self._stop_event.is_set():
+                return
+            if not os.path.isdir(folder_path):
+                continue
+            try:
+                self._scan_folder(folder_path)
+            except OSError as e:
+                # NAS短暂断开时跳过，下一轮再试
+                self.log(f"Folder watcher cannot read {folder_path}: {e}", "warning")
+
+    @staticmethod
+    def _file_signature(path: str) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _cdn_record(self, folder_path: str) -> dict:
+        """返回文件夹的cdn.json记录（含日志），文件未变化时使用缓存"""
+        journal = CdnJournal(folder_path)
+        signature = (self._file_signature(journal.json_path), self._file_signature(journal.journal_path))
+        cached = self._cdn_cache.get(folder_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        cdn_data = journal.load()
+        self._cdn_cache[folder_path] = (signature, cdn_data)
+        return cdn_data
+
+    def _scan_folder(self, folder_path: str):
+        cdn_data = self._cdn_record(folder_path)
+        for image_name in list_folder_images(folder_path):
+            file_path = os.path.join(folder_path, image_name)
+            stat = os.stat(file_path)
+            signature = (stat.st_mtime, stat.st_size)
+
+            with self._state_lock:
+                if file_path in self._queued or self._uploaded.get(file_path) == signature:
+                    continue
+                # 首次看到且cdn.json中已有链接：视为已上传的基线
+                if file_path not in self._uploaded and file_path not in self._candidates \
+                        and cdn_data.get(resolve_cdn_key(image_name, dict(cdn_data))):
+                    self._uploaded[file_path] = signature
+                    continue
+                if self._candidates.get(file_path) != signature:
+                    # 签名刚发生变化，等下一轮确认文件已写完
+                    self._candidates[file_path] = signature
+                    continue
+
+            try:
+                self._queue.put_nowait(file_path)
+            except queue.Full:
+                self.log(f"Upload queue is full, {image_name} will be retried next scan.", "warning")
+                return
+            with self._state_lock:
+                self._queued.add(file_path)
+                self._candidates.pop(file_path, None)
+
+    def _scan_loop(self):
+        while not self._stop_event.is_set():
+            self.scan_once()
+            self._stop_event.wait(self.scan_interval)
+
+    def _upload_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                file_path = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                self._upload_and_record(file_path)
+            finally:
+                with self._state_lock:
+                    self._queued.discard(file_path)
+                self._queue.task_done()
+
+    def _upload_and_record(self, file_path: str):
+        """上传单个文件并把链接写入所在文件夹的cdn.json"""
+        folder_path, image_name = os.path.split(file_path)
+        try:
+            stat = os.stat(file_path)
+            cdn_url = self.uploader.upload_file(file_path)
+        except Exception as e:
+            self.log(f"Watcher upload failed for {image_name}: {e}", "error")
+            return
+        if not cdn_url:
+            self.log(f"Watcher upload failed for {image_name}.", "error")
+            return
+
+        with folder_lock(folder_path):
+            journal = CdnJournal(folder_path)
+            cdn_data = journal.load()
+            key = resolve_cdn_key(image_name, cdn_data)
+            journal.append(key, cdn_url)
+            cdn_data[key] = cdn_url
+            journal.commit(cdn_data)
+
+        with self._state_lock:
+            self._uploaded[file_path] = (stat.st_mtime, stat.st_size)
+        self.log(f"Watcher uploaded {os.path.basename(folder_path)}/{image_name} -> {cdn_url}", "success")
+
@@ -0,0 +1,162 @@
+import os
+import logging
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+
+@dataclass
+class OptimizeOptions:
+    """
+    上传前图片优化选项。
+
+    recompress_png: 无损重新压缩PNG
+    convert_webp: 转换为WebP格式（文件名不变，仅扩展名改为.webp）
+    webp_lossless: WebP是否使用无损编码
+    webp_quality: 有损WebP/JPEG的质量
+    max_width/max_height: 最大尺寸，默认与占位图一致的1400×1000，超出时等比缩小
+    """
+    recompress_png: bool = True
+    convert_webp: bool = False
+    webp_lossless: bool = False
+    webp_quality: int = 90
+    max_width: int = 1400
+    max_height: int = 1000
+
+
+@dataclass
+class OptimizeResult:
+    """单张图片的优化结果"""
+    source_path: str
+    output_path: str
+    original_bytes: int
+    optimized_bytes: int
+    error: str | None = None
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.optimized_bytes
+
+
+def format_bytes(size: int) -> str:
+    """将字节数格式化为便于阅读的字符串"""
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def optimize_image(source_path: str, output_dir: str, options: OptimizeOptions) -> OptimizeResult:
+    """
+    优化单张图片并写入output_dir，原图保持不变。
+
+    必须是模块级函数，以便在ProcessPoolExecutor的子进程中被pickle调用。
+    如果优化后没有变小（且没有缩放），返回的output_path即为原图路径。
+    """
+    from PIL import Image
+
+    original_bytes = os.path.getsize(source_path)
+    try:
+        with Image.open(source_path) as img:
+            img.load()
+            source_format = img.format
+            resized = False
+
+            # 按最大尺寸等比缩小
+            if img.width > options.max_width or img.height > options.max_height:
+                img.thumbnail((options.max_width, options.max_height), Image.LANCZOS)
+                resized = True
+
+            stem = os.path.splitext(os.path.basename(source_path))[0]
+            os.makedirs(output_dir, exist_ok=True)
+
+            if options.convert_webp:
+                output_path = os.path.join(output_dir, f"{stem}.webp")
+                img.save(output_path, 'WEBP', lossless=options.webp_lossless, quality=options.webp_quality, method=6)
+            elif source_format == 'PNG':
+                if not (options.recompress_png or resized):
+                    return OptimizeResult(source_path, source_path, original_bytes, original_bytes)
+                output_path = os.path.join(output_dir, f"{stem}.png")
+                img.save(output_path, 'PNG', optimize=True)
+            elif source_format == 'JPEG':
+                output_path = os.path.join(output_dir, f"{stem}.jpg")
+                if resized:
+                    img.save(output_path, 'JPEG', quality=options.webp_quality, optimize=True)
+                else:
+                    img.save(output_path, 'JPEG', quality='keep', optimize=True)
+            else:
+                # 其他格式（例如原本就是WebP）仅在缩放时重新编码
+                if not resized:
+                    return OptimizeResult(source_path, source_path, original_bytes, original_bytes)
+                output_path = os.path.join(output_dir, os.path.basename(source_path))
+                img.save(output_path, source_format)
+
+        optimized_bytes = os.path.getsize(output_path)
+        # 没有缩放且没有变小时沿用原图
+        if not resized and optimized_bytes >= original_bytes:
+            os.remove(output_path)
+            return OptimizeResult(source_path, source_path, original_bytes, original_bytes)
+        return OptimizeResult(source_path, output_path, original_bytes, optimized_bytes)
+
+    except Exception as e:
+        return OptimizeResult(source_path, source_path, original_bytes, original_bytes, error=str(e))
+
+
+def optimize_images(
+    file_paths: list[str],
+    output_dir: str,
+    options: Optional[OptimizeOptions] = None,
+    max_workers: Optional[int] = None,
+    output_callback: Optional[Callable[[str, str], None]] = None
+) -> list[OptimizeResult]:
+    """
+    使用进程池并行优化多张图片，并汇报每张图片和总计节省的字节数。
+
+    图片编码是CPU密集型任务，使用进程而不是线程才能真正并行。
+    优化失败的图片会回退为原图，不影响后续上传。
+
+    返回:
+        list[OptimizeResult]: 与file_paths顺序一致的优化结果
+    """
+    def log_message(message, msg_type="info"):
+        if output_callback:
+            output_callback(message, msg_type)
+        else:
+            print(message)
+
+    if not file_paths:
+        return []
+    options = options or OptimizeOptions()
+    worker_count = max(1, min(max_workers or os.cpu_count() or 1, len(file_paths)))
+
+    try:
+        with ProcessPoolExecutor(max_workers=worker_count) as executor:
+            results = list(executor.map(
+                optimize_image,
+                file_paths,
+                [output_dir] * len(file_paths),
+                [options] * len(file_paths)
+            ))
+    except Exception as e:
+        # 某些打包环境下无法创建子进程，此时退化为串行处理
+        logging.warning(f"Process pool unavailable, optimizing images serially: {e}")
+        results = [optimize_image(path, output_dir, options) for path in file_paths]
+
+    for result in results:
+        name = os.path.basename(result.source_path)
+        if result.error:
+            log_message(f"Optimize failed for {name}, uploading original: {result.error}", "warning")
+        elif result.saved_bytes > 0:
+            percent = result.saved_bytes * 100 / result.original_bytes
+            log_message(f"Optimized {name}: {format_bytes(result.original_bytes)} -> "
+                        f"{format_bytes(result.optimized_bytes)} (-{percent:.0f}%)", "info")
+        else:
+            log_message(f"{name} is already optimal ({format_bytes(result.original_bytes)}).", "info")
+
+    total_original = sum(r.original_bytes for r in results)
+    total_saved = sum(r.saved_bytes for r in results)
+    if total_original:
+        log_message(f"Image optimization saved {format_bytes(total_saved)} of {format_bytes(total_original)} "
+                    f"({total_saved * 100 / total_original:.0f}%).", "success")
+    return results
@@ -0,0 +1,169 @@
+import time
+import threading
+import statistics
+from typing import Callable, Optional
+
+# 剪贴板是系统全局资源，回退到剪贴板读取时需要串行（多标签页并行时尤其重要）
+clipboard_lock = threading.Lock()
+
+# 拦截页面对剪贴板的写入，把"获取当前JSON"复制的内容留在页面变量里，不经过系统剪贴板
+_HOOK_COPY_JS = """
+if (!window.__wsaCopyHooked) {
+    window.__wsaCopyHooked = true;
+    const capture = (text) => { window.__wsaCopied = String(text); };
+    if (navigator.clipboard && navigator.clipboard.writeText) {
+        navigator.clipboard.writeText = (text) => { capture(text); return Promise.resolve(); };
+    }
+    const originalExec = document.execCommand.bind(document);
+    document.execCommand = function (command, ...args) {
+        if (String(command).toLowerCase() === 'copy') {
+            const active = document.activeElement;
+            let text = '';
+            if (active && typeof active.value === 'string' && active.selectionStart !== undefined) {
+                text = active.value.substring(active.selectionStart, active.selectionEnd);
+            }
+            capture(text || String(window.getSelection()));
+            return true;
+        }
+        return originalExec(command, ...args);
+    };
+}
+window.__wsaCopied = null;
+"""
+
+_READ_COPIED_JS = "return window.__wsaCopied;"
+
+# 直接设置输入框的值并触发 input/change 事件，让前端框架同步到数据模型
+_WRITE_VALUE_JS = """
+const text = arguments[0];
+let el = this;
+if (el.tagName !== 'TEXTAREA' && el.tagName !== 'INPUT') {
+    el = this.querySelector('textarea') || this;
+}
+let length;
+if (el.tagName === 'TEXTAREA' || el.tagName === 'INPUT') {
+    const proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, text);
+    length = el.value.length;
+} else {
+    el.textContent = text;
+    length = el.textContent.length;
+}
+el.dispatchEvent(new Event('input', {bubbles: true}));
+el.dispatchEvent(new Event('change', {bubbles: true}));
+return length;
+"""
+
+
+def _js_length(text: str) -> int:
+    """JS 字符串长度按 UTF-16 码元计算，emoji 等字符占两位"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+class JsonTransfer:
+    """
+    编辑器 JSON 的读写层。
+
+    默认通过 run_js 在页面内完成：读取时拦截"获取当前JSON"对剪贴板的写入，
+    写入时直接给输入框赋值并触发 input 事件，既不占用系统剪贴板，也不需要逐字输入大段 JSON。
+    JS 方式失败时自动回退到原来的 剪贴板 + 模拟输入 方式；use_js=False 时直接使用剪贴板方式，用于对比评测。
+    每次读写都会记录耗时，可通过 summary() 对比两种方式。
+    """
+
+    def __init__(self, use_js: bool = True, read_timeout: float = 5, log_func: Optional[Callable[[str], None]] = None):
+        self.use_js = use_js
+        self.read_timeout = read_timeout
+        self.log_func = log_func or print
+        self._stats_lock = threading.Lock()
+        self._timings: dict[str, list[float]] = {}
+
+    def _record(self, path: str, seconds: float, size: int):
+        with self._stats_lock:
+            self._timings.setdefault(path, []).append(seconds)
+        self.log_func(f"   ⏱️ {path}: {size / 1024:.0f} KB, {seconds * 1000:.0f} ms")
+
+    def read_json(self, editor_tab, get_json_button) -> str:
+        """点击"获取当前JSON"并返回编辑器中的 JSON 字符串"""
+        if self.use_js:
+            start = time.perf_counter()
+            try:
+                editor_tab.run_js(_HOOK_COPY_JS)
+                get_json_button.click(by_js=True)
+                deadline = start + self.read_timeout
+                while time.perf_counter() < deadline:
+                    copied = editor_tab.run_js(_READ_COPIED_JS)
+                    if copied:
+                        self._record("js_read", time.perf_counter() - start, len(copied))
+                        return copied
+                    time.sleep(0.05)
+                self.log_func("   ⚠️ 页面内读取JSON超时，回退到剪贴板")
+            except Exception as e:
+                self.log_func(f"   ⚠️ 页面内读取JSON失败，回退到剪贴板: {e}")
+
+        import pyperclip
+        start = time.perf_counter()
+        with clipboard_lock:
+            editor_tab.set.activate()
+            get_json_button.click()
+            time.sleep(1)  # 等待复制完成
+            json_str = pyperclip.paste()
+        self._record("clipboard_read", time.perf_counter() - start, len(json_str or ""))
+        return json_str
+
+    def write_json(self, json_input, text: str):
+        """把 JSON 字符串写入编辑器的输入框"""
+        if self.use_js:
+            start = time.perf_counter()
+            try:
+                written = json_input.run_js(_WRITE_VALUE_JS, text)
+                if written == _js_length(text):
+                    self._record("js_write", time.perf_counter() - start, len(text))
+                    return
+                self.log_func(f"   ⚠️ 页面内写入长度不一致 ({written}/{_js_length(text)})，回退到模拟输入")
+            except Exception as e:
+                self.log_func(f"   ⚠️ 页面内写入JSON失败，回退到模拟输入: {e}")
+
+        start = time.perf_counter()
+        json_input.click()
+        json_input.clear()
+        json_input.input(text)
+        self._record("typed_write", time.perf_counter() - start, len(text))
+
+    def stats(self) -> dict:
+        """返回各读写方式的耗时统计 {方式: {n, avg_ms, p50_ms, max_ms}}，没有样本的方式 n 为 0"""
+        with self._stats_lock:
+            timings = {path: list(values) for path, values in self._timings.items()}
+        result = {}
+        for path in ("js_read", "clipboard_read", "js_write", "typed_write"):
+            values = timings.get(path)
+            if not values:
+                result[path] = {"n": 0}
+                continue
+            result[path] = {
+                "n": len(values),
+                "avg_ms": round(statistics.mean(values) * 1000, 1),
+                "p50_ms": round(statistics.median(values) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1),
+            }
+        return result
+
+    def summary(self) -> str:
+        """返回两种方式的读写耗时统计；某种方式没有样本时注明，便于确认对比是否完整"""
+        stats = self.stats()
+        if not any(entry["n"] for entry in stats.values()):
+            return "JSON transfer: no transfers recorded"
+        mode = "js (clipboard fallback)" if self.use_js else "clipboard (forced)"
+        lines = [f"JSON transfer timings, mode: {mode}"]
+        for path, entry in stats.items():
+            if not entry["n"]:
+                lines.append(f"  {path}: n=0")
+                continue
+            lines.append(
+                f"  {path}: n={entry['n']}, avg={entry['avg_ms']:.0f} ms, "
+                f"p50={entry['p50_ms']:.0f} ms, max={entry['max_ms']:.0f} ms"
+            )
+        for js_path, legacy_path in (("js_read", "clipboard_read"), ("js_write", "typed_write")):
+            js, legacy = stats[js_path], stats[legacy_path]
+            if js["n"] and legacy["n"] and js["avg_ms"]:
+                lines.append(f"  {legacy_path} / {js_path}: {legacy['avg_ms'] / js['avg_ms']:.1f}x")
+        return "\n".join(lines)
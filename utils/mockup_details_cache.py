@@ -0,0 +1,197 @@
+import time
+import sqlite3
+import argparse
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from utils.resource_manager import resource_manager
+
+# 成功结果的默认有效期：7 天
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+# 404 的默认有效期：1 天，拼写错误修正后或新样机上线后能较快重新获取
+DEFAULT_NEGATIVE_TTL_SECONDS = 24 * 3600
+
+STATUS_OK = "ok"
+STATUS_NOT_FOUND = "not_found"
+
+
+@dataclass
+class CachedDetails:
+    """缓存的样机详情；status 为 not_found 时 name/image 为空"""
+    kind: str
+    model_id: str
+    source_key: str
+    status: str
+    name: str
+    image: str
+    fetched_at: float
+
+
+class MockupDetailsCache:
+    """
+    跨页面共享的样机详情持久化缓存（SQLite，保存在用户数据目录的 cache 下）
+
+    以 (查询参数类型, 模型ID) 为键，类型为 nameKey（刀模图）或 mockupNameKey（样机），
+    同一个热门样机出现在多个页面时只请求一次接口。
+    成功结果在 ttl 秒内有效，接口返回 404 的模型作为负缓存在 negative_ttl 秒内有效，
+    空数据、网络超时和服务器错误不缓存。
+    """
+
+    def __init__(self, db_path: str | Path | None = None, ttl: float = DEFAULT_TTL_SECONDS,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL_SECONDS):
+        if db_path is None:
+            db_path = resource_manager.user_data_path / 'cache' / 'mockup_details.db'
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS mockup_details (
+                kind TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                source_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                name TEXT NOT NULL DEFAULT '',
+                image TEXT NOT NULL DEFAULT '',
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (kind, model_id)
+            )"""
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def _is_fresh(self, entry: CachedDetails, now: float) -> bool:
+        ttl = self.ttl if entry.status == STATUS_OK else self.negative_ttl
+        return now - entry.fetched_at < ttl
+
+    def get(self, kind: str, model_id: str, allow_stale: bool = False) -> Optional[CachedDetails]:
+        """返回未过期的缓存项，没有或已过期时返回 None；allow_stale 时也返回已过期的项（接口不可用时使用）"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, model_id, source_key, status, name, image, fetched_at "
+                "FROM mockup_details WHERE kind = ? AND model_id = ?", (kind, model_id)
+            ).fetchone()
+            entry = CachedDetails(*row) if row else None
+            if entry is not None and (allow_stale or self._is_fresh(entry, time.time())):
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def _put(self, kind: str, model_id: str, source_key: str, status: str, name: str = "", image: str = ""):
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO mockup_details (kind, model_id, source_key, status, name, image, fetched_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (kind, model_id) DO UPDATE SET
+                       source_key = excluded.source_key, status = excluded.status, name = excluded.name,
+                       image = excluded.image, fetched_at = excluded.fetched_at""",
+                (kind, model_id, source_key, status, name, image, time.time())
+            )
+            self._conn.commit()
+
+    def put(self, kind: str, model_id: str, source_key: str, name: str, image: str):
+        """记录成功获取的详情"""
+        self._put(kind, model_id, source_key, STATUS_OK, name, image)
+
+    def put_not_found(self, kind: str, model_id: str, source_key: str):
+        """记录接口返回 404 的模型（负缓存）"""
+        self._put(kind, model_id, source_key, STATUS_NOT_FOUND)
+
+    def entries(self, expired_only: bool = False) -> List[CachedDetails]:
+        """返回所有缓存项（或仅已过期的项），用于批量刷新"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, model_id, source_key, status, name, image, fetched_at FROM mockup_details"
+            ).fetchall()
+        entries = [CachedDetails(*row) for row in rows]
+        if expired_only:
+            now = time.time()
+            entries = [entry for entry in entries if not self._is_fresh(entry, now)]
+        return entries
+
+    def purge_expired(self) -> int:
+        """删除已过期的缓存项，返回删除数量"""
+        expired = self.entries(expired_only=True)
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM mockup_details WHERE kind = ? AND model_id = ?",
+                [(entry.kind, entry.model_id) for entry in expired]
+            )
+            self._conn.commit()
+        return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM mockup_details")
+            self._conn.commit()
+
+    def summary(self) -> str:
+        with self._lock:
+            ok, not_found = self._conn.execute(
+                "SELECT COALESCE(SUM(status = ?), 0), COALESCE(SUM(status = ?), 0) FROM mockup_details",
+                (STATUS_OK, STATUS_NOT_FOUND)
+            ).fetchone()
+            return (f"Mockup details cache: {ok} models, {not_found} not found, "
+                    f"{self.hits} hits / {self.misses} misses this session")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_shared_cache: Optional[MockupDetailsCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_details_cache() -> MockupDetailsCache:
+    """进程内共享的样机详情缓存"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = MockupDetailsCache()
+        return _shared_cache
+
+
+def configure_details_cache(db_path: str | Path | None = None, ttl: float = DEFAULT_TTL_SECONDS,
+                            negative_ttl: float = DEFAULT_NEGATIVE_TTL_SECONDS) -> MockupDetailsCache:
+    """替换共享缓存的位置或有效期"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is not None:
+            _shared_cache.close()
+        _shared_cache = MockupDetailsCache(db_path, ttl, negative_ttl)
+        return _shared_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description='样机详情缓存维护')
+    parser.add_argument('--db', default=None, help='缓存数据库路径（默认在用户数据目录）')
+    parser.add_argument('--ttl-days', type=float, default=DEFAULT_TTL_SECONDS / 86400, help='成功结果的有效期（天）')
+    parser.add_argument('--refresh', action='store_true', help='重新获取缓存中的所有模型')
+    parser.add_argument('--expired-only', action='store_true', help='与 --refresh 一起使用，只刷新已过期的模型')
+    parser.add_argument('--purge-expired', action='store_true', help='删除已过期的缓存项')
+    parser.add_argument('--clear', action='store_true', help='清空缓存')
+    args = parser.parse_args()
+
+    cache = configure_details_cache(args.db, ttl=args.ttl_days * 86400)
+    if args.clear:
+        cache.clear()
+    if args.purge_expired:
+        print(f"已删除 {cache.purge_expired()} 个过期项")
+    if args.refresh:
+        from utils.fetch_mockup_details import refresh_cached_details
+        refreshed = refresh_cached_details(expired_only=args.expired_only)
+        print(f"已刷新 {refreshed} 个模型")
+    print(cache.summary())
+
+
+if __name__ == "__main__":
+    # 用法（在项目根目录运行）: python -m utils.mockup_details_cache --refresh
+    main()
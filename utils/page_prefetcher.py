@@ -0,0 +1,72 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class PagePrefetcher:
+    """
+    页面生成依赖的推测式预取
+
+    解析剪贴板后立即在后台开始准备生成时需要的数据（样机详情、模板等），每项数据以名称区分，
+    并带有一个由输入决定的签名。生成时用当前输入的签名取数据：签名一致则直接使用预取结果
+    （尚未完成时等待），不一致或已失效则在调用线程中现场计算，因此预取只影响速度，不影响结果。
+    输入变化时调用 invalidate 丢弃相关项；尚未开始的任务会被取消，正在运行的任务结果会被丢弃。
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="page-prefetch")
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, Tuple[Hashable, Future]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def prefetch(self, name: str, signature: Hashable, fn: Callable[[], Any]) -> Future:
+        """
+        在后台开始计算一项数据；同名同签名的任务已存在时直接复用，签名不同时取消旧任务
+        """
+        with self._lock:
+            current = self._tasks.get(name)
+            if current is not None:
+                if current[0] == signature and not current[1].cancelled():
+                    return current[1]
+                current[1].cancel()
+            future = self._executor.submit(fn)
+            self._tasks[name] = (signature, future)
+            return future
+
+    def get(self, name: str, signature: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        取一项数据：有签名一致的预取任务时使用其结果，否则（或预取失败时）现场调用 fn 计算
+        """
+        with self._lock:
+            current = self._tasks.get(name)
+        if current is not None and current[0] == signature and not current[1].cancelled():
+            try:
+                value = current[1].result()
+                with self._lock:
+                    self.hits += 1
+                return value
+            except Exception:
+                # 预取失败（例如网络抖动）时丢弃该项并重新计算，错误由现场计算抛出
+                self.invalidate(name)
+        with self._lock:
+            self.misses += 1
+        return fn()
+
+    def invalidate(self, *names: str):
+        """丢弃指定的预取项（不指定时丢弃全部）"""
+        with self._lock:
+            for name in (names or list(self._tasks)):
+                current = self._tasks.pop(name, None)
+                if current is not None:
+                    current[1].cancel()
+
+    def pending(self, name: str) -> Optional[Hashable]:
+        """返回某项当前预取的签名，没有时返回 None"""
+        with self._lock:
+            current = self._tasks.get(name)
+            return current[0] if current else None
+
+    def shutdown(self):
+        self.invalidate()
+        self._executor.shutdown(wait=False, cancel_futures=True)
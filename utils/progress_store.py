@@ -0,0 +1,243 @@
+import time
+import pickle
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable, Optional
+
+# 进度状态
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+# 搜索结果不唯一，暂存等待人工复核
+STATUS_DEFERRED = "deferred"
+
+# 与 pickle 断点文件放在同一个 cache 目录下
+PROGRESS_DB_NAME = "progress.db"
+
+
+class CheckpointBackend(ABC):
+    """
+    机器人断点进度存储接口
+    每个目标单独记录状态、尝试次数、耗时和最后一次错误
+    """
+
+    @abstractmethod
+    def completed(self) -> set[str]:
+        """返回已成功处理的目标集合"""
+        pass
+
+    @abstractmethod
+    def mark(self, target: str, status: str, duration: Optional[float] = None, error: Optional[str] = None):
+        """记录一次处理结果"""
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """清空当前任务的进度"""
+        pass
+
+    def remaining(self, all_targets: Iterable[str]) -> list[str]:
+        """按原顺序返回尚未成功的目标"""
+        done = self.completed()
+        return [t for t in all_targets if t not in done]
+
+    def close(self):
+        pass
+
+
+class PickleCheckpointBackend(CheckpointBackend):
+    """
+    兼容旧版的 pickle 断点：只保存已完成目标的列表，每次成功都整体重写文件
+    """
+
+    def __init__(self, checkpoint_file: str):
+        self.checkpoint_file = Path(checkpoint_file)
+        self._lock = threading.Lock()
+        self._completed: list[str] = []
+        if self.checkpoint_file.exists():
+            try:
+                with open(self.checkpoint_file, 'rb') as f:
+                    self._completed = list(pickle.load(f))
+            except Exception as e:
+                logging.warning(f"Failed to load checkpoint {self.checkpoint_file}: {e}")
+        self._completed_set = set(self._completed)
+
+    def completed(self) -> set[str]:
+        with self._lock:
+            return set(self._completed_set)
+
+    def mark(self, target: str, status: str, duration: Optional[float] = None, error: Optional[str] = None):
+        if status != STATUS_SUCCESS:
+            return
+        with self._lock:
+            if target in self._completed_set:
+                return
+            self._completed.append(target)
+            self._completed_set.add(target)
+            self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.checkpoint_file, 'wb') as f:
+                pickle.dump(self._completed, f)
+
+    def clear(self):
+        with self._lock:
+            self._completed, self._completed_set = [], set()
+            self.checkpoint_file.unlink(missing_ok=True)
+
+
+class SqliteCheckpointBackend(CheckpointBackend):
+    """
+    基于 SQLite（WAL 模式）的断点进度存储
+
+    - 每个目标一行，保存结果只是一次 upsert，与已完成数量无关；
+    - 多个任务（job）共用同一个数据库文件，以断点文件名区分；
+    - 按 (job, status) 建立索引，查询已完成/失败目标不需要扫描整张表；
+    - 首次打开某个任务时自动迁移同名的旧 pickle 断点；原文件保留不动，迁移记录在 migrations 表中。
+    """
+
+    def __init__(self, db_path: str | Path, job: str, legacy_pickle: str | Path | None = None):
+        self.db_path = Path(db_path)
+        self.job = job
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # 多个标签页线程共用一个连接，由 _lock 保证串行
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS progress (
+                job TEXT NOT NULL,
+                target TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                duration REAL,
+                last_error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (job, target)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_progress_job_status ON progress (job, status)")
+        # 已导入的旧断点文件，按文件的 mtime/大小判断是否已迁移过
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS migrations (
+                job TEXT NOT NULL,
+                source TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                migrated_at REAL NOT NULL,
+                PRIMARY KEY (job, source)
+            )"""
+        )
+        self._conn.commit()
+        if legacy_pickle is not None:
+            self.migrate_from_pickle(legacy_pickle)
+
+    @classmethod
+    def for_checkpoint(cls, checkpoint_file: str | Path) -> "SqliteCheckpointBackend":
+        """根据旧的断点文件路径创建存储：数据库放在同一目录，任务名取文件名"""
+        checkpoint_file = Path(checkpoint_file)
+        return cls(checkpoint_file.parent / PROGRESS_DB_NAME, checkpoint_file.stem, legacy_pickle=checkpoint_file)
+
+    def migrate_from_pickle(self, pickle_path: str | Path) -> int:
+        """
+        把旧版 pickle 断点中的已完成目标导入数据库
+
+        原文件保留不动（仓库中跟踪了这些文件，改名会弄脏工作区），导入记录写入 migrations 表；
+        同一文件只导入一次，文件内容变化（mtime 或大小不同）后才会再次导入。
+
+        返回:
+            int: 导入的目标数
+        """
+        pickle_path = Path(pickle_path)
+        if not pickle_path.exists():
+            return 0
+        stat = pickle_path.stat()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, size FROM migrations WHERE job = ? AND source = ?", (self.job, pickle_path.name)
+            ).fetchone()
+        if row == (stat.st_mtime_ns, stat.st_size):
+            return 0
+        try:
+            with open(pickle_path, 'rb') as f:
+                targets = list(pickle.load(f))
+        except Exception as e:
+            logging.warning(f"Cannot migrate checkpoint {pickle_path}: {e}")
+            return 0
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                """INSERT INTO progress (job, target, status, attempts, updated_at) VALUES (?, ?, ?, 1, ?)
+                   ON CONFLICT (job, target) DO UPDATE SET status = excluded.status""",
+                [(self.job, target, STATUS_SUCCESS, now) for target in targets]
+            )
+            self._conn.execute(
+                """INSERT OR REPLACE INTO migrations (job, source, mtime_ns, size, count, migrated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (self.job, pickle_path.name, stat.st_mtime_ns, stat.st_size, len(targets), now)
+            )
+            self._conn.commit()
+        logging.info(f"Migrated {len(targets)} completed targets from {pickle_path} into {self.db_path}")
+        return len(targets)
+
+    def completed(self) -> set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT target FROM progress WHERE job = ? AND status = ?", (self.job, STATUS_SUCCESS)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def failed(self) -> list[tuple[str, int, Optional[str]]]:
+        """返回失败目标及其尝试次数和最后一次错误"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT target, attempts, last_error FROM progress WHERE job = ? AND status = ? ORDER BY updated_at",
+                (self.job, STATUS_FAILED)
+            ).fetchall()
+
+    def mark(self, target: str, status: str, duration: Optional[float] = None, error: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO progress (job, target, status, attempts, duration, last_error, updated_at)
+                   VALUES (?, ?, ?, 1, ?, ?, ?)
+                   ON CONFLICT (job, target) DO UPDATE SET
+                       status = excluded.status,
+                       attempts = progress.attempts + 1,
+                       duration = excluded.duration,
+                       last_error = excluded.last_error,
+                       updated_at = excluded.updated_at""",
+                (self.job, target, status, duration, error, time.time())
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM progress WHERE job = ?", (self.job,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def clear_all_progress(cache_dir: str | Path) -> int:
+    """
+    清空 cache 目录下进度数据库中所有任务的进度
+
+    返回:
+        int: 删除的记录数
+    """
+    db_path = Path(cache_dir) / PROGRESS_DB_NAME
+    if not db_path.exists():
+        return 0
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        deleted = conn.execute("DELETE FROM progress").rowcount
+        conn.commit()
+        return deleted
+    finally:
+        conn.close()
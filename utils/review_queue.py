@@ -0,0 +1,86 @@
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class ParkedTarget:
+    """等待人工复核的目标及其搜索结果快照"""
+    target: str
+    message: str
+    snapshot: List[str] = field(default_factory=list)
+    parked_at: float = field(default_factory=time.time)
+
+
+class ReviewQueue:
+    """
+    搜索结果不唯一的目标的复核队列。
+
+    机器人遇到多个搜索结果时不再阻塞等待确认，而是把目标连同搜索结果快照放入队列，继续处理其他目标；
+    操作员可以在运行过程中或运行结束时一次性复核所有暂存的目标，
+    机器人会在取下一个目标前取走已确认的目标重新处理，被拒绝的目标记为跳过。
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._parked: Dict[str, ParkedTarget] = {}
+        # 已复核但尚未被机器人取走的决定：目标 -> 是否继续处理
+        self._decisions: Dict[str, bool] = {}
+        # 队列变化时的回调（例如刷新 GUI 上的复核按钮），在机器人线程中调用
+        self.on_change: Optional[Callable[[int], None]] = None
+
+    @property
+    def has_reviewer(self) -> bool:
+        """是否有外部复核界面；没有时机器人在结束前逐个请求确认"""
+        return self.on_change is not None
+
+    def _notify(self):
+        self._cond.notify_all()
+        if self.on_change:
+            count = len(self._parked)
+            try:
+                self.on_change(count)
+            except Exception:
+                pass
+
+    def park(self, target: str, message: str, snapshot: Optional[List[str]] = None):
+        """暂存目标等待复核"""
+        with self._cond:
+            self._parked[target] = ParkedTarget(target, message, list(snapshot or []))
+            self._notify()
+
+    def pending(self) -> List[ParkedTarget]:
+        """按暂存顺序返回尚未复核的目标"""
+        with self._cond:
+            return sorted(self._parked.values(), key=lambda p: p.parked_at)
+
+    @property
+    def unresolved_count(self) -> int:
+        with self._cond:
+            return len(self._parked)
+
+    def resolve(self, target: str, approved: bool):
+        self.resolve_many({target: approved})
+
+    def resolve_many(self, decisions: Dict[str, bool]):
+        """一次提交多个复核结果，True 表示继续处理，False 表示跳过"""
+        with self._cond:
+            for target, approved in decisions.items():
+                if self._parked.pop(target, None) is not None:
+                    self._decisions[target] = approved
+            self._notify()
+
+    def take_resolved(self) -> Tuple[List[str], List[str]]:
+        """取走已复核的目标，返回 (继续处理, 跳过) 两个列表"""
+        with self._cond:
+            decisions, self._decisions = self._decisions, {}
+        approved = [t for t, ok in decisions.items() if ok]
+        rejected = [t for t, ok in decisions.items() if not ok]
+        return approved, rejected
+
+    def wait_for_decisions(self, timeout: Optional[float] = None) -> bool:
+        """阻塞直到有新的复核结果或没有待复核目标，返回是否有可取走的结果"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._decisions or not self._parked, timeout)
+            return bool(self._decisions)
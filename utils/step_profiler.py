@@ -0,0 +1,182 @@
+import csv
+import json
+import math
+import os
+import time
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+# 每个处理线程当前使用的分析器和目标（多标签页并行时互不干扰）
+_current = threading.local()
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """最近秩法计算百分位数，sorted_values 需已排序"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@contextmanager
+def span(step: str):
+    """
+    记录一个步骤的耗时，记到当前线程绑定的分析器和目标上。
+    当前线程没有绑定分析器时不做任何事，策略可以无条件使用。
+    """
+    profiler = getattr(_current, 'profiler', None)
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        profiler.record(step, time.perf_counter() - start, ok=ok)
+
+
+class StepProfiler:
+    """
+    机器人运行的分步计时。
+
+    各策略通过 span() 标记登录、导航、搜索、打开编辑器、读取JSON、更新、输入、保存、等待跳转等步骤，
+    运行结束后按步骤汇总 p50/p95/max，并按目标汇总各步骤耗时，输出 JSON 和 CSV 报告。
+    """
+
+    def __init__(self, job: str = "bot"):
+        self.job = job
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        # (目标, 步骤, 耗时, 是否正常结束)
+        self._spans: list[tuple[str, str, float, bool]] = []
+        # 目标 -> 总耗时
+        self._targets: dict[str, float] = {}
+
+    def activate(self, target: str = ""):
+        """把当前线程绑定到此分析器，后续 span() 记到 target 上"""
+        _current.profiler = self
+        _current.target = target
+
+    def deactivate(self):
+        _current.profiler = None
+        _current.target = None
+
+    def end_target(self, target: str, duration: float):
+        """记录目标的总耗时，并把线程恢复为不属于任何目标"""
+        with self._lock:
+            self._targets[target] = self._targets.get(target, 0.0) + duration
+        _current.target = ""
+
+    def record(self, step: str, seconds: float, ok: bool = True, target: Optional[str] = None):
+        if target is None:
+            target = getattr(_current, 'target', None) or ""
+        with self._lock:
+            self._spans.append((target, step, seconds, ok))
+
+    @property
+    def target_count(self) -> int:
+        with self._lock:
+            return len(self._targets)
+
+    def step_stats(self) -> dict[str, dict[str, float]]:
+        """按步骤汇总：次数、总耗时、p50、p95、最大值、失败次数"""
+        with self._lock:
+            spans = list(self._spans)
+        grouped: dict[str, list[float]] = {}
+        failures: dict[str, int] = {}
+        for _, step, seconds, ok in spans:
+            grouped.setdefault(step, []).append(seconds)
+            if not ok:
+                failures[step] = failures.get(step, 0) + 1
+        stats = {}
+        for step, values in grouped.items():
+            values.sort()
+            stats[step] = {
+                "count": len(values),
+                "total": sum(values),
+                "p50": _percentile(values, 50),
+                "p95": _percentile(values, 95),
+                "max": values[-1],
+                "errors": failures.get(step, 0),
+            }
+        return stats
+
+    def target_breakdown(self) -> dict[str, dict[str, float]]:
+        """按目标汇总：总耗时和各步骤耗时"""
+        with self._lock:
+            spans = list(self._spans)
+            targets = dict(self._targets)
+        breakdown = {target: {"total": duration, "steps": {}} for target, duration in targets.items()}
+        for target, step, seconds, _ in spans:
+            if target not in breakdown:
+                continue
+            steps = breakdown[target]["steps"]
+            steps[step] = steps.get(step, 0.0) + seconds
+        return breakdown
+
+    def estimate(self, remaining: int) -> str:
+        """根据已处理目标的平均耗时估算剩余用时，并指出最慢的步骤"""
+        with self._lock:
+            durations = list(self._targets.values())
+        if not durations:
+            return ""
+        average = sum(durations) / len(durations)
+        message = f"平均每个目标 {average:.1f}s，剩余 {remaining} 个预计还需 {average * remaining / 60:.1f} 分钟"
+        stats = self.step_stats()
+        if stats:
+            slowest = max(stats.items(), key=lambda item: item[1]["p50"])
+            message += f"；最慢步骤 {slowest[0]} p50={slowest[1]['p50']:.1f}s"
+        return message
+
+    def summary(self) -> str:
+        stats = self.step_stats()
+        if not stats:
+            return "Step timings: no steps recorded"
+        lines = [f"Step timings ({self.target_count} targets):"]
+        for step, s in sorted(stats.items(), key=lambda item: item[1]["total"], reverse=True):
+            line = (f"  {step}: n={s['count']}, total={s['total']:.1f}s, p50={s['p50']:.2f}s, "
+                    f"p95={s['p95']:.2f}s, max={s['max']:.2f}s")
+            if s["errors"]:
+                line += f", errors={s['errors']}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def write_report(self, directory: str | Path) -> tuple[Path, Path]:
+        """
+        把报告写入 directory，文件名包含任务名和开始时间
+
+        返回:
+            tuple[Path, Path]: JSON 报告和 CSV 明细的路径
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"run_report_{self.job}_{time.strftime('%Y%m%d_%H%M%S', time.localtime(self.started_at))}"
+        if (directory / f"{stem}.json").exists():
+            # 多个分片进程可能在同一秒开始
+            stem += f"_{os.getpid()}"
+        json_path = directory / f"{stem}.json"
+        csv_path = directory / f"{stem}.csv"
+
+        report = {
+            "job": self.job,
+            "started_at": self.started_at,
+            "duration": time.time() - self.started_at,
+            "targets": self.target_count,
+            "steps": self.step_stats(),
+            "per_target": self.target_breakdown(),
+        }
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        with self._lock:
+            spans = list(self._spans)
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["target", "step", "seconds", "ok"])
+            for target, step, seconds, ok in spans:
+                writer.writerow([target, step, f"{seconds:.4f}", int(ok)])
+        return json_path, csv_path
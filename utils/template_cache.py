@@ -0,0 +1,167 @@
+import os
+import time
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from utils.template_engine import CompiledTemplate, StructuralTemplate
+
+# 两次检查同一文件 mtime/size 的最小间隔（秒），间隔内的重复生成完全不访问磁盘
+DEFAULT_RECHECK_INTERVAL = 2.0
+
+
+@dataclass
+class _Entry:
+    text: str
+    mtime_ns: int
+    size: int
+    checked_at: float
+    compiled: Optional[CompiledTemplate] = None
+    structural: Optional[StructuralTemplate] = None
+
+
+class TemplateCache:
+    """
+    进程内共享的模板缓存
+
+    模板第一次使用时读取（懒加载），之后直接返回内存中的文本和编译结果；
+    文件的 mtime 或大小变化时自动重新读取，因此在用户目录中修改模板后无需重启程序。
+    为避免每次生成都访问 NAS/AppData，recheck_interval 秒内不重复检查文件状态。
+    """
+
+    def __init__(self, recheck_interval: float = DEFAULT_RECHECK_INTERVAL):
+        self.recheck_interval = recheck_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        # 每个文件一把加载锁，后台预加载和按钮点击同时请求时只读取一次
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.loads = 0
+
+    @staticmethod
+    def _key(path: str | Path) -> str:
+        return str(Path(path).resolve())
+
+    def _load_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(key, threading.Lock())
+
+    def _fresh_entry(self, key: str) -> Optional[_Entry]:
+        """返回仍然有效的缓存项；文件已变化或不存在时返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if now - entry.checked_at < self.recheck_interval:
+            return entry
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return None
+        if stat.st_mtime_ns != entry.mtime_ns or stat.st_size != entry.size:
+            return None
+        entry.checked_at = now
+        return entry
+
+    def _entry(self, path: str | Path) -> _Entry:
+        key = self._key(path)
+        entry = self._fresh_entry(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        with self._load_lock(key):
+            # 等锁期间可能已被其他线程加载
+            entry = self._fresh_entry(key)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            stat = os.stat(key)
+            with open(key, 'r', encoding='utf-8') as f:
+                text = f.read()
+            entry = _Entry(text, stat.st_mtime_ns, stat.st_size, time.monotonic())
+            with self._lock:
+                self._entries[key] = entry
+            self.loads += 1
+            return entry
+
+    def get_text(self, path: str | Path) -> str:
+        """返回模板文本"""
+        return self._entry(path).text
+
+    def get_compiled(self, path: str | Path) -> CompiledTemplate:
+        """返回编译后的模板，编译结果与文本一起缓存，文件变化时一并失效"""
+        entry = self._entry(path)
+        if entry.compiled is None:
+            with self._load_lock(self._key(path)):
+                if entry.compiled is None:
+                    entry.compiled = CompiledTemplate(entry.text, name=Path(path).name)
+        return entry.compiled
+
+    def get_structural(self, path: str | Path) -> StructuralTemplate:
+        """返回结构化模板（需要填充后的对象树而不是文本时使用）"""
+        entry = self._entry(path)
+        if entry.structural is None:
+            with self._load_lock(self._key(path)):
+                if entry.structural is None:
+                    entry.structural = StructuralTemplate(entry.text, name=Path(path).name)
+        return entry.structural
+
+    def invalidate(self, path: str | Path | None = None):
+        """丢弃指定模板（或全部模板）的缓存"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(path), None)
+
+    def preload(self, paths: Iterable[str | Path], compile: bool = True,
+                logger: Optional[Callable[[str, str], None]] = None) -> threading.Thread:
+        """
+        在后台线程中预先读取（并编译）模板，启动时调用，第一次生成也不需要等待磁盘
+
+        返回:
+            threading.Thread: 预加载线程（守护线程）
+        """
+        paths = list(paths)
+
+        def worker():
+            start = time.perf_counter()
+            loaded = 0
+            for path in paths:
+                try:
+                    if compile:
+                        self.get_compiled(path)
+                    else:
+                        self.get_text(path)
+                    loaded += 1
+                except Exception as e:
+                    if logger:
+                        logger(f"预加载模板失败 {Path(path).name}: {e}", "warning")
+            if logger:
+                logger(f"已预加载 {loaded} 个模板，用时 {time.perf_counter() - start:.2f}s", "info")
+
+        thread = threading.Thread(target=worker, daemon=True, name="template-preload")
+        thread.start()
+        return thread
+
+
+# 全局实例
+template_cache = TemplateCache()
+
+
+def get_template_text(path: str | Path) -> str:
+    """读取模板文本（经过缓存）"""
+    return template_cache.get_text(path)
+
+
+def get_compiled_template(path: str | Path) -> CompiledTemplate:
+    """读取并编译模板（经过缓存）"""
+    return template_cache.get_compiled(path)
+
+
+def preload_templates(template_dir: str | Path, compile: bool = True,
+                      logger: Optional[Callable[[str, str], None]] = None) -> threading.Thread:
+    """后台预加载目录下的所有 JSON 模板"""
+    return template_cache.preload(sorted(Path(template_dir).glob("*.json")), compile=compile, logger=logger)
@@ -0,0 +1,275 @@
+import gc
+import re
+import sys
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+# 模板中的占位符：{{key}}
+PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+
+@dataclass
+class RenderResult:
+    """渲染结果及占位符检查信息"""
+    text: str
+    # 模板中存在但没有提供值的占位符（保留 {{key}} 原样）
+    missing: List[str] = field(default_factory=list)
+    # 提供了值但模板中不存在的键（通常是拼写错误或模板已改版）
+    unknown: List[str] = field(default_factory=list)
+
+
+def _split(source: str):
+    """把文本切分为 文字段 和 占位符段，literals 比 slots 多一个"""
+    literals, slots = [], []
+    last = 0
+    for match in PLACEHOLDER_PATTERN.finditer(source):
+        literals.append(source[last:match.start()])
+        slots.append(match.group(1))
+        last = match.end()
+    literals.append(source[last:])
+    return literals, slots
+
+
+def _escape_legacy(value) -> str:
+    """与原先逐键替换相同的转义：字符串按 JSON 字符串内容转义，其余类型直接 str()"""
+    if isinstance(value, str):
+        return json.dumps(value)[1:-1]
+    return str(value)
+
+
+def _escape_formatted(value) -> str:
+    """按 json.dumps(ensure_ascii=False) 的方式转义，用于预格式化模板"""
+    if not isinstance(value, str):
+        value = str(value)
+    return json.dumps(value, ensure_ascii=False)[1:-1]
+
+
+class CompiledTemplate:
+    """
+    编译后的 JSON 模板
+
+    模板只在编译时扫描一次，切分为文字段和占位符段，渲染时一次拼接完成，
+    不再对整个模板按键逐个 str.replace。
+    模板本身是合法 JSON 时（占位符都在字符串内），编译时预先格式化为 indent=2 的文本，
+    渲染后不需要再 json.loads / json.dumps 一遍，结果与原先的 替换→解析→格式化 完全一致。
+    """
+
+    def __init__(self, source: str, name: str = ""):
+        self.name = name
+        self._literals, self._slots = _split(source)
+        # 按出现顺序去重的占位符
+        self.placeholders = list(dict.fromkeys(self._slots))
+
+        self._formatted = None
+        try:
+            formatted = json.dumps(json.loads(source), indent=2, ensure_ascii=False)
+        except ValueError:
+            formatted = None
+        if formatted is not None:
+            literals, slots = _split(formatted)
+            # 格式化不应改变占位符；万一改变（例如占位符出现在重复的键里被覆盖），退回先渲染后解析
+            if sorted(slots) == sorted(self._slots):
+                self._formatted = (literals, slots)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "CompiledTemplate":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), name=Path(path).name)
+
+    def _check(self, values: Dict) -> tuple[List[str], List[str]]:
+        missing = [key for key in self.placeholders if key not in values]
+        placeholder_set = set(self.placeholders)
+        unknown = [key for key in values if key not in placeholder_set]
+        return missing, unknown
+
+    @staticmethod
+    def _fill(literals: List[str], slots: List[str], values: Dict, escape) -> str:
+        escaped = {key: escape(value) for key, value in values.items()}
+        parts = [literals[0]]
+        for slot, literal in zip(slots, literals[1:]):
+            # 未提供值的占位符保留原样，与逐键替换的行为一致
+            parts.append(escaped.get(slot, f"{{{{{slot}}}}}"))
+            parts.append(literal)
+        return "".join(parts)
+
+    def render(self, values: Dict) -> RenderResult:
+        """按原始模板文本渲染（不格式化）"""
+        missing, unknown = self._check(values)
+        text = self._fill(self._literals, self._slots, values, _escape_legacy)
+        return RenderResult(text, missing, unknown)
+
+    def render_json(self, values: Dict) -> RenderResult:
+        """
+        渲染并返回 indent=2、ensure_ascii=False 格式的 JSON 文本
+
+        异常:
+            ValueError: 渲染结果不是合法 JSON（仅在模板本身不是合法 JSON 时可能出现）
+        """
+        missing, unknown = self._check(values)
+        if self._formatted is not None:
+            literals, slots = self._formatted
+            text = self._fill(literals, slots, values, _escape_formatted)
+        else:
+            raw = self._fill(self._literals, self._slots, values, _escape_legacy)
+            text = json.dumps(json.loads(raw), indent=2, ensure_ascii=False)
+        return RenderResult(text, missing, unknown)
+
+
+class _Leaf:
+    """结构模板中一个含占位符的字符串叶子：文字段和占位符段"""
+    __slots__ = ("literals", "slots")
+
+    def __init__(self, text: str):
+        self.literals, self.slots = _split(text)
+
+    def fill(self, values: Dict) -> str:
+        parts = [self.literals[0]]
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            value = values.get(slot)
+            if value is None and slot not in values:
+                value = f"{{{{{slot}}}}}"
+            parts.append(value if isinstance(value, str) else str(value))
+            parts.append(literal)
+        return "".join(parts)
+
+
+class StructuralTemplate:
+    """
+    结构化的 JSON 模板
+
+    模板只解析一次为对象树，并记录每个 {{key}} 所在的位置（路径）。
+    填充时不做字符串替换和重新解析：只复制从根到各个占位符的路径上的容器，
+    其余子树与模板共享，再把值直接赋给对应位置；需要文本时只序列化一次。
+    占位符只允许出现在字符串值中，出现在键名中的模板无法结构化编译。
+    """
+
+    def __init__(self, source: str, name: str = ""):
+        self.name = name
+        self._tree = json.loads(source)
+        # 路径字典树：容器中的键/下标 -> 子树字典，叶子位置为 _Leaf
+        self._trie: Dict = {}
+        placeholders = []
+        for path, leaf in self._collect(self._tree, ()):
+            node = self._trie
+            for step in path[:-1]:
+                node = node.setdefault(step, {})
+            node[path[-1]] = leaf
+            placeholders.extend(leaf.slots)
+        self.placeholders = list(dict.fromkeys(placeholders))
+
+    def _collect(self, node, path):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if PLACEHOLDER_PATTERN.search(key):
+                    raise ValueError(f"{self.name or 'template'}: 键名中的占位符无法结构化编译: {key}")
+                yield from self._collect(value, path + (key,))
+        elif isinstance(node, list):
+            for index, value in enumerate(node):
+                yield from self._collect(value, path + (index,))
+        elif isinstance(node, str) and PLACEHOLDER_PATTERN.search(node):
+            yield path, _Leaf(node)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "StructuralTemplate":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), name=Path(path).name)
+
+    def _fill(self, node, trie: Dict, values: Dict):
+        copy = dict(node) if isinstance(node, dict) else list(node)
+        for step, child in trie.items():
+            if isinstance(child, _Leaf):
+                copy[step] = child.fill(values)
+            else:
+                copy[step] = self._fill(node[step], child, values)
+        return copy
+
+    def fill(self, values: Dict):
+        """返回填充后的对象树（未改动的子树与模板共享，调用方不应原地修改）"""
+        if not self._trie:
+            return self._tree
+        return self._fill(self._tree, self._trie, values)
+
+    def render_json(self, values: Dict) -> RenderResult:
+        """填充并序列化为 indent=2、ensure_ascii=False 的 JSON 文本"""
+        missing = [key for key in self.placeholders if key not in values]
+        placeholder_set = set(self.placeholders)
+        unknown = [key for key in values if key not in placeholder_set]
+        text = json.dumps(self.fill(values), indent=2, ensure_ascii=False)
+        return RenderResult(text, missing, unknown)
+
+
+def legacy_render_json(source: str, values: Dict) -> str:
+    """原先的实现：逐键 str.replace，再解析和格式化，仅用于对比评测"""
+    for key, value in values.items():
+        source = source.replace(f"{{{{{key}}}}}", _escape_legacy(value))
+    return json.dumps(json.loads(source), indent=2, ensure_ascii=False)
+
+
+def _measure(render, repeat: int) -> tuple[str, float, float]:
+    """返回 (输出, 最短耗时 ms, 单次渲染的峰值内存 KB)"""
+    times = []
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = render()
+        times.append(time.perf_counter() - start)
+    # tracemalloc 会拖慢执行，峰值内存单独测一次
+    gc.collect()
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output, min(times) * 1000, peak / 1024
+
+
+def benchmark(template_dir: str | Path = "json_templates", repeat: int = 5) -> List[Dict]:
+    """
+    对比每个带占位符的模板在三种实现下单次生成的耗时和峰值内存，并核对输出一致：
+    legacy（逐键 replace + 解析 + 格式化）、structural（对象树路径复制 + 序列化一次）、
+    compiled（预格式化文本分段 + 一次拼接）
+
+    占位符的值使用包含中文、引号、换行和反斜杠的示例文本，覆盖转义路径。
+    """
+    results = []
+    for path in sorted(Path(template_dir).glob("*.json")):
+        source = path.read_text(encoding='utf-8')
+        placeholders = list(dict.fromkeys(PLACEHOLDER_PATTERN.findall(source)))
+        if not placeholders:
+            continue
+        values = {key: f'{key} 示例 "quoted" \\ line\nnext' for key in placeholders}
+        compiled = CompiledTemplate(source, name=path.name)
+        structural = StructuralTemplate(source, name=path.name)
+
+        row = {
+            "template": path.name,
+            "size_kb": round(len(source.encode('utf-8')) / 1024, 1),
+            "placeholders": len(placeholders),
+        }
+        outputs = []
+        for mode, render in (
+            ("legacy", lambda: legacy_render_json(source, values)),
+            ("structural", lambda: structural.render_json(values).text),
+            ("compiled", lambda: compiled.render_json(values).text),
+        ):
+            output, elapsed_ms, peak_kb = _measure(render, repeat)
+            outputs.append(output)
+            row[f"{mode}_ms"] = round(elapsed_ms, 2)
+            row[f"{mode}_peak_kb"] = round(peak_kb)
+        row["identical"] = all(output == outputs[0] for output in outputs)
+        results.append(row)
+    return results
+
+
+if __name__ == "__main__":
+    # 用法（在项目根目录运行）: python -m utils.template_engine [模板目录]
+    rows = benchmark(sys.argv[1] if len(sys.argv) > 1 else "json_templates")
+    modes = ("legacy", "structural", "compiled")
+    print(f"{'template':<34}{'KB':>8}{'keys':>6}" + "".join(f"{m + ' ms':>16}{'peak KB':>9}" for m in modes) + "  same")
+    for row in rows:
+        print(f"{row['template']:<34}{row['size_kb']:>8}{row['placeholders']:>6}"
+              + "".join(f"{row[m + '_ms']:>16}{row[m + '_peak_kb']:>9}" for m in modes)
+              + f"  {row['identical']}")
@@ -7,6 +7,8 @@ import re
 from urllib.parse import urlparse
 from typing import Callable, List, Dict, Any
 
+from utils.template_cache import get_template_text
+
 def _is_valid_json(json_data: str, logger: Callable) -> bool:
     """
     检查字符串是否为有效的JSON。
@@ -54,8 +56,8 @@ def _get_template_content(templates_path: str, template_name: str, logger: Calla
         logger(f"未找到模板文件: {template_file_path}", "error")
         raise FileNotFoundError(f"未找到模板文件: {template_file_path}")
     
-    with open(template_file_path, "r", encoding="utf-8") as f:
-        return f.read()
+    # 经过进程内缓存，重复生成不再读取磁盘
+    return get_template_text(template_file_path)
 
 def generate_tools_json(csv_path: str, templates_path: str, logger: Callable = print) -> str | None:
     """
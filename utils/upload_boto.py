@@ -6,14 +6,140 @@ import time
 import json
 import socket
 import ssl
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError, ClientError
 
 # 导入凭证管理模块
 from utils.credentials import load_credentials
+from utils.upload_index import UploadIndex
 
 # 配置日志，便于调试
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 客户端连接池大小。upload_many 会让多个线程共享同一个客户端，
+# 默认的 10 个连接在并发上传时会频繁出现 "Connection pool is full" 并退化为串行
+S3_MAX_POOL_CONNECTIONS = 32
+# upload_many 默认的并发上传数
+DEFAULT_UPLOAD_WORKERS = 8
+
+MB = 1024 * 1024
+# 小于该大小的文件一两次回调就传完了，不汇报进度以免刷屏
+PROGRESS_REPORT_MIN_BYTES = 1 * MB
+
+
+@dataclass
+class TransferProfile:
+    """
+    S3 传输参数配置，对应 boto3 的 TransferConfig。
+
+    multipart_threshold: 文件超过该大小时使用分片上传
+    multipart_chunksize: 每个分片的大小
+    max_concurrency: 单个文件分片上传的最大线程数
+    """
+    multipart_threshold: int = 8 * MB
+    multipart_chunksize: int = 8 * MB
+    max_concurrency: int = 10
+    use_threads: bool = True
+
+    def to_transfer_config(self) -> TransferConfig:
+        return TransferConfig(
+            multipart_threshold=self.multipart_threshold,
+            multipart_chunksize=self.multipart_chunksize,
+            max_concurrency=self.max_concurrency,
+            use_threads=self.use_threads
+        )
+
+
+# 预设的传输配置
+TRANSFER_PROFILES = {
+    # boto3 的默认值
+    "default": TransferProfile(),
+    # 针对 5–20 MB 的样机渲染图：4 MB 起分片，一张 20 MB 的图会被拆成 5 片上传。
+    # upload_many 的 8 个线程 × 每个文件 4 个分片线程 = 32，正好用满客户端连接池
+    "mockup_render": TransferProfile(multipart_threshold=4 * MB, multipart_chunksize=4 * MB,
+                                     max_concurrency=S3_MAX_POOL_CONNECTIONS // DEFAULT_UPLOAD_WORKERS),
+}
+
+
+class UploadProgress:
+    """
+    boto3 上传进度回调，按固定间隔汇报已传输字节、速率和预计剩余时间。
+
+    同时启动一个看门狗线程：若超过 stall_seconds 没有任何字节被传输，立即汇报停滞，
+    而不是等上传最终超时后才发现。
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        output_callback: Callable[[str, str], None],
+        report_interval: float = 1.0,
+        stall_seconds: float = 10.0
+    ):
+        self.file_name = os.path.basename(file_path)
+        self.total_bytes = os.path.getsize(file_path)
+        self.output_callback = output_callback
+        self.report_interval = report_interval
+        self.stall_seconds = stall_seconds
+
+        self._lock = threading.Lock()
+        self._transferred = 0
+        self._start_time = time.monotonic()
+        self._last_report = 0.0
+        self._last_progress = self._start_time
+        self._stalled = False
+        self._done = threading.Event()
+        self._watchdog = threading.Thread(target=self._watch, daemon=True)
+
+    def __call__(self, bytes_amount: int):
+        # boto3 会在多个分片线程中调用该回调
+        with self._lock:
+            self._transferred += bytes_amount
+            now = time.monotonic()
+            self._last_progress = now
+            resumed = self._stalled
+            self._stalled = False
+            finished = self._transferred >= self.total_bytes
+            message = None
+            if finished or now - self._last_report >= self.report_interval:
+                self._last_report = now
+                message = self._format(now)
+        # 回调（如发射 GUI 信号）在锁外执行，避免阻塞其他分片线程
+        if resumed:
+            self.output_callback(f"{self.file_name}: upload resumed", "info")
+        if message:
+            self.output_callback(message, "info")
+
+    def _format(self, now: float) -> str:
+        elapsed = max(now - self._start_time, 1e-6)
+        rate = self._transferred / elapsed
+        percent = self._transferred * 100 / self.total_bytes if self.total_bytes else 100
+        remaining = max(self.total_bytes - self._transferred, 0)
+        eta = remaining / rate if rate > 0 else float('inf')
+        eta_text = f"{eta:.0f}s" if eta != float('inf') else "--"
+        return (f"{self.file_name}: {self._transferred / MB:.1f}/{self.total_bytes / MB:.1f} MB "
+                f"({percent:.0f}%), {rate / MB:.2f} MB/s, ETA {eta_text}")
+
+    def _watch(self):
+        while not self._done.wait(timeout=min(self.stall_seconds, 1.0)):
+            with self._lock:
+                idle = time.monotonic() - self._last_progress
+                if idle < self.stall_seconds or self._stalled:
+                    continue
+                self._stalled = True
+            self.output_callback(f"{self.file_name}: no bytes transferred for {idle:.0f}s, upload may be stalled", "warning")
+
+    def start(self):
+        self._watchdog.start()
+
+    def stop(self):
+        self._done.set()
+
 class S3Uploader:
     """
     一个用于将文件上传到 AWS S3 并获取 CDN 链接的类。
@@ -28,7 +154,9 @@ class S3Uploader:
         self,
         bucket_name: str = "pacdora-upload",
         bucket_host: str = "//cdn.pacdora.com/",
-        region_name: str = "us-east-2"
+        region_name: str = "us-east-2",
+        upload_index: Optional[UploadIndex] = None,
+        transfer_profile: TransferProfile | str = "default"
     ):
         """
         初始化 S3Uploader 实例。
@@ -38,10 +166,18 @@ class S3Uploader:
             bucket_host (str): CDN 的主机名，例如 "cdn.pacdora.com/"。
                                  它应该以 "//" 或 "http(s)://" 开头，否则会自动添加 "//"。
             region_name (str): AWS S3 桶所在的区域，默认为 "us-east-2"。
+            upload_index (UploadIndex, optional): 内容哈希索引。传入后启用内容去重模式，
+                                                  内容相同的文件直接返回已有链接而不再上传。
+            transfer_profile (TransferProfile | str): 传输参数配置，或 TRANSFER_PROFILES 中的预设名称。
         """
         self.bucket_name = bucket_name
         self.bucket_host = bucket_host
         self.region_name = region_name
+        self.upload_index = upload_index
+        if isinstance(transfer_profile, str):
+            transfer_profile = TRANSFER_PROFILES[transfer_profile]
+        self.transfer_profile = transfer_profile
+        self.transfer_config = transfer_profile.to_transfer_config()
         self.s3_client = None
 
         # 按照优先级顺序尝试初始化 S3 客户端
@@ -63,6 +199,14 @@ class S3Uploader:
         logging.warning("Failed to initialize S3 client with any available credentials. Upload functionality will be disabled.")
         # 不抛出异常，允许程序继续运行
 
+    def _client_config(self) -> Config:
+        """
+        S3 客户端的公共配置。boto3 的 client 是线程安全的，放大连接池后可以被多个上传线程共享。
+        连接池至少要容纳 upload_many 的并发数 × 每个文件的分片线程数，否则会出现 "Connection pool is full"。
+        """
+        pool_size = max(S3_MAX_POOL_CONNECTIONS, DEFAULT_UPLOAD_WORKERS * self.transfer_profile.max_concurrency)
+        return Config(max_pool_connections=pool_size)
+
     def _try_initialize_with_keyring(self) -> bool:
         """
         尝试使用keyring中存储的凭证初始化S3客户端。
@@ -83,7 +227,8 @@ class S3Uploader:
                         "s3",
                         region_name=region,
                         aws_access_key_id=access_key,
-                        aws_secret_access_key=secret_key
+                        aws_secret_access_key=secret_key,
+                        config=self._client_config()
                     )
                     
                     # 验证凭证是否有效前先检查网络连接
@@ -111,7 +256,7 @@ class S3Uploader:
         try:
             logging.info("Trying to initialize S3 client with default credentials")
             # 尝试使用默认配置初始化客户端
-            self.s3_client = boto3.client("s3", region_name=self.region_name)
+            self.s3_client = boto3.client("s3", region_name=self.region_name, config=self._client_config())
             # 验证凭证是否有效前先检查网络连接
             self._check_network_connectivity()
             self.s3_client.list_buckets()
@@ -162,7 +307,8 @@ class S3Uploader:
                 "s3",
                 region_name=self.region_name,
                 aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key
+                aws_secret_access_key=secret_key,
+                config=self._client_config()
             )
             
             # 验证凭证是否有效前先检查网络连接
@@ -238,13 +384,24 @@ class S3Uploader:
             logging.error(f"SSL/TLS connection test failed: {e}")
             raise Exception(f"SSL/TLS连接测试失败: {e}")
 
-    def upload_file(self, file_path: str, s3_prefix: str = "page-img/") -> str | None:
+    def upload_file(
+        self,
+        file_path: str,
+        s3_prefix: str = "page-img/",
+        dedup: bool = True,
+        progress_callback: Optional[Callable[[str, str], None]] = None,
+        persist_index: bool = True
+    ) -> str | None:
         """
         将指定文件上传到 S3 桶并返回其 CDN 链接。
 
         参数:
             file_path (str): 要上传的本地文件的完整路径。
             s3_prefix (str): 在 S3 桶中存储文件的路径前缀，默认为 "page-img/"。
+            dedup (bool): 是否启用内容去重，仅在初始化时传入了 upload_index 时生效。
+            progress_callback (Callable, optional): 进度输出回调，签名为 (message, msg_type)，
+                                                    用于实时汇报速率、预计剩余时间和停滞情况。
+            persist_index (bool): 是否在记录内容索引后立即写盘；批量上传时由 upload_many 统一保存。
 
         返回:
             str | None: 上传成功后文件的完整 CDN 链接，如果上传失败则返回 None。
@@ -265,6 +422,15 @@ class S3Uploader:
             logging.error(f"Error: File '{file_path}' is not readable")
             raise PermissionError(f"文件 '{file_path}' 不可读")
 
+        # 内容去重：相同内容的文件直接复用索引中的链接
+        content_digest = None
+        if dedup and self.upload_index is not None:
+            content_digest = UploadIndex.file_sha256(file_path)
+            cached_link = self.upload_index.lookup(content_digest)
+            if cached_link:
+                logging.info(f"Content of '{file_path}' already uploaded, reusing {cached_link}")
+                return cached_link
+
         # 获取文件大小
         file_size = os.path.getsize(file_path)
         logging.info(f"Uploading file '{file_path}' with size {file_size} bytes")
@@ -290,7 +456,20 @@ class S3Uploader:
             for attempt in range(3):  # 最多尝试 3 次 (原始尝试 + 2 次重试)
                 try:
                     logging.info(f"Attempt {attempt + 1}: Uploading '{file_path}' to s3://{self.bucket_name}/{s3_key}")
-                    self.s3_client.upload_file(file_path, self.bucket_name, s3_key)
+                    progress = None
+                    if progress_callback and file_size >= PROGRESS_REPORT_MIN_BYTES:
+                        progress = UploadProgress(file_path, progress_callback)
+                    if progress:
+                        progress.start()
+                    try:
+                        self.s3_client.upload_file(
+                            file_path, self.bucket_name, s3_key,
+                            Config=self.transfer_config,
+                            Callback=progress
+                        )
+                    finally:
+                        if progress:
+                            progress.stop()
                     logging.info(f"Successfully uploaded '{file_path}' to S3.")
                     break  # 上传成功，跳出重试循环
                 except ClientError as e:
@@ -349,8 +528,95 @@ class S3Uploader:
         logging.debug(f"Final CDN link: {cdn_link}")
 
         logging.info(f"Generated CDN link for '{file_path}': {cdn_link}")
+
+        if content_digest is not None:
+            try:
+                self.upload_index.record(content_digest, cdn_link, persist=persist_index)
+            except Exception as e:
+                # 索引写入失败不影响本次上传结果
+                logging.warning(f"Failed to record '{file_path}' in upload index: {e}")
+
         return cdn_link
 
+    def upload_many(
+        self,
+        file_paths: list[str],
+        s3_prefix: str = "page-img/",
+        max_workers: int = DEFAULT_UPLOAD_WORKERS,
+        on_complete: Optional[Callable[[str, str | None, str | None], None]] = None,
+        dedup: bool = True,
+        progress_callback: Optional[Callable[[str, str], None]] = None
+    ) -> tuple[dict[str, str], dict[str, str]]:
+        """
+        并发上传多个文件，所有线程共享同一个 S3 客户端。
+
+        单个文件的上传耗时主要花在网络往返上，并发后一整个页面文件夹的上传时间
+        大致等于其中最大那张图片的上传时间。
+
+        参数:
+            file_paths (list[str]): 要上传的本地文件路径列表。
+            s3_prefix (str): 在 S3 桶中存储文件的路径前缀，默认为 "page-img/"。
+            max_workers (int): 最大并发上传数。
+            on_complete (Callable, optional): 每个文件完成后的回调，参数为 (file_path, cdn_url, error)，
+                                              成功时 error 为 None，失败时 cdn_url 为 None。
+                                              回调在调用 upload_many 的线程中按完成顺序依次执行，
+                                              不会被并发调用；回调耗时只推迟后续结果的处理，不影响进行中的上传。
+            dedup (bool): 是否启用内容去重，见 upload_file。
+            progress_callback (Callable, optional): 每个文件的进度输出回调，见 upload_file。
+
+        返回:
+            tuple[dict[str, str], dict[str, str]]: (文件路径 -> CDN 链接, 文件路径 -> 错误信息)
+        """
+        if self.s3_client is None:
+            logging.warning("S3 client is not initialized. Upload functionality is disabled.")
+            raise Exception("AWS S3客户端未初始化，请先配置AWS凭证以启用上传功能。")
+
+        results: dict[str, str] = {}
+        errors: dict[str, str] = {}
+        if not file_paths:
+            return results, errors
+
+        # 去重并保持顺序，避免同一个文件被并发上传两次
+        unique_paths = list(dict.fromkeys(file_paths))
+        worker_count = max(1, min(max_workers, len(unique_paths)))
+        logging.info(f"Uploading {len(unique_paths)} files with {worker_count} workers")
+
+        with ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="s3-upload") as executor:
+            # 各线程只在内存中记录内容索引，整批结束后保存一次
+            futures = {
+                executor.submit(self.upload_file, path, s3_prefix, dedup, progress_callback, False): path
+                for path in unique_paths
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                cdn_url, error = None, None
+                try:
+                    cdn_url = future.result()
+                    if not cdn_url:
+                        error = "上传失败，详情请查看日志"
+                except Exception as e:
+                    error = str(e)
+
+                if error is None:
+                    results[path] = cdn_url
+                else:
+                    errors[path] = error
+
+                if on_complete:
+                    try:
+                        on_complete(path, cdn_url, error)
+                    except Exception as e:
+                        logging.error(f"upload_many callback failed for '{path}': {e}")
+
+        if dedup and self.upload_index is not None and results:
+            try:
+                self.upload_index.save()
+            except Exception as e:
+                logging.warning(f"Failed to save upload index: {e}")
+
+        logging.info(f"upload_many finished: {len(results)} succeeded, {len(errors)} failed")
+        return results, errors
+
 # example
 if __name__ == "__main__":
     # 请根据您的实际情况进行修改。
@@ -0,0 +1,146 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from utils.cdn_records import list_folder_images, resolve_cdn_key
+from utils.resource_manager import resource_manager
+
+
+class UploadIndex:
+    """
+    文件内容（SHA-256）到 CDN 链接的本地持久化索引。
+
+    S3Uploader 在内容去重模式下会先查询该索引，内容相同的文件直接复用已有链接，
+    不再产生任何网络请求。索引以 JSON 形式保存在用户数据目录的 cache 下。
+    """
+
+    def __init__(self, index_path: str | Path | None = None):
+        if index_path is None:
+            index_path = resource_manager.user_data_path / 'cache' / 'upload_index.json'
+        self.index_path = Path(index_path)
+        self._lock = threading.Lock()
+        # 串行化写盘，与读写条目的锁分开，保存期间查询不被阻塞
+        self._save_lock = threading.Lock()
+        self._entries: dict[str, str] = {}
+        self._load()
+
+    def _load(self):
+        """从磁盘加载索引，文件损坏时从空索引开始"""
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+            logging.info(f"Loaded {len(self._entries)} entries from upload index {self.index_path}")
+        except (json.JSONDecodeError, OSError) as e:
+            logging.warning(f"Upload index at {self.index_path} is unreadable, starting fresh: {e}")
+            self._entries = {}
+
+    def save(self):
+        """
+        原子地写回磁盘：先写同目录下的唯一临时文件再替换，避免写到一半时崩溃损坏索引
+        多个线程同时保存时逐个进行，后保存的快照一定包含先前的记录
+        """
+        with self._save_lock:
+            with self._lock:
+                snapshot = dict(self._entries)
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=self.index_path.name + '.', suffix='.tmp',
+                                            dir=self.index_path.parent)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, indent=2)
+                os.replace(tmp_path, self.index_path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def lookup(self, digest: str) -> str | None:
+        """根据内容哈希查找已上传的 CDN 链接"""
+        with self._lock:
+            return self._entries.get(digest)
+
+    def record(self, digest: str, cdn_url: str, persist: bool = True):
+        """记录一条哈希 -> 链接，默认立即落盘"""
+        with self._lock:
+            self._entries[digest] = cdn_url
+        if persist:
+            self.save()
+
+    @staticmethod
+    def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+        """分块计算文件的 SHA-256，避免大图一次性读入内存"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def rebuild_from_folders(
+        self,
+        base_folder: str,
+        output_callback: Optional[Callable[[str, str], None]] = None,
+        max_workers: int = 8
+    ) -> int:
+        """
+        扫描 base_folder 下所有页面文件夹，根据已有的 cdn.json 为其中的图片建立索引。
+
+        参数:
+            base_folder (str): NAS 上的 pacdora.com 根目录。
+            output_callback (Callable, optional): 输出消息的回调，签名为 (message, msg_type)。
+            max_workers (int): 并发扫描的文件夹数，NAS 读取以 IO 为主，适当并发可以明显加速。
+
+        返回:
+            int: 新增或更新的索引条目数
+        """
+        def log_message(message, msg_type="info"):
+            if output_callback:
+                output_callback(message, msg_type)
+            else:
+                print(message)
+
+        folders = [
+            os.path.join(base_folder, name) for name in os.listdir(base_folder)
+            if os.path.isfile(os.path.join(base_folder, name, 'cdn.json'))
+        ]
+        log_message(f"Found {len(folders)} page folders with cdn.json under {base_folder}", "info")
+
+        def index_folder(folder_path: str) -> dict[str, str]:
+            found = {}
+            try:
+                with open(os.path.join(folder_path, 'cdn.json'), 'r') as f:
+                    cdn_data = json.load(f)
+                for image_name in list_folder_images(folder_path):
+                    # resolve_cdn_key 会写入样机数量，这里用副本避免影响读取结果
+                    cdn_url = cdn_data.get(resolve_cdn_key(image_name, dict(cdn_data)))
+                    if cdn_url:
+                        found[self.file_sha256(os.path.join(folder_path, image_name))] = cdn_url
+            except Exception as e:
+                log_message(f"Skipping {folder_path}: {e}", "warning")
+            return found
+
+        added = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i, found in enumerate(executor.map(index_folder, folders), start=1):
+                for digest, cdn_url in found.items():
+                    self.record(digest, cdn_url, persist=False)
+                added += len(found)
+                if i % 50 == 0:
+                    log_message(f"Indexed {i}/{len(folders)} folders...", "info")
+
+        self.save()
+        log_message(f"Upload index rebuilt: {added} images indexed, {len(self)} entries in total.", "success")
+        return added
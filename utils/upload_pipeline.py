@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+
+class TargetReadiness:
+    """
+    记录每个目标页面的图片是否已上传完成（cdn.json已就绪）。
+
+    上传线程作为生产者，逐个目标上传并调用 mark_ready；
+    机器人作为消费者，在替换某个目标前只需等待该目标就绪，
+    这样目标N+1的图片上传可以和目标N的浏览器操作同时进行。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: dict[str, threading.Event] = {}
+        self._results: dict[str, bool] = {}
+
+    def _event(self, target: str) -> threading.Event:
+        with self._lock:
+            return self._events.setdefault(target, threading.Event())
+
+    def mark_ready(self, target: str, success: bool = True):
+        """标记目标的上传已结束，success为False表示上传失败"""
+        with self._lock:
+            self._results[target] = success
+        self._event(target).set()
+
+    def mark_failed(self, target: str):
+        self.mark_ready(target, success=False)
+
+    def is_ready(self, target: str) -> bool:
+        return self._event(target).is_set()
+
+    def wait(self, target: str, timeout: Optional[float] = None) -> bool:
+        """
+        阻塞直到目标上传结束或超时。
+
+        返回:
+            bool: 目标上传成功时返回True；上传失败或超时返回False
+        """
+        if not self._event(target).wait(timeout):
+            return False
+        with self._lock:
+            return self._results.get(target, False)
+
+
+def start_upload_producer(
+    targets: Iterable[str],
+    upload_target: Callable[[str], bool],
+    readiness: TargetReadiness,
+    output_callback: Optional[Callable[[str, str], None]] = None
+) -> threading.Thread:
+    """
+    启动后台上传线程，按顺序上传每个目标并在完成后标记就绪。
+
+    参数:
+        targets (Iterable[str]): 目标列表，顺序应与机器人处理顺序一致。
+        upload_target (Callable): 上传单个目标的函数，返回是否成功。
+        readiness (TargetReadiness): 用于通知机器人的就绪表。
+        output_callback (Callable, optional): 输出消息的回调，签名为 (message, msg_type)。
+    """
+    targets = list(targets)
+
+    def log_message(message, msg_type="info"):
+        if output_callback:
+            output_callback(message, msg_type)
+        else:
+            print(message)
+
+    def producer():
+        start_time = time.perf_counter()
+        for i, target in enumerate(targets):
+            log_message(f"🖼️ [{i+1}/{len(targets)}] 上传: {target}", "info")
+            try:
+                success = upload_target(target)
+            except Exception as e:
+                log_message(f"❌ 上传 {target} 失败: {e}", "error")
+                success = False
+            # 无论成功与否都要标记，避免机器人一直等待
+            readiness.mark_ready(target, success)
+        log_message(f"图片上传线程完成，用时 {time.perf_counter() - start_time:.1f}s", "success")
+
+    thread = threading.Thread(target=producer, name="upload-producer", daemon=True)
+    thread.start()
+    return thread